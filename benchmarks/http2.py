@@ -0,0 +1,277 @@
+"""
+HTTP/1.1 pooling versus HTTP/2 multiplexing for status polling.
+
+Many concurrent status lookups are sent to the local gateway emulator, running
+as a separate loopback process, once over HTTP/1.1 with a keep-alive pool (one
+connection per request in flight) and once over HTTP/2, where every request is
+a stream on a single connection. The emulator is served over plain HTTP, so
+HTTP/2 runs as h2c with prior knowledge. Throughput, latency and the number of
+connections the emulator accepted are printed (or written with ``--output``) as
+JSON. Requires ``momo-psb[http2]``.
+
+Usage::
+
+    python benchmarks/http2.py
+    python benchmarks/http2.py --requests 5000 --concurrency 64 --latency 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from momo_psb.api import MoMoPSBAPI
+
+MODES = ("sync_http1", "sync_http2", "async_http1", "async_http2")
+
+PAYER = {"partyIdType": "MSISDN", "partyId": "2348056042384"}
+
+
+class Gateway:
+    """
+    A gateway emulator process serving HTTP/1.1 or HTTP/2.
+    """
+
+    def __init__(self, http2: bool, latency: float):
+        command = [sys.executable, "-m", "momo_psb.emulator", "--port", "0"]
+        command += ["--latency", str(latency)] + (["--http2"] if http2 else [])
+        self.process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+        self.url = self.process.stdout.readline().rsplit(" ", 1)[-1].strip()
+
+    def stop(self) -> int:
+        """
+        Stop the emulator.
+
+        :return: Number of connections it accepted.
+        """
+        self.process.send_signal(signal.SIGINT)
+        output, _ = self.process.communicate()
+        return int(output.split()[1])
+
+
+def sync_client(url: str, http2: bool, concurrency: int) -> MoMoPSBAPI:
+    if not http2:
+        return MoMoPSBAPI(url, "bench-key", pool_maxsize=concurrency, pool_block=True)
+    from momo_psb.http2 import HTTP2Adapter
+
+    # ``MoMoPSBAPI(http2=True)`` only speaks HTTP/2 to hosts that offer it over
+    # TLS; the plain loopback emulator needs prior knowledge.
+    session = requests.Session()
+    session.mount("http://", HTTP2Adapter(max_connections=1, http1=False))
+    return MoMoPSBAPI(url, "bench-key", session=session)
+
+
+def async_client(url: str, http2: bool, concurrency: int):
+    import httpx
+
+    from momo_psb.async_api import AsyncMoMoPSBAPI
+
+    client = httpx.AsyncClient(
+        http1=not http2,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=1 if http2 else concurrency,
+            max_keepalive_connections=concurrency,
+        ),
+    )
+    return AsyncMoMoPSBAPI(url, "bench-key", client=client)
+
+
+def run_sync(
+    call: Callable[[Any], Any], items: List[Any], concurrency: int
+) -> Tuple[List[float], float]:
+    """
+    Call ``call`` once per item from ``concurrency`` threads.
+
+    :return: Per-call latencies and the wall time.
+    """
+    latencies: List[float] = []
+
+    def timed(item: Any) -> Any:
+        started = time.perf_counter()
+        result = call(item)
+        latencies.append(time.perf_counter() - started)
+        return result
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed, items))
+    return latencies, time.perf_counter() - started
+
+
+async def run_async(
+    call: Callable[[Any], Awaitable[Any]], items: List[Any], concurrency: int
+) -> Tuple[List[float], float]:
+    """
+    Call ``call`` once per item from ``concurrency`` tasks.
+
+    :return: Per-call latencies and the wall time.
+    """
+    latencies: List[float] = []
+    remaining = iter(items)
+
+    async def worker() -> None:
+        for item in remaining:
+            started = time.perf_counter()
+            await call(item)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - started
+
+
+def bench_sync(url: str, http2: bool, args: argparse.Namespace):
+    with sync_client(url, http2, args.concurrency) as api:
+        api.api_user = str(uuid.uuid4())
+        api.create_api_user(api.api_user, "bench.local").raise_for_status()
+        api.api_key = api.create_api_key(api.api_user).json()["apiKey"]
+
+        def pay(reference_id: str) -> None:
+            api.request_to_pay(
+                reference_id, None, 100, "EUR", reference_id, PAYER, "bench", "bench"
+            ).raise_for_status()
+
+        references = [str(uuid.uuid4()) for _ in range(args.requests)]
+        run_sync(pay, references, args.concurrency)
+        result = run_sync(api.get_request_to_pay_status, references, args.concurrency)
+        # The client does not close a session it was given.
+        api.session.close()
+    return result
+
+
+def bench_async(url: str, http2: bool, args: argparse.Namespace):
+    async def main() -> Tuple[List[float], float]:
+        async with async_client(url, http2, args.concurrency) as api:
+            api.api_user = str(uuid.uuid4())
+            response = await api.create_api_user(api.api_user, "bench.local")
+            response.raise_for_status()
+            api.api_key = (await api.create_api_key(api.api_user)).json()["apiKey"]
+
+            async def pay(reference_id: str) -> None:
+                response = await api.request_to_pay(
+                    reference_id,
+                    None,
+                    100,
+                    "EUR",
+                    reference_id,
+                    PAYER,
+                    "bench",
+                    "bench",
+                )
+                response.raise_for_status()
+
+            references = [str(uuid.uuid4()) for _ in range(args.requests)]
+            await run_async(pay, references, args.concurrency)
+            result = await run_async(
+                api.get_request_to_pay_status, references, args.concurrency
+            )
+            # The client does not close an HTTP client it was given.
+            await api.client.aclose()
+        return result
+
+    return asyncio.run(main())
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def bench(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Create ``--requests`` transactions on a fresh emulator, then time polling
+    the status of each once.
+    """
+    http2 = mode.endswith("http2")
+    gateway = Gateway(http2, args.latency)
+    try:
+        run = bench_async if mode.startswith("async") else bench_sync
+        latencies, wall = run(gateway.url, http2, args)
+    finally:
+        connections = gateway.stop()
+    return {
+        "mode": mode,
+        "concurrency": args.concurrency,
+        "requests": len(latencies),
+        "seconds": round(wall, 4),
+        "requests_per_sec": round(len(latencies) / wall, 1),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies) * 1000, 3),
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "max": round(max(latencies) * 1000, 3),
+        },
+        "connections": connections,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--latency", type=float, default=0.01, help="Emulated gateway latency (s)."
+    )
+    parser.add_argument("--output", help="Write results to this JSON file.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    modes = [mode for mode in args.modes.split(",") if mode]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        raise SystemExit(f"Unknown choice(s) {sorted(unknown)}; use {MODES}.")
+    try:
+        from momo_psb.http2 import require_h2
+
+        require_h2()
+    except ImportError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+
+    results = []
+    for mode in modes:
+        result = bench(mode, args)
+        results.append(result)
+        print(
+            f"{mode:>11}: {result['requests_per_sec']:>9} req/s  "
+            f"p50 {result['latency_ms']['p50']} ms  "
+            f"p95 {result['latency_ms']['p95']} ms  "
+            f"{result['connections']} connection(s)",
+            file=sys.stderr,
+        )
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "latency": args.latency,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,482 @@
+"""
+Throughput and latency benchmarks for the MoMo PSB SDK.
+
+The benchmarks run against the local gateway emulator, either as a separate
+loopback HTTP process (``--transport loopback``, the default) or in-process
+without sockets (``--transport inprocess``) to isolate the SDK's own overhead.
+Results are printed (or written with ``--output``) as JSON, and ``--compare``
+checks them against an earlier run.
+
+Usage::
+
+    python benchmarks/run.py --output bench.json
+    python benchmarks/run.py --flows token,request_to_pay --modes sync,threads
+    python benchmarks/run.py --compare baseline.json --threshold 0.15
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.codec import get_codec
+from momo_psb.emulator import EmulatorAdapter, GatewayEmulator
+
+FLOWS = ("token", "token_cached", "request_to_pay", "bulk_invoice")
+MODES = ("sync", "threads", "async")
+TRANSPORTS = ("loopback", "inprocess")
+
+PAYER = {"partyIdType": "MSISDN", "partyId": "2348056042384"}
+INPROCESS_URL = "http://momo.bench"
+
+
+class Gateway:
+    """
+    A running gateway emulator and factories for clients connected to it.
+    """
+
+    def __init__(self, transport: str, latency: float):
+        self.transport = transport
+        self.emulator: Optional[GatewayEmulator] = None
+        self.process: Optional[subprocess.Popen] = None
+        if transport == "loopback":
+            self.process = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "momo_psb.emulator",
+                    "--port",
+                    "0",
+                    "--latency",
+                    str(latency),
+                ],
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            self.url = self.process.stdout.readline().rsplit(" ", 1)[-1].strip()
+        else:
+            self.emulator = GatewayEmulator(latency=latency)
+            self.url = INPROCESS_URL
+
+    def client(self, concurrency: int) -> MoMoPSBAPI:
+        api = MoMoPSBAPI(
+            self.url, "bench-key", pool_maxsize=max(concurrency, 10), pool_block=True
+        )
+        if self.emulator is not None:
+            api.session.mount(self.url, EmulatorAdapter(self.emulator))
+        return api
+
+    def async_client(self, concurrency: int):
+        import httpx
+
+        from momo_psb.async_api import AsyncMoMoPSBAPI
+
+        if self.emulator is not None:
+            from momo_psb.emulator import httpx_transport
+
+            client = httpx.AsyncClient(transport=httpx_transport(self.emulator))
+            return AsyncMoMoPSBAPI(self.url, "bench-key", client=client)
+        return AsyncMoMoPSBAPI(
+            self.url,
+            "bench-key",
+            max_connections=concurrency,
+            max_keepalive_connections=concurrency,
+        )
+
+    def close(self) -> None:
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait()
+
+
+def provision(api: MoMoPSBAPI) -> Tuple[str, str]:
+    """
+    Create an API user and key on the gateway.
+    """
+    api_user = str(uuid.uuid4())
+    api.create_api_user(api_user, "bench.local").raise_for_status()
+    return api_user, api.create_api_key(api_user).json()["apiKey"]
+
+
+def count_requests(api: MoMoPSBAPI) -> List[int]:
+    """
+    Count the HTTP requests a sync client sends.
+    """
+    counter = [0]
+
+    def hook(response, *args, **kwargs):
+        counter[0] += 1
+
+    api.session.hooks["response"].append(hook)
+    return counter
+
+
+def sync_flow(name: str, api: MoMoPSBAPI) -> Callable[[], Any]:
+    """
+    Build one iteration of a flow for the sync client.
+    """
+    if name == "token":
+        api_user, api_key = api.api_user, api.api_key
+        return lambda: api.validate_response(api.get_oauth_token(api_user, api_key))
+    if name == "token_cached":
+        return api.get_access_token
+
+    if name == "request_to_pay":
+
+        def request_to_pay() -> None:
+            reference_id = str(uuid.uuid4())
+            api.request_to_pay(
+                reference_id, None, 100, "EUR", reference_id, PAYER, "bench", "bench"
+            ).raise_for_status()
+            while api.get_request_to_pay_status(reference_id)["status"] == "PENDING":
+                pass
+
+        return request_to_pay
+
+    def bulk_invoice() -> None:
+        reference_id = str(uuid.uuid4())
+        api.create_invoice(
+            reference_id, None, reference_id, 100, "EUR", "3600", PAYER, PAYER
+        ).raise_for_status()
+
+    return bulk_invoice
+
+
+def async_flow(name: str, api) -> Callable[[], Awaitable[Any]]:
+    """
+    Build one iteration of a flow for the async client.
+    """
+    if name == "token":
+
+        async def token() -> None:
+            response = await api.get_oauth_token(api.api_user, api.api_key)
+            api.validate_response(response)
+
+        return token
+    if name == "token_cached":
+        return api.get_access_token
+
+    if name == "request_to_pay":
+
+        async def request_to_pay() -> None:
+            reference_id = str(uuid.uuid4())
+            response = await api.request_to_pay(
+                reference_id, None, 100, "EUR", reference_id, PAYER, "bench", "bench"
+            )
+            response.raise_for_status()
+            while (await api.get_request_to_pay_status(reference_id))[
+                "status"
+            ] == "PENDING":
+                pass
+
+        return request_to_pay
+
+    async def bulk_invoice() -> None:
+        reference_id = str(uuid.uuid4())
+        response = await api.create_invoice(
+            reference_id, None, reference_id, 100, "EUR", "3600", PAYER, PAYER
+        )
+        response.raise_for_status()
+
+    return bulk_invoice
+
+
+def timed(call: Callable[[], Any], latencies: List[float]) -> None:
+    started = time.perf_counter()
+    call()
+    latencies.append(time.perf_counter() - started)
+
+
+def run_sync(
+    call: Callable[[], Any], iterations: int, concurrency: int
+) -> Tuple[List[float], float]:
+    """
+    Run a flow sequentially, or from ``concurrency`` threads.
+
+    :return: Per-iteration latencies and the wall time.
+    """
+    latencies: List[float] = []
+    started = time.perf_counter()
+    if concurrency == 1:
+        for _ in range(iterations):
+            timed(call, latencies)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(lambda _: timed(call, latencies), range(iterations)))
+    return latencies, time.perf_counter() - started
+
+
+async def run_async(
+    call: Callable[[], Awaitable[Any]], iterations: int, concurrency: int
+) -> Tuple[List[float], float]:
+    """
+    Run a flow as ``concurrency`` concurrent tasks.
+
+    :return: Per-iteration latencies and the wall time.
+    """
+    latencies: List[float] = []
+    remaining = iter(range(iterations))
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - started
+
+
+def measure_allocations(call: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    """
+    Trace memory while running a flow sequentially.
+
+    tracemalloc slows every allocation down, so this runs as a separate pass.
+
+    :return: Peak traced memory and net retained bytes per iteration.
+    """
+    call()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        for _ in range(iterations):
+            call()
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    return {
+        "alloc_peak_kib": round(peak / 1024, 1),
+        "retained_bytes_per_op": round(
+            sum(stat.size_diff for stat in diff) / iterations, 1
+        ),
+        "retained_blocks_per_op": round(
+            sum(stat.count_diff for stat in diff) / iterations, 2
+        ),
+    }
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(
+    latencies: List[float], wall: float, cpu: float, requests: int
+) -> Dict[str, Any]:
+    ops = len(latencies)
+    return {
+        "ops": ops,
+        "seconds": round(wall, 4),
+        "ops_per_sec": round(ops / wall, 1),
+        "requests_per_sec": round(requests / wall, 1),
+        "requests_per_op": round(requests / ops, 2),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies) * 1000, 3),
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(max(latencies) * 1000, 3),
+        },
+        "cpu_ms_per_op": round(cpu / ops * 1000, 4),
+    }
+
+
+def bench_sync(
+    gateway: Gateway, flow: str, mode: str, args: argparse.Namespace
+) -> Dict[str, Any]:
+    concurrency = 1 if mode == "sync" else args.concurrency
+    with gateway.client(concurrency) as api:
+        api.api_user, api.api_key = provision(api)
+        call = sync_flow(flow, api)
+        for _ in range(args.warmup):
+            call()
+        counter = count_requests(api)
+        cpu = time.process_time()
+        latencies, wall = run_sync(call, args.iterations, concurrency)
+        result = summarize(latencies, wall, time.process_time() - cpu, counter[0])
+        if mode == "sync" and args.alloc_iterations:
+            result.update(measure_allocations(call, args.alloc_iterations))
+    return {"concurrency": concurrency, **result}
+
+
+def bench_async(
+    gateway: Gateway, flow: str, args: argparse.Namespace
+) -> Dict[str, Any]:
+    with gateway.client(1) as sync_api:
+        credentials = provision(sync_api)
+
+    async def main() -> Dict[str, Any]:
+        counter = [0]
+
+        async def hook(response) -> None:
+            counter[0] += 1
+
+        async with gateway.async_client(args.concurrency) as api:
+            api.api_user, api.api_key = credentials
+            call = async_flow(flow, api)
+            for _ in range(args.warmup):
+                await call()
+            api.client.event_hooks["response"].append(hook)
+            cpu = time.process_time()
+            latencies, wall = await run_async(call, args.iterations, args.concurrency)
+            return summarize(latencies, wall, time.process_time() - cpu, counter[0])
+
+    return {"concurrency": args.concurrency, **asyncio.run(main())}
+
+
+def sdk_version() -> str:
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+
+        return version("momo-psb")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline_path: str, threshold: float
+) -> List[str]:
+    """
+    Compare results with a baseline run.
+
+    :return: Descriptions of benchmarks whose throughput dropped, or whose p95
+        latency grew, by more than ``threshold``.
+    """
+    with open(baseline_path) as file:
+        baseline = {
+            (r["flow"], r["mode"], r["transport"], r["concurrency"]): r
+            for r in json.load(file)["results"]
+        }
+    regressions = []
+    for result in results:
+        key = (
+            result["flow"],
+            result["mode"],
+            result["transport"],
+            result["concurrency"],
+        )
+        before = baseline.get(key)
+        if before is None:
+            continue
+        name = "/".join(str(part) for part in key)
+        if result["ops_per_sec"] < before["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name}: {before['ops_per_sec']} -> {result['ops_per_sec']} ops/s"
+            )
+        p95, old_p95 = result["latency_ms"]["p95"], before["latency_ms"]["p95"]
+        if p95 > old_p95 * (1 + threshold):
+            regressions.append(f"{name}: p95 {old_p95} -> {p95} ms")
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--flows", default=",".join(FLOWS))
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--transports", default="loopback")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--alloc-iterations",
+        type=int,
+        default=100,
+        help="Iterations of the tracemalloc pass in sync mode (0 disables it).",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Emulated gateway latency (s)."
+    )
+    parser.add_argument("--output", help="Write results to this JSON file.")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    flows = [flow for flow in args.flows.split(",") if flow]
+    modes = [mode for mode in args.modes.split(",") if mode]
+    transports = [transport for transport in args.transports.split(",") if transport]
+    for value, allowed in ((flows, FLOWS), (modes, MODES), (transports, TRANSPORTS)):
+        unknown = set(value) - set(allowed)
+        if unknown:
+            raise SystemExit(f"Unknown choice(s) {sorted(unknown)}; use {allowed}.")
+    if "async" in modes:
+        try:
+            import httpx  # noqa: F401
+        except ImportError:
+            print("httpx is not installed; skipping async mode.", file=sys.stderr)
+            modes.remove("async")
+
+    results = []
+    for transport in transports:
+        gateway = Gateway(transport, args.latency)
+        try:
+            for flow in flows:
+                for mode in modes:
+                    if mode == "async":
+                        result = bench_async(gateway, flow, args)
+                    else:
+                        result = bench_sync(gateway, flow, mode, args)
+                    result = {
+                        "flow": flow,
+                        "mode": mode,
+                        "transport": transport,
+                        **result,
+                    }
+                    results.append(result)
+                    print(
+                        f"{flow:>15} {mode:>7} {transport:>9}: "
+                        f"{result['ops_per_sec']:>9} ops/s  "
+                        f"p50 {result['latency_ms']['p50']} ms  "
+                        f"p99 {result['latency_ms']['p99']} ms",
+                        file=sys.stderr,
+                    )
+        finally:
+            gateway.close()
+
+    report = {
+        "meta": {
+            "sdk_version": sdk_version(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "json_codec": get_codec().name,
+            "iterations": args.iterations,
+            "latency": args.latency,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Startup-time benchmark for the MoMo PSB SDK and CLI.
+
+Each scenario runs in a fresh interpreter and is timed end to end; the cost of
+starting a bare interpreter is measured the same way and subtracted. Results are
+printed (or written with ``--output``) as JSON, and the run fails when a
+scenario's median exceeds ``--budget-ms``.
+
+Usage::
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 30 --budget-ms 50 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+SCENARIOS: Dict[str, List[str]] = {
+    "import_package": ["-c", "import momo_psb"],
+    "import_cli": ["-c", "import momo_psb.cli"],
+    # What the `momo-psb --help` console script runs.
+    "cli_help": ["-c", "from momo_psb.cli import main; main()", "--help"],
+    "import_client": ["-c", "from momo_psb import MoMoPSBAPI"],
+}
+"""Interpreter arguments of each scenario."""
+
+BUDGETED = ("import_package", "import_cli", "cli_help")
+"""Scenarios held to the budget; importing the client itself loads requests."""
+
+
+def run_once(args: List[str]) -> float:
+    """
+    Run the interpreter with ``args`` and return the wall time in milliseconds.
+
+    Bytecode caching is left on, so the warm-up run compiles the modules once
+    as an installed package would.
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, *args], check=True, stdout=subprocess.DEVNULL, env=env
+    )
+    return (time.perf_counter() - started) * 1000
+
+
+def measure(args: List[str], runs: int) -> float:
+    """
+    Median wall time of ``runs`` runs, after one warm-up run.
+    """
+    run_once(args)
+    return statistics.median(run_once(args) for _ in range(runs))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=100.0,
+        help="Maximum median milliseconds above bare interpreter startup.",
+    )
+    parser.add_argument("--output", help="Write results to this JSON file.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    baseline = measure(["-c", "pass"], args.runs)
+    results = []
+    for name in args.scenarios.split(","):
+        overhead = measure(SCENARIOS[name], args.runs) - baseline
+        results.append(
+            {
+                "scenario": name,
+                "median_ms": round(overhead, 2),
+                "budgeted": name in BUDGETED,
+                "over_budget": name in BUDGETED and overhead > args.budget_ms,
+            }
+        )
+    report = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "runs": args.runs,
+            "interpreter_ms": round(baseline, 2),
+            "budget_ms": args.budget_ms,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    print(text)
+    over = [result["scenario"] for result in results if result["over_budget"]]
+    if over:
+        print(f"Over the startup budget: {', '.join(over)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
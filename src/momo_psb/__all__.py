@@ -1,5 +0,0 @@
-"""MoMo PSB API SDK - A Python SDK for integrating with the MTN MoMo API (Payment Service Bank)."""
-
-from momo_psb.api import MoMoPSBAPI
-
-__all__ = ["MoMoPSBAPI"]
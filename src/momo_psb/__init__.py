@@ -0,0 +1,26 @@
+"""MoMo PSB API SDK - A Python SDK for integrating with the MTN MoMo API (Payment Service Bank)."""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .api import MoMoPSBAPI
+
+__all__ = ["MoMoPSBAPI"]
+
+# Public names and the submodule defining them. They are imported on first access,
+# so `import momo_psb` (and every CLI invocation) does not pay for requests.
+_LAZY_ATTRIBUTES = {"MoMoPSBAPI": "api"}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
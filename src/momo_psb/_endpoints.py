@@ -0,0 +1,82 @@
+import re
+from typing import Dict, FrozenSet
+
+PRODUCTS: FrozenSet[str] = frozenset({"collection", "disbursement", "remittance"})
+
+ENDPOINT_GROUPS: Dict[str, str] = {
+    "apiuser": "apiuser",
+    "token": "token",
+    "requesttopay": "requesttopay",
+    "requesttowithdraw": "requesttowithdraw",
+    "invoice": "invoice",
+    "preapproval": "preapproval",
+    "preapprovals": "preapproval",
+    "payment": "payment",
+    "transfer": "transfer",
+    "deposit": "deposit",
+    "refund": "refund",
+    "accountholder": "accountholder",
+    "account": "account",
+}
+"""Maps a path segment to the endpoint group it belongs to."""
+
+STATIC_SEGMENTS: FrozenSet[str] = (
+    PRODUCTS
+    | frozenset(ENDPOINT_GROUPS)
+    | {"active", "apikey", "balance", "basicuserinfo"}
+)
+"""Path segments that are part of a route rather than a parameter."""
+
+_VERSION = re.compile(r"v\d+_\d+")
+
+
+def endpoint_family(path: str) -> str:
+    """
+    Map a request path to its endpoint family, e.g. "collection/v1_0".
+
+    :param path: Request path relative to the base URL.
+    :return: The product and API version (or the first path segment for
+        endpoints outside a product, such as "v1_0" for API user provisioning).
+    """
+    segments = [segment for segment in path.split("/") if segment]
+    if not segments:
+        return ""
+    if segments[0] in PRODUCTS and len(segments) > 1:
+        return f"{segments[0]}/{segments[1]}"
+    return segments[0]
+
+
+def endpoint_group(path: str) -> str:
+    """
+    Map a request path to its endpoint group, e.g. "requesttopay" or "token".
+
+    :param path: Request path relative to the base URL.
+    :return: The endpoint group, or the endpoint family for unknown paths.
+    """
+    for segment in path.split("/"):
+        group = ENDPOINT_GROUPS.get(segment)
+        if group is not None:
+            return group
+    return endpoint_family(path)
+
+
+def route_template(path: str) -> str:
+    """
+    Replace the parameters of a request path with placeholders, e.g.
+    "/collection/v1_0/accountholder/{id}/{id}/active".
+
+    Reference IDs and account holder IDs such as MSISDNs never appear in the
+    result, so it is safe to export to telemetry backends.
+
+    :param path: Request path relative to the base URL; a query string is dropped.
+    :return: The route template.
+    """
+    segments = path.split("?", 1)[0].split("/")
+    return "/".join(
+        (
+            segment
+            if not segment or segment in STATIC_SEGMENTS or _VERSION.fullmatch(segment)
+            else "{id}"
+        )
+        for segment in segments
+    )
@@ -0,0 +1,1538 @@
+import asyncio
+import ssl
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+try:
+    import httpx
+except ImportError as exc:  # pragma: no cover - exercised only without httpx
+    raise ImportError(
+        "AsyncMoMoPSBAPI requires httpx. Install it with `pip install momo-psb[async]`."
+    ) from exc
+
+from .bulk import BulkResult, amap_bounded, with_reference_id
+from .cache import TTLCache, is_inactive, is_not_found
+from .circuit import CircuitBreakerRegistry
+from .codec import JSON_CONTENT_TYPE, JSONCodec, get_codec
+from .headers import SUBSCRIPTION_KEY_HEADER, HeaderTemplates
+from .http2 import require_h2
+from .instrumentation import (
+    Instrumentation,
+    ResponseEvent,
+    RetryEvent,
+    ThrottleEvent,
+    request_event,
+)
+from .models import (
+    AccountHolderStatus,
+    Balance,
+    BasicUserInfo,
+    Invoice,
+    Model,
+    PreApproval,
+    TransactionStatus,
+    parse_list,
+)
+from .ratelimit import RateLimiter
+from .retry import NOT_PROCESSED_STATUSES, RetryPolicy, parse_retry_after
+from .tokens import TokenManager
+
+if TYPE_CHECKING:
+    from .journal import TransactionJournal
+
+
+class AsyncMoMoPSBAPI:
+    """
+    An asyncio Python SDK for integrating with the MTN MoMo API (Payment Service Bank).
+
+    Mirrors every endpoint of :class:`momo_psb.api.MoMoPSBAPI` as a coroutine.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        subscription_key: str,
+        api_user: Optional[str] = None,
+        api_key: Optional[str] = None,
+        token_manager: Optional[TokenManager] = None,
+        callback_url: Optional[str] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        http2: bool = False,
+        client: Optional[httpx.AsyncClient] = None,
+        timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        account_cache: Optional[TTLCache] = None,
+        response_models: bool = False,
+        json_codec: Optional[JSONCodec] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        journal: Optional["TransactionJournal"] = None,
+        product_keys: Optional[Mapping[str, str]] = None,
+        product_credentials: Optional[Mapping[str, Tuple[str, str]]] = None,
+    ):
+        """
+        Initialize the AsyncMoMoPSBAPI.
+
+        All endpoints share one pooled :class:`httpx.AsyncClient`, so a single event
+        loop can keep many requests in flight over warm keep-alive connections.
+        Call :meth:`aclose` (or use the client as an async context manager) to
+        release the pooled connections.
+
+        :param base_url: Base URL for the Wallet Platform API.
+        :param subscription_key: Subscription key for the API Manager portal.
+        :param api_user: API User ID used to fetch access tokens automatically.
+        :param api_key: API Key used to fetch access tokens automatically.
+        :param token_manager: Token cache shared with other clients. A private
+            cache is created when omitted.
+        :param callback_url: Default URL the gateway notifies when a transaction
+            settles. No X-Callback-Url header is sent when it is None.
+        :param max_connections: Maximum number of concurrent connections.
+        :param max_keepalive_connections: Maximum number of idle connections kept
+            open for reuse.
+        :param keepalive_expiry: Seconds an idle connection is kept open.
+        :param ssl_context: SSL context shared by every pooled connection.
+        :param http2: Negotiate HTTP/2, so concurrent requests share one
+            multiplexed connection per host. Hosts without HTTP/2 are served
+            over HTTP/1.1. Requires ``momo-psb[http2]``.
+        :param client: Pre-configured client to use instead of building one.
+            The SDK does not close a client it did not create.
+        :param timeout: Seconds to wait for the gateway before giving up on a
+            request. No timeout is applied when None.
+        :param retry_policy: Policy for retrying transient failures. Requests
+            are not retried when None.
+        :param rate_limiter: Client-side rate limiter, possibly shared with other
+            clients using the same subscription key.
+        :param circuit_breakers: Circuit breakers per endpoint group. While a
+            group's circuit is open its calls raise :class:`CircuitOpenError`
+            without reaching the gateway.
+        :param account_cache: Cache for account holder validation and basic user
+            info lookups, keyed by environment, ID type and ID.
+        :param response_models: Return typed, lazily parsed result models (see
+            :mod:`momo_psb.models`) from the status and lookup endpoints instead
+            of dictionaries.
+        :param json_codec: Codec for request and response bodies. Defaults to the
+            fastest installed backend (see :mod:`momo_psb.codec`).
+        :param instrumentation: Hooks notified of every request, response, retry
+            and 429 response (see :mod:`momo_psb.instrumentation`). No hooks run
+            when None.
+        :param journal: Local record of every transaction the write calls
+            create (see :mod:`momo_psb.journal`). Nothing is recorded when None.
+        :param product_keys: Subscription keys of products whose key differs
+            from ``subscription_key``, e.g. ``{"disbursement": "..."}``.
+        :param product_credentials: ``(api_user, api_key)`` of products whose
+            API user differs from ``api_user``. Tokens are cached per product.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.subscription_key = subscription_key
+        self.header_templates = HeaderTemplates(subscription_key, product_keys)
+        self.headers = self.header_templates.base
+        self.api_user = api_user
+        self.api_key = api_key
+        self.product_credentials = dict(product_credentials or {})
+        self.token_manager = token_manager or TokenManager()
+        self.callback_url = callback_url
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.circuit_breakers = circuit_breakers
+        self.account_cache = account_cache
+        self.response_models = response_models
+        self.json_codec = json_codec or get_codec()
+        self.instrumentation = instrumentation
+        self.journal = journal
+        self._owns_client = client is None
+        if client is None:
+            if http2:
+                require_h2()
+            client = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+                verify=ssl_context if ssl_context is not None else True,
+                timeout=timeout,
+            )
+        self.client = client
+
+    async def aclose(self) -> None:
+        """
+        Close the pooled connections held by the client.
+        """
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncMoMoPSBAPI":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a single request through the pooled client.
+
+        :param method: HTTP method.
+        :param url: Absolute request URL.
+        :return: Response object.
+        """
+        instrumentation = self.instrumentation
+        if (
+            self.rate_limiter is None
+            and self.circuit_breakers is None
+            and instrumentation is None
+        ):
+            return await self.client.request(method, url, **kwargs)
+        path = url[len(self.base_url) :]
+        # Products may have their own subscription key; limit the key sent.
+        subscription_key = kwargs.get("headers", {}).get(
+            SUBSCRIPTION_KEY_HEADER, self.subscription_key
+        )
+        if self.rate_limiter is not None:
+            await self.rate_limiter.aacquire(subscription_key, path)
+        breaker = None
+        if self.circuit_breakers is not None:
+            breaker = self.circuit_breakers.for_path(path)
+            breaker.before_call()
+        event = context = None
+        if instrumentation is not None:
+            try:
+                event = request_event(method, url, self.base_url)
+                context = instrumentation.on_request(event)
+            except BaseException:
+                # The request is never sent; free its half-open trial slot.
+                if breaker is not None:
+                    breaker.release()
+                raise
+        started = time.monotonic()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except Exception as exc:
+            elapsed = time.monotonic() - started
+            if breaker is not None:
+                breaker.record(False, elapsed)
+            if instrumentation is not None:
+                instrumentation.on_response(
+                    ResponseEvent(event, None, elapsed, exc), context
+                )
+            raise
+        elapsed = time.monotonic() - started
+        if breaker is not None:
+            breaker.record(response.status_code < 500, elapsed)
+        if instrumentation is not None:
+            instrumentation.on_response(
+                ResponseEvent(event, response.status_code, elapsed), context
+            )
+        if response.status_code == 429:
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            if self.rate_limiter is not None:
+                self.rate_limiter.throttled(subscription_key, path, delay or 1.0)
+            if instrumentation is not None:
+                instrumentation.on_throttle(
+                    ThrottleEvent(method, event.endpoint, delay)
+                )
+        return response
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        status_url: Optional[str] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send a request, retrying transient failures according to the retry policy.
+
+        See :meth:`momo_psb.api.MoMoPSBAPI._request` for the retry semantics.
+
+        :param method: HTTP method.
+        :param url: Absolute request URL.
+        :param status_url: Status endpoint of the transaction created by the call.
+        :param idempotent: Whether the call may be retried; defaults to True for
+            idempotent methods and for calls with a ``status_url``.
+        :return: Response object.
+        """
+        if "json" in kwargs:
+            # Encode once with the configured codec; retries resend the same bytes.
+            kwargs["content"] = self.json_codec.dumps(kwargs.pop("json"))
+            kwargs["headers"] = {
+                **kwargs.get("headers", {}),
+                "Content-Type": JSON_CONTENT_TYPE,
+            }
+        policy = self.retry_policy
+        if idempotent is None and status_url is not None:
+            idempotent = True
+        if policy is None or not policy.should_retry(method, idempotent):
+            return await self._send(method, url, **kwargs)
+
+        attempt = 1
+        while True:
+            response = error = None
+            try:
+                response = await self._send(method, url, **kwargs)
+            except httpx.TransportError as exc:
+                if attempt >= policy.max_attempts:
+                    raise
+                error = exc
+                ambiguous = not isinstance(
+                    exc, (httpx.ConnectError, httpx.ConnectTimeout)
+                )
+            else:
+                if attempt > 1 and status_url and response.status_code == 409:
+                    existing = await self._existing_transaction(status_url, kwargs)
+                    return existing or response
+                if (
+                    response.status_code not in policy.retry_statuses
+                    or attempt >= policy.max_attempts
+                ):
+                    return response
+                ambiguous = response.status_code not in NOT_PROCESSED_STATUSES
+            delay = policy.delay(attempt, response)
+            if self.instrumentation is not None:
+                self.instrumentation.on_retry(
+                    RetryEvent(
+                        method,
+                        request_event(method, url, self.base_url).endpoint,
+                        attempt,
+                        delay,
+                        response.status_code if response is not None else None,
+                        error,
+                    )
+                )
+            await asyncio.sleep(delay)
+            if status_url and ambiguous:
+                existing = await self._existing_transaction(status_url, kwargs)
+                if existing is not None:
+                    return existing
+            attempt += 1
+
+    async def _submit(
+        self,
+        kind: str,
+        url: str,
+        reference_id: str,
+        payload: Dict[str, Any],
+        headers: Dict[str, str],
+        target_environment: str,
+    ) -> httpx.Response:
+        """
+        Post a write call, recording the transaction in the journal if there is one.
+
+        :param kind: Transaction kind, a key of :data:`momo_psb.polling.STATUS_METHODS`.
+        :param url: Collection URL of the transaction.
+        :param reference_id: X-Reference-Id of the transaction.
+        :param payload: Request body.
+        :param headers: Request headers.
+        :param target_environment: The target environment.
+        :return: Response object.
+        """
+        journal = self.journal
+        if journal is not None:
+            journal.begin(kind, reference_id, payload, target_environment)
+        try:
+            response = await self._request(
+                "POST",
+                url,
+                status_url=f"{url}/{reference_id}",
+                json=payload,
+                headers=headers,
+            )
+        except Exception as exc:
+            if journal is not None:
+                journal.finish(reference_id, error=exc)
+            raise
+        if journal is not None:
+            journal.finish(reference_id, response.status_code)
+        return response
+
+    async def _existing_transaction(
+        self, status_url: str, kwargs: Dict[str, Any]
+    ) -> Optional[httpx.Response]:
+        """
+        Look up a transaction that an ambiguous write may have created.
+
+        :param status_url: Status endpoint of the transaction.
+        :param kwargs: Keyword arguments of the write request.
+        :return: The status response when the transaction exists, else None.
+        """
+        headers = {
+            name: value
+            for name, value in kwargs.get("headers", {}).items()
+            if name not in ("X-Callback-Url", "X-Reference-Id", "Content-Type")
+        }
+        try:
+            response = await self._send("GET", status_url, headers=headers)
+        except httpx.TransportError:
+            return None
+        return response if response.status_code == 200 else None
+
+    async def create_api_user(
+        self, reference_id: str, provider_callback_host: str
+    ) -> httpx.Response:
+        """
+        Create a new API User.
+
+        :param reference_id: UUID Reference ID to be used as the User ID.
+        :param provider_callback_host: Callback host for the provider.
+        :return: Response object.
+        """
+        url = f"{self.base_url}/v1_0/apiuser"
+        headers = self._headers(reference_id=reference_id, product=None)
+        payload = {"providerCallbackHost": provider_callback_host}
+        response = await self._request(
+            "POST",
+            url,
+            status_url=f"{url}/{reference_id}",
+            json=payload,
+            headers=headers,
+        )
+        return response
+
+    async def create_api_key(self, api_user: str) -> httpx.Response:
+        """
+        Create a new API Key for an existing API User.
+
+        :param api_user: The API User ID.
+        :return: Response object containing the API Key.
+        """
+        url = f"{self.base_url}/v1_0/apiuser/{api_user}/apikey"
+        response = await self._request("POST", url, headers=self.headers)
+        return response
+
+    async def get_api_user_details(self, api_user: str) -> httpx.Response:
+        """
+        Retrieve details of an API User.
+
+        :param api_user: The API User ID.
+        :return: Response object containing API User details.
+        """
+        url = f"{self.base_url}/v1_0/apiuser/{api_user}"
+        response = await self._request("GET", url, headers=self.headers)
+        return response
+
+    async def get_oauth_token(
+        self,
+        api_user: str,
+        api_key: str,
+        target_environment: str = "sandbox",
+        product: str = "collection",
+    ) -> httpx.Response:
+        """
+        Obtain an OAuth 2.0 access token.
+
+        :param api_user: API User ID for basic authentication.
+        :param api_key: API Key for basic authentication.
+        :param target_environment: The target environment (default is "sandbox").
+        :param product: API product the token is for, e.g. "disbursement".
+        :return: Response object containing the access token.
+        """
+        url = f"{self.base_url}/{product}/token/"
+        auth = httpx.BasicAuth(api_user, api_key)
+        headers = self._headers(target_environment=target_environment, product=product)
+        payload = {"grant_type": "client_credentials"}
+
+        # Use `auth` to handle the Authorization header
+        response = await self._request(
+            "POST", url, idempotent=True, data=payload, headers=headers, auth=auth
+        )
+
+        return response
+
+    async def get_access_token(
+        self, target_environment: str = "sandbox", product: str = "collection"
+    ) -> str:
+        """
+        Get a cached access token for the client credentials, refreshing it ahead
+        of expiry.
+
+        :param target_environment: The target environment (default is "sandbox").
+        :param product: API product the token is for, e.g. "disbursement".
+        :return: The access token.
+        """
+        api_user, api_key = self.product_credentials.get(
+            product, (self.api_user, self.api_key)
+        )
+        if not (api_user and api_key):
+            raise ValueError(
+                "An access_token is required when the client has no api_user/api_key."
+            )
+        key = (api_user, product, target_environment)
+
+        async def fetch() -> Dict[str, Any]:
+            response = await self.get_oauth_token(
+                api_user, api_key, target_environment, product
+            )
+            return self.validate_response(response)
+
+        return await self.token_manager.aget_token(key, fetch)
+
+    async def _resolve_token(
+        self,
+        access_token: Optional[str],
+        target_environment: str,
+        product: str = "collection",
+    ) -> str:
+        """
+        Return the explicit access token, or a managed one when it is omitted.
+        """
+        if access_token:
+            return access_token
+        return await self.get_access_token(target_environment, product)
+
+    async def request_to_pay(
+        self,
+        reference_id: str,
+        access_token: Optional[str],
+        amount: float,
+        currency: str,
+        external_id: str,
+        payer: Dict[str, str],
+        payer_message: str,
+        payee_note: str,
+        callback_url: Optional[str] = None,
+    ) -> httpx.Response:
+        """
+        Request a payment from a consumer (Payer).
+
+        :param reference_id: UUID Reference ID for the transaction.
+        :param access_token: Bearer Authentication Token. When None, a cached token
+            is fetched with the client credentials.
+        :param amount: Amount to be debited from the payer account.
+        :param currency: ISO4217 Currency code.
+        :param external_id: External ID used as a reference to the transaction.
+        :param payer: Dictionary with 'partyIdType' and 'partyId' keys identifying the payer.
+        :param payer_message: Message written in the payer transaction history message field.
+        :param payee_note: Message written in the payee transaction history note field.
+        :param callback_url: URL the gateway notifies when the transaction
+            settles. Defaults to the client callback URL.
+        :return: Response object.
+        """
+        access_token = await self._resolve_token(access_token, "sandbox")
+        url = f"{self.base_url}/collection/v1_0/requesttopay"
+        headers = self._headers(
+            access_token,
+            "sandbox",
+            reference_id=reference_id,
+            callback_url=callback_url or self.callback_url,
+        )
+        payload = {
+            "amount": float(amount),
+            "currency": currency,
+            "externalId": external_id,
+            "payer": payer,
+            "payerMessage": payer_message,
+            "payeeNote": payee_note,
+        }
+        response = await self._submit(
+            "request_to_pay", url, reference_id, payload, headers, "sandbox"
+        )
+        return response
+
+    async def request_to_pay_many(
+        self,
+        payments: Union[Iterable[Mapping[str, Any]], AsyncIterable[Mapping[str, Any]]],
+        concurrency: int = 100,
+    ) -> AsyncIterator[BulkResult]:
+        """
+        Submit many request to pay transactions with bounded concurrency.
+
+        Payment specs are consumed lazily and results are yielded as each call
+        completes, so arbitrarily large inputs run in constant memory.
+
+        :param payments: Sync or async iterable of keyword arguments for
+            :meth:`request_to_pay`. 'reference_id' is generated when missing and
+            'access_token' defaults to the managed token.
+        :param concurrency: Maximum number of requests in flight.
+        :return: Async iterator of :class:`BulkResult` in completion order.
+        """
+
+        async def submit(spec: Dict[str, Any]) -> httpx.Response:
+            return await self.request_to_pay(**{"access_token": None, **spec})
+
+        async def specs() -> AsyncIterator[Dict[str, Any]]:
+            if isinstance(payments, AsyncIterable):
+                async for spec in payments:
+                    yield with_reference_id(spec)
+            else:
+                for spec in payments:
+                    yield with_reference_id(spec)
+
+        results = amap_bounded(submit, specs(), concurrency)
+        async for index, spec, response, error in results:
+            yield BulkResult(index, spec["reference_id"], spec, response, error)
+
+    def _headers(
+        self,
+        access_token: Optional[str] = None,
+        target_environment: Optional[str] = None,
+        reference_id: Optional[str] = None,
+        callback_url: Optional[str] = None,
+        product: Optional[str] = "collection",
+    ) -> Dict[str, str]:
+        """
+        Build the headers of one request from the precomputed templates.
+
+        The templates are never mutated, so concurrent calls on one client cannot
+        leak each other's reference IDs or tokens.
+
+        :param access_token: Bearer token for the Authorization header.
+        :param target_environment: Value of the X-Target-Environment header.
+        :param reference_id: Value of the X-Reference-Id header.
+        :param callback_url: Value of the X-Callback-Url header.
+        :param product: API product of the endpoint.
+        :return: Headers owned by the caller.
+        """
+        return self.header_templates.build(
+            product, target_environment, access_token, reference_id, callback_url
+        )
+
+    def validate_response(self, response: httpx.Response) -> Dict[str, Any]:
+        """
+        Validate the API response.
+
+        :param response: The response object.
+        :return: Parsed JSON data if the response is successful; raises an error otherwise.
+        """
+        if response.status_code in (200, 201, 202):
+            return self.json_codec.loads(response.content)
+        else:
+            response.raise_for_status()
+
+    def _parse(
+        self, response: httpx.Response, model: Type[Model], many: bool = False
+    ) -> Any:
+        """
+        Validate a response and return its body as a model or a dictionary.
+
+        :param response: The response object.
+        :param model: Model class used when ``response_models`` is enabled.
+        :param many: The body is a JSON array of ``model`` items.
+        :return: The parsed body.
+        """
+        if not self.response_models:
+            return self.validate_response(response)
+        if response.status_code in (200, 201, 202):
+            if many:
+                return parse_list(model, response.content)
+            return model.from_response(response)
+        response.raise_for_status()
+
+    async def get_account_balance(
+        self, access_token: Optional[str] = None, target_environment: str = "sandbox"
+    ) -> Mapping[str, Any]:
+        """
+        Get the balance of the account.
+
+        :param access_token: Bearer Authentication Token. When None, a cached token
+            is fetched with the client credentials.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: Dictionary containing the account balance.
+        """
+        access_token = await self._resolve_token(access_token, target_environment)
+        url = f"{self.base_url}/collection/v1_0/account/balance"
+        headers = self._headers(access_token, target_environment)
+        response = await self._request("GET", url, headers=headers)
+        return self._parse(response, Balance)
+
+    async def _cached_lookup(
+        self, key: Tuple[str, ...], fetch: Callable[[], Awaitable[Mapping[str, Any]]]
+    ) -> Mapping[str, Any]:
+        """
+        Serve an account holder lookup from the account cache when enabled.
+
+        :param key: Cache key.
+        :param fetch: Coroutine function performing the lookup.
+        :return: The lookup result.
+        """
+        if self.account_cache is None:
+            return await fetch()
+        return await self.account_cache.aget_or_fetch(
+            key, fetch, is_negative=is_inactive, cache_error=is_not_found
+        )
+
+    async def validate_account_holder_status(
+        self,
+        access_token: Optional[str],
+        account_holder_id_type: str,
+        account_holder_id: str,
+        target_environment: str = "sandbox",
+    ) -> Mapping[str, Any]:
+        """
+        Validate the status of an account holder.
+
+        :param access_token: Bearer Authentication Token. When None, a cached token
+            is fetched with the client credentials.
+        :param account_holder_id_type: Type of the account holder ID (e.g., "msisdn", "email").
+        :param account_holder_id: The account holder ID.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: Dictionary containing the account holder status.
+        """
+
+        async def fetch() -> Mapping[str, Any]:
+            token = await self._resolve_token(access_token, target_environment)
+            url = f"{self.base_url}/collection/v1_0/accountholder/{account_holder_id_type}/{account_holder_id}/active"
+            headers = self._headers(token, target_environment)
+            response = await self._request("GET", url, headers=headers)
+            return self._parse(response, AccountHolderStatus)
+
+        key = (
+            target_environment,
+            account_holder_id_type.lower(),
+            account_holder_id,
+            "active",
+        )
+        return await self._cached_lookup(key, fetch)
+
+    async def get_request_to_pay_status(
+        self,
+        reference_id: str,
+        access_token: Optional[str] = None,
+        target_environment: str = "sandbox",
+    ) -> Mapping[str, Any]:
+        """
+        Get the status of a request to pay transaction.
+
+        :param reference_id: UUID of the transaction.
+        :param access_token: Bearer Authentication Token. When None, a cached token
+            is fetched with the client credentials.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: Dictionary containing the transaction status.
+        """
+        access_token = await self._resolve_token(access_token, target_environment)
+        url = f"{self.base_url}/collection/v1_0/requesttopay/{reference_id}"
+        headers = self._headers(access_token, target_environment)
+        response = await self._request("GET", url, headers=headers)
+        return self._parse(response, TransactionStatus)
+
+    async def get_basic_user_info(
+        self,
+        access_token: Optional[str],
+        account_holder_id_type: str,
+        account_holder_id: str,
+        target_environment: str = "sandbox",
+    ) -> Mapping[str, Any]:
+        """
+        Get basic user information of an account holder.
+
+        :param access_token: Bearer Authentication Token. When None, a cached token
+            is fetched with the client credentials.
+        :param account_holder_id_type: Type of the account holder ID (e.g., "MSISDN", "Email").
+        :param account_holder_id: The account holder ID.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: Dictionary containing basic user information.
+        """
+
+        async def fetch() -> Mapping[str, Any]:
+            token = await self._resolve_token(access_token, target_environment)
+            url = f"{self.base_url}/collection/v1_0/accountholder/{account_holder_id_type}/{account_holder_id}/basicuserinfo"
+            headers = self._headers(token, target_environment)
+            response = await self._request("GET", url, headers=headers)
+            return self._parse(response, BasicUserInfo)
+
+        key = (
+            target_environment,
+            account_holder_id_type.lower(),
+            account_holder_id,
+            "basicuserinfo",
+        )
+        return await self._cached_lookup(key, fetch)
+
+    async def request_to_withdraw(
+        self,
+        reference_id: str,
+        access_token: Optional[str],
+        amount: float,
+        currency: str,
+        external_id: str,
+        payer: Dict[str, str],
+        payer_message: str,
+        payee_note: str,
+        target_environment: str = "sandbox",
+        callback_url: Optional[str] = None,
+    ) -> httpx.Response:
+        """
+        Request a withdrawal from a consumer (Payer).
+
+        :param reference_id: UUID Reference ID for the transaction.
+        :param access_token: Bearer Authentication Token. When None, a cached token
+            is fetched with the client credentials.
+        :param amount: Amount to be debited from the payer account.
+        :param currency: ISO4217 Currency code.
+        :param external_id: External ID used as a reference to the transaction.
+        :param payer: Dictionary with 'partyIdType' and 'partyId' keys identifying the payer.
+        :param payer_message: Message written in the payer transaction history message field.
+        :param payee_note: Message written in the payee transaction history note field.
+        :param target_environment: The target environment (default is "sandbox").
+        :param callback_url: URL the gateway notifies when the transaction
+            settles. Defaults to the client callback URL.
+        :return: Response object.
+        """
+        access_token = await self._resolve_token(access_token, target_environment)
+        url = f"{self.base_url}/collection/v1_0/requesttowithdraw"
+        headers = self._headers(
+            access_token,
+            target_environment,
+            reference_id=reference_id,
+            callback_url=callback_url or self.callback_url,
+        )
+        payload = {
+            "amount": float(amount),
+            "currency": currency,
+            "externalId": external_id,
+            "payer": payer,
+            "payerMessage": payer_message,
+            "payeeNote": payee_note,
+        }
+        response = await self._submit(
+            "request_to_withdraw",
+            url,
+            reference_id,
+            payload,
+            headers,
+            target_environment,
+        )
+        return response
+
+    async def get_request_to_withdraw_status(
+        self,
+        reference_id: str,
+        access_token: Optional[str] = None,
+        target_environment: str = "sandbox",
+    ) -> Mapping[str, Any]:
+        """
+        Get the status of a request to withdraw transaction.
+
+        :param reference_id: UUID of the transaction.
+        :param access_token: Bearer Authentication Token. When None, a cached token
+            is fetched with the client credentials.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: Dictionary containing the transaction status.
+        """
+        access_token = await self._resolve_token(access_token, target_environment)
+        url = f"{self.base_url}/collection/v1_0/requesttowithdraw/{reference_id}"
+        headers = self._headers(access_token, target_environment)
+        response = await self._request("GET", url, headers=headers)
+        return self._parse(response, TransactionStatus)
+
+    async def create_invoice(
+        self,
+        reference_id: str,
+        access_token: Optional[str],
+        external_id: str,
+        amount: float,
+        currency: str,
+        validity_duration: str,
+        intended_payer: Dict[str, str],
+        payee: Dict[str, str],
+        description: Optional[str] = None,
+        target_environment: str = "sandbox",
+        callback_url: Optional[str] = None,
+    ) -> httpx.Response:
+        """
+        Create an invoice that can be paid by an intended payer.
+
+        :param reference_id: UUID Reference ID for the invoice.
+        :param access_token: Bearer Authentication Token. When None, a cached token
+            is fetched with the client credentials.
+        :param external_id: External ID used as a reference to the transaction.
+        :param amount: Amount to be debited from the payer account.
+        :param currency: ISO4217 Currency code.
+        :param validity_duration: The duration that the invoice is valid in seconds.
+        :param intended_payer: Dictionary with 'partyIdType' and 'partyId' keys identifying the intended payer.
+        :param payee: Dictionary with 'partyIdType' and 'partyId' keys identifying the payee.
+        :param description: Optional description of the invoice.
+        :param target_environment: The target environment (default is "sandbox").
+        :param callback_url: URL the gateway notifies when the transaction
+            settles. Defaults to the client callback URL.
+        :return: Response object.
+        """
+        access_token = await self._resolve_token(access_token, target_environment)
+        url = f"{self.base_url}/collection/v2_0/invoice"
+        headers = self._headers(
+            access_token,
+            target_environment,
+            reference_id=reference_id,
+            callback_url=callback_url or self.callback_url,
+        )
+        payload = {
+            "externalId": external_id,
+            "amount": float(amount),
+            "currency": currency,
+            "validityDuration": validity_duration,
+            "intendedPayer": intended_payer,
+            "payee": payee,
+            "description": description,
+        }
+        response = await self._submit(
+            "invoice", url, reference_id, payload, headers, target_environment
+        )
+        return response
+
+    async def get_invoice_status(
+        self,
+        reference_id: str,
+        access_token: Optional[str] = None,
+        target_environment: str = "sandbox",
+    ) -> Mapping[str, Any]:
+        """
+        Get the status of an invoice.
+
+        :param reference_id: UUID of the invoice.
+        :param access_token: Bearer Authentication Token. When None, a cached token
+            is fetched with the client credentials.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: Dictionary containing the invoice status.
+        """
+        access_token = await self._resolve_token(access_token, target_environment)
+        url = f"{self.base_url}/collection/v2_0/invoice/{reference_id}"
+        headers = self._headers(access_token, target_environment)
+        response = await self._request("GET", url, headers=headers)
+        return self._parse(response, Invoice)
+
+    async def cancel_invoice(
+        self,
+        reference_id: str,
+        access_token: Optional[str],
+        external_id: str,
+        target_environment: str = "sandbox",
+    ) -> httpx.Response:
+        """
+        Cancel an invoice.
+
+        :param reference_id: UUID of the invoice.
+        :param access_token: Bearer Authentication Token. When None, a cached token
+            is fetched with the client credentials.
+        :param external_id: External ID used as a reference to the transaction.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: Response object.
+        """
+        access_token = await self._resolve_token(access_token, target_environment)
+        url = f"{self.base_url}/collection/v2_0/invoice/{reference_id}"
+        headers = self._headers(access_token, target_environment)
+        payload = {"externalId": external_id}
+        response = await self._request("DELETE", url, json=payload, headers=headers)
+        return response
+
+    async def create_pre_approval(
+        self,
+        reference_id: str,
+        access_token: Optional[str],
+        payer: Dict[str, str],
+        payer_currency: str,
+        payer_message: str,
+        validity_time: int,
+        target_environment: str = "sandbox",
+        callback_url: Optional[str] = None,
+    ) -> httpx.Response:
+        """
+        Create a pre-approval for a payment.
+
+        :param reference_id: UUID Reference ID for the pre-approval.
+        :param access_token: Bearer Authentication Token. When None, a cached token
+            is fetched with the client credentials.
+        :param payer: Dictionary with 'partyIdType' and 'partyId' keys identifying the payer.
+        :param payer_currency: ISO4217 Currency code of the payer.
+        :param payer_message: Message to the end user.
+        :param validity_time: The time duration in seconds that the pre-approval is valid.
+        :param target_environment: The target environment (default is "sandbox").
+        :param callback_url: URL the gateway notifies when the transaction
+            settles. Defaults to the client callback URL.
+        :return: Response object.
+        """
+        access_token = await self._resolve_token(access_token, target_environment)
+        url = f"{self.base_url}/collection/v2_0/preapproval"
+        headers = self._headers(
+            access_token,
+            target_environment,
+            reference_id=reference_id,
+            callback_url=callback_url or self.callback_url,
+        )
+        payload = {
+            "payer": payer,
+            "payerCurrency": payer_currency,
+            "payerMessage": payer_message,
+            "validityTime": validity_time,
+        }
+        response = await self._submit(
+            "pre_approval", url, reference_id, payload, headers, target_environment
+        )
+        return response
+
+    async def get_pre_approval_status(
+        self,
+        reference_id: str,
+        access_token: Optional[str] = None,
+        target_environment: str = "sandbox",
+    ) -> Mapping[str, Any]:
+        """
+        Get the status of a pre-approval.
+
+        :param reference_id: UUID of the pre-approval.
+        :param access_token: Bearer Authentication Token. When None, a cached token
+            is fetched with the client credentials.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: Dictionary containing the pre-approval status.
+        """
+        access_token = await self._resolve_token(access_token, target_environment)
+        url = f"{self.base_url}/collection/v2_0/preapproval/{reference_id}"
+        headers = self._headers(access_token, target_environment)
+        response = await self._request("GET", url, headers=headers)
+        return self._parse(response, PreApproval)
+
+    async def cancel_pre_approval(
+        self,
+        preapproval_id: str,
+        access_token: Optional[str] = None,
+        target_environment: str = "sandbox",
+    ) -> httpx.Response:
+        """
+        Cancel a pre-approval.
+
+        :param preapproval_id: UUID of the pre-approval.
+        :param access_token: Bearer Authentication Token. When None, a cached token
+            is fetched with the client credentials.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: Response object.
+        """
+        access_token = await self._resolve_token(access_token, target_environment)
+        url = f"{self.base_url}/collection/v1_0/preapproval/{preapproval_id}"
+        headers = self._headers(access_token, target_environment)
+        response = await self._request("DELETE", url, headers=headers)
+        return response
+
+    async def get_approved_pre_approvals(
+        self,
+        account_holder_id_type: str,
+        account_holder_id: str,
+        access_token: Optional[str] = None,
+        target_environment: str = "sandbox",
+    ) -> List[Mapping[str, Any]]:
+        """
+        Get approved pre-approvals of an account holder.
+
+        :param account_holder_id_type: Type of the account holder ID (e.g., "msisdn", "email").
+        :param account_holder_id: The account holder ID.
+        :param access_token: Bearer Authentication Token. When None, a cached token
+            is fetched with the client credentials.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: List of dictionaries containing pre-approval details.
+        """
+        access_token = await self._resolve_token(access_token, target_environment)
+        url = f"{self.base_url}/collection/v1_0/preapprovals/{account_holder_id_type}/{account_holder_id}"
+        headers = self._headers(access_token, target_environment)
+        response = await self._request("GET", url, headers=headers)
+        return self._parse(response, PreApproval, many=True)
+
+    async def create_payment(
+        self,
+        reference_id: str,
+        access_token: Optional[str],
+        external_transaction_id: str,
+        amount: float,
+        currency: str,
+        customer_reference: str,
+        service_provider_user_name: str,
+        target_environment: str = "sandbox",
+        callback_url: Optional[str] = None,
+    ) -> httpx.Response:
+        """
+        Create a payment for an external bill or air-time top-up.
+
+        :param reference_id: UUID Reference ID for the payment.
+        :param access_token: Bearer Authentication Token. When None, a cached token
+            is fetched with the client credentials.
+        :param external_transaction_id: External transaction ID to tie to the payment.
+        :param amount: Amount to be debited from the payer account.
+        :param currency: ISO4217 Currency code.
+        :param customer_reference: Customer reference for the provider.
+        :param service_provider_user_name: Service provider name.
+        :param target_environment: The target environment (default is "sandbox").
+        :param callback_url: URL the gateway notifies when the transaction
+            settles. Defaults to the client callback URL.
+        :return: Response object.
+        """
+        access_token = await self._resolve_token(access_token, target_environment)
+        url = f"{self.base_url}/collection/v2_0/payment"
+        headers = self._headers(
+            access_token,
+            target_environment,
+            reference_id=reference_id,
+            callback_url=callback_url or self.callback_url,
+        )
+        payload = {
+            "externalTransactionId": external_transaction_id,
+            "money": {"amount": float(amount), "currency": currency},
+            "customerReference": customer_reference,
+            "serviceProviderUserName": service_provider_user_name,
+        }
+        response = await self._submit(
+            "payment", url, reference_id, payload, headers, target_environment
+        )
+        return response
+
+    async def get_payment_status(
+        self,
+        reference_id: str,
+        access_token: Optional[str] = None,
+        target_environment: str = "sandbox",
+    ) -> Mapping[str, Any]:
+        """
+        Get the status of a payment.
+
+        :param reference_id: UUID of the payment.
+        :param access_token: Bearer Authentication Token. When None, a cached token
+            is fetched with the client credentials.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: Dictionary containing the payment status.
+        """
+        access_token = await self._resolve_token(access_token, target_environment)
+        url = f"{self.base_url}/collection/v2_0/payment/{reference_id}"
+        headers = self._headers(access_token, target_environment)
+        response = await self._request("GET", url, headers=headers)
+        return self._parse(response, TransactionStatus)
+
+    # -- Disbursement and remittance -----------------------------------------
+
+    async def _product_write(
+        self,
+        kind: str,
+        product: str,
+        path: str,
+        reference_id: str,
+        access_token: Optional[str],
+        payload: Dict[str, Any],
+        target_environment: str,
+        callback_url: Optional[str],
+    ) -> httpx.Response:
+        """
+        Create a transaction on a product other than collection.
+
+        :param kind: Transaction kind, a key of :data:`momo_psb.polling.STATUS_METHODS`.
+        :param product: API product, e.g. "disbursement".
+        :param path: Endpoint path below the product, e.g. "v1_0/transfer".
+        :param reference_id: UUID Reference ID for the transaction.
+        :param access_token: Bearer token; a managed token of the product when None.
+        :param payload: Request body.
+        :param target_environment: The target environment.
+        :param callback_url: Callback URL; defaults to the client callback URL.
+        :return: Response object.
+        """
+        access_token = await self._resolve_token(
+            access_token, target_environment, product
+        )
+        url = f"{self.base_url}/{product}/{path}"
+        headers = self._headers(
+            access_token,
+            target_environment,
+            reference_id=reference_id,
+            callback_url=callback_url or self.callback_url,
+            product=product,
+        )
+        return await self._submit(
+            kind, url, reference_id, payload, headers, target_environment
+        )
+
+    async def _product_get(
+        self,
+        product: str,
+        path: str,
+        access_token: Optional[str],
+        target_environment: str,
+        model: Type[Model],
+    ) -> Mapping[str, Any]:
+        """
+        Fetch a resource of a product other than collection.
+
+        :param product: API product, e.g. "disbursement".
+        :param path: Endpoint path below the product.
+        :param access_token: Bearer token; a managed token of the product when None.
+        :param target_environment: The target environment.
+        :param model: Model class used when ``response_models`` is enabled.
+        :return: The parsed body.
+        """
+        access_token = await self._resolve_token(
+            access_token, target_environment, product
+        )
+        url = f"{self.base_url}/{product}/{path}"
+        headers = self._headers(access_token, target_environment, product=product)
+        response = await self._request("GET", url, headers=headers)
+        return self._parse(response, model)
+
+    async def transfer(
+        self,
+        reference_id: str,
+        access_token: Optional[str],
+        amount: float,
+        currency: str,
+        external_id: str,
+        payee: Dict[str, str],
+        payer_message: str,
+        payee_note: str,
+        target_environment: str = "sandbox",
+        callback_url: Optional[str] = None,
+    ) -> httpx.Response:
+        """
+        Transfer money from the disbursement account to a payee.
+
+        :param reference_id: UUID Reference ID for the transaction.
+        :param access_token: Bearer Authentication Token. When None, a cached
+            disbursement token is fetched with the client credentials.
+        :param amount: Amount to be credited to the payee account.
+        :param currency: ISO4217 Currency code.
+        :param external_id: External ID used as a reference to the transaction.
+        :param payee: Dictionary with 'partyIdType' and 'partyId' keys identifying the payee.
+        :param payer_message: Message written in the payer transaction history message field.
+        :param payee_note: Message written in the payee transaction history note field.
+        :param target_environment: The target environment (default is "sandbox").
+        :param callback_url: URL the gateway notifies when the transaction
+            settles. Defaults to the client callback URL.
+        :return: Response object.
+        """
+        payload = {
+            "amount": float(amount),
+            "currency": currency,
+            "externalId": external_id,
+            "payee": payee,
+            "payerMessage": payer_message,
+            "payeeNote": payee_note,
+        }
+        return await self._product_write(
+            "transfer",
+            "disbursement",
+            "v1_0/transfer",
+            reference_id,
+            access_token,
+            payload,
+            target_environment,
+            callback_url,
+        )
+
+    async def transfer_many(
+        self,
+        transfers: Union[Iterable[Mapping[str, Any]], AsyncIterable[Mapping[str, Any]]],
+        concurrency: int = 100,
+    ) -> AsyncIterator[BulkResult]:
+        """
+        Pay out many disbursement transfers with bounded concurrency.
+
+        Transfer specs are consumed lazily and results are yielded as each call
+        completes, so arbitrarily large payout files run in constant memory.
+
+        :param transfers: Sync or async iterable of keyword arguments for
+            :meth:`transfer`. 'reference_id' is generated when missing and
+            'access_token' defaults to the managed disbursement token.
+        :param concurrency: Maximum number of requests in flight.
+        :return: Async iterator of :class:`BulkResult` in completion order.
+        """
+
+        async def submit(spec: Dict[str, Any]) -> httpx.Response:
+            return await self.transfer(**{"access_token": None, **spec})
+
+        async def specs() -> AsyncIterator[Dict[str, Any]]:
+            if isinstance(transfers, AsyncIterable):
+                async for spec in transfers:
+                    yield with_reference_id(spec)
+            else:
+                for spec in transfers:
+                    yield with_reference_id(spec)
+
+        results = amap_bounded(submit, specs(), concurrency)
+        async for index, spec, response, error in results:
+            yield BulkResult(index, spec["reference_id"], spec, response, error)
+
+    async def get_transfer_status(
+        self,
+        reference_id: str,
+        access_token: Optional[str] = None,
+        target_environment: str = "sandbox",
+    ) -> Mapping[str, Any]:
+        """
+        Get the status of a disbursement transfer.
+
+        :param reference_id: UUID of the transfer.
+        :param access_token: Bearer Authentication Token. When None, a cached
+            disbursement token is fetched with the client credentials.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: Dictionary containing the transfer status.
+        """
+        return await self._product_get(
+            "disbursement",
+            f"v1_0/transfer/{reference_id}",
+            access_token,
+            target_environment,
+            TransactionStatus,
+        )
+
+    async def deposit(
+        self,
+        reference_id: str,
+        access_token: Optional[str],
+        amount: float,
+        currency: str,
+        external_id: str,
+        payee: Dict[str, str],
+        payer_message: str,
+        payee_note: str,
+        target_environment: str = "sandbox",
+        callback_url: Optional[str] = None,
+    ) -> httpx.Response:
+        """
+        Deposit money into a payee's account from the disbursement account.
+
+        :param reference_id: UUID Reference ID for the transaction.
+        :param access_token: Bearer Authentication Token. When None, a cached
+            disbursement token is fetched with the client credentials.
+        :param amount: Amount to be deposited.
+        :param currency: ISO4217 Currency code.
+        :param external_id: External ID used as a reference to the transaction.
+        :param payee: Dictionary with 'partyIdType' and 'partyId' keys identifying the payee.
+        :param payer_message: Message written in the payer transaction history message field.
+        :param payee_note: Message written in the payee transaction history note field.
+        :param target_environment: The target environment (default is "sandbox").
+        :param callback_url: URL the gateway notifies when the transaction
+            settles. Defaults to the client callback URL.
+        :return: Response object.
+        """
+        payload = {
+            "amount": float(amount),
+            "currency": currency,
+            "externalId": external_id,
+            "payee": payee,
+            "payerMessage": payer_message,
+            "payeeNote": payee_note,
+        }
+        return await self._product_write(
+            "deposit",
+            "disbursement",
+            "v1_0/deposit",
+            reference_id,
+            access_token,
+            payload,
+            target_environment,
+            callback_url,
+        )
+
+    async def get_deposit_status(
+        self,
+        reference_id: str,
+        access_token: Optional[str] = None,
+        target_environment: str = "sandbox",
+    ) -> Mapping[str, Any]:
+        """
+        Get the status of a deposit.
+
+        :param reference_id: UUID of the deposit.
+        :param access_token: Bearer Authentication Token. When None, a cached
+            disbursement token is fetched with the client credentials.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: Dictionary containing the deposit status.
+        """
+        return await self._product_get(
+            "disbursement",
+            f"v1_0/deposit/{reference_id}",
+            access_token,
+            target_environment,
+            TransactionStatus,
+        )
+
+    async def refund(
+        self,
+        reference_id: str,
+        access_token: Optional[str],
+        amount: float,
+        currency: str,
+        external_id: str,
+        reference_id_to_refund: str,
+        payer_message: str,
+        payee_note: str,
+        target_environment: str = "sandbox",
+        callback_url: Optional[str] = None,
+    ) -> httpx.Response:
+        """
+        Refund a collected transaction from the disbursement account.
+
+        :param reference_id: UUID Reference ID for the refund.
+        :param access_token: Bearer Authentication Token. When None, a cached
+            disbursement token is fetched with the client credentials.
+        :param amount: Amount to be refunded.
+        :param currency: ISO4217 Currency code.
+        :param external_id: External ID used as a reference to the refund.
+        :param reference_id_to_refund: Reference ID of the request to pay to refund.
+        :param payer_message: Message written in the payer transaction history message field.
+        :param payee_note: Message written in the payee transaction history note field.
+        :param target_environment: The target environment (default is "sandbox").
+        :param callback_url: URL the gateway notifies when the refund settles.
+            Defaults to the client callback URL.
+        :return: Response object.
+        """
+        payload = {
+            "amount": float(amount),
+            "currency": currency,
+            "externalId": external_id,
+            "payerMessage": payer_message,
+            "payeeNote": payee_note,
+            "referenceIdToRefund": reference_id_to_refund,
+        }
+        return await self._product_write(
+            "refund",
+            "disbursement",
+            "v1_0/refund",
+            reference_id,
+            access_token,
+            payload,
+            target_environment,
+            callback_url,
+        )
+
+    async def get_refund_status(
+        self,
+        reference_id: str,
+        access_token: Optional[str] = None,
+        target_environment: str = "sandbox",
+    ) -> Mapping[str, Any]:
+        """
+        Get the status of a refund.
+
+        :param reference_id: UUID of the refund.
+        :param access_token: Bearer Authentication Token. When None, a cached
+            disbursement token is fetched with the client credentials.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: Dictionary containing the refund status.
+        """
+        return await self._product_get(
+            "disbursement",
+            f"v1_0/refund/{reference_id}",
+            access_token,
+            target_environment,
+            TransactionStatus,
+        )
+
+    async def get_disbursement_balance(
+        self, access_token: Optional[str] = None, target_environment: str = "sandbox"
+    ) -> Mapping[str, Any]:
+        """
+        Get the balance of the disbursement account.
+
+        :param access_token: Bearer Authentication Token. When None, a cached
+            disbursement token is fetched with the client credentials.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: Dictionary containing the account balance.
+        """
+        return await self._product_get(
+            "disbursement",
+            "v1_0/account/balance",
+            access_token,
+            target_environment,
+            Balance,
+        )
+
+    async def remittance_transfer(
+        self,
+        reference_id: str,
+        access_token: Optional[str],
+        amount: float,
+        currency: str,
+        external_id: str,
+        payee: Dict[str, str],
+        payer_message: str,
+        payee_note: str,
+        target_environment: str = "sandbox",
+        callback_url: Optional[str] = None,
+    ) -> httpx.Response:
+        """
+        Transfer money from the remittance account to a payee.
+
+        :param reference_id: UUID Reference ID for the transaction.
+        :param access_token: Bearer Authentication Token. When None, a cached
+            remittance token is fetched with the client credentials.
+        :param amount: Amount to be credited to the payee account.
+        :param currency: ISO4217 Currency code.
+        :param external_id: External ID used as a reference to the transaction.
+        :param payee: Dictionary with 'partyIdType' and 'partyId' keys identifying the payee.
+        :param payer_message: Message written in the payer transaction history message field.
+        :param payee_note: Message written in the payee transaction history note field.
+        :param target_environment: The target environment (default is "sandbox").
+        :param callback_url: URL the gateway notifies when the transaction
+            settles. Defaults to the client callback URL.
+        :return: Response object.
+        """
+        payload = {
+            "amount": float(amount),
+            "currency": currency,
+            "externalId": external_id,
+            "payee": payee,
+            "payerMessage": payer_message,
+            "payeeNote": payee_note,
+        }
+        return await self._product_write(
+            "remittance_transfer",
+            "remittance",
+            "v1_0/transfer",
+            reference_id,
+            access_token,
+            payload,
+            target_environment,
+            callback_url,
+        )
+
+    async def get_remittance_transfer_status(
+        self,
+        reference_id: str,
+        access_token: Optional[str] = None,
+        target_environment: str = "sandbox",
+    ) -> Mapping[str, Any]:
+        """
+        Get the status of a remittance transfer.
+
+        :param reference_id: UUID of the transfer.
+        :param access_token: Bearer Authentication Token. When None, a cached
+            remittance token is fetched with the client credentials.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: Dictionary containing the transfer status.
+        """
+        return await self._product_get(
+            "remittance",
+            f"v1_0/transfer/{reference_id}",
+            access_token,
+            target_environment,
+            TransactionStatus,
+        )
+
+    async def get_remittance_balance(
+        self, access_token: Optional[str] = None, target_environment: str = "sandbox"
+    ) -> Mapping[str, Any]:
+        """
+        Get the balance of the remittance account.
+
+        :param access_token: Bearer Authentication Token. When None, a cached
+            remittance token is fetched with the client credentials.
+        :param target_environment: The target environment (default is "sandbox").
+        :return: Dictionary containing the account balance.
+        """
+        return await self._product_get(
+            "remittance",
+            "v1_0/account/balance",
+            access_token,
+            target_environment,
+            Balance,
+        )
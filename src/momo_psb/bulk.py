@@ -0,0 +1,187 @@
+import asyncio
+import csv
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    TextIO,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .codec import get_codec
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class BulkResult:
+    """
+    Outcome of one item submitted through a bulk call.
+
+    :param index: Position of the item in the input iterable.
+    :param reference_id: X-Reference-Id used for the transaction.
+    :param spec: Keyword arguments the endpoint was called with.
+    :param response: Endpoint return value, when the call did not raise.
+    :param error: Exception raised by the call, if any.
+    """
+
+    index: int
+    reference_id: str
+    spec: Dict[str, Any]
+    response: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """
+        True when the call returned a successful (2xx) response.
+        """
+        if self.error is not None:
+            return False
+        status_code = getattr(self.response, "status_code", 200)
+        return 200 <= status_code < 300
+
+
+def with_reference_id(spec: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Copy a payment spec, generating an X-Reference-Id when it has none.
+
+    :param spec: Keyword arguments for a write endpoint.
+    :return: A new dictionary that always contains 'reference_id'.
+    """
+    prepared = dict(spec)
+    if not prepared.get("reference_id"):
+        prepared["reference_id"] = str(uuid.uuid4())
+    return prepared
+
+
+def read_rows(stream: TextIO, format: str = "jsonl") -> Iterator[Dict[str, Any]]:
+    """
+    Stream rows from a CSV file with a header line, or from JSON Lines.
+
+    Rows are parsed one at a time, so arbitrarily large files are read in
+    constant memory. Blank JSON lines are skipped.
+
+    :param stream: Text stream to read.
+    :param format: "csv" or "jsonl".
+    :return: Iterator of rows as dictionaries.
+    """
+    if format == "csv":
+        yield from csv.DictReader(stream)
+    elif format == "jsonl":
+        loads = get_codec().loads
+        for line in stream:
+            if line.strip():
+                yield loads(line)
+    else:
+        raise ValueError(f"Unsupported row format: {format}")
+
+
+def map_bounded(
+    fn: Callable[[T], R], items: Iterable[T], concurrency: int
+) -> Iterator[Tuple[int, T, Optional[R], Optional[BaseException]]]:
+    """
+    Apply ``fn`` to ``items`` on a thread pool, keeping at most ``concurrency``
+    calls in flight.
+
+    Items are pulled from the iterable lazily as slots free up, and results are
+    yielded in completion order, so memory stays bounded by ``concurrency``.
+
+    :param fn: Function to call for every item.
+    :param items: Items to process; may be a lazy, unbounded iterable.
+    :param concurrency: Maximum number of concurrent calls.
+    :return: Iterator of ``(index, item, result, error)`` tuples.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    iterator = enumerate(items)
+    pending: Dict[Future, Tuple[int, T]] = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+        def fill() -> None:
+            while len(pending) < concurrency:
+                try:
+                    index, item = next(iterator)
+                except StopIteration:
+                    return
+                pending[executor.submit(fn, item)] = (index, item)
+
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, item = pending.pop(future)
+                error = future.exception()
+                result = None if error is not None else future.result()
+                yield index, item, result, error
+            fill()
+
+
+async def amap_bounded(
+    fn: Callable[[T], Awaitable[R]],
+    items: Union[Iterable[T], AsyncIterable[T]],
+    concurrency: int,
+) -> AsyncIterator[Tuple[int, T, Optional[R], Optional[BaseException]]]:
+    """
+    Await ``fn`` for every item, keeping at most ``concurrency`` calls in flight.
+
+    :param fn: Coroutine function to call for every item.
+    :param items: Items to process; a lazy sync or async iterable.
+    :param concurrency: Maximum number of concurrent calls.
+    :return: Async iterator of ``(index, item, result, error)`` tuples in
+        completion order.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if isinstance(items, AsyncIterable):
+        aiterator = items.__aiter__()
+
+        async def next_item() -> T:
+            return await aiterator.__anext__()
+
+    else:
+        iterator = iter(items)
+
+        async def next_item() -> T:
+            try:
+                return next(iterator)
+            except StopIteration:
+                raise StopAsyncIteration
+
+    pending: Dict[asyncio.Task, Tuple[int, T]] = {}
+    index = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    item = await next_item()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending[asyncio.ensure_future(fn(item))] = (index, item)
+                index += 1
+            if not pending:
+                return
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                item_index, item = pending.pop(task)
+                error = task.exception()
+                result = None if error is not None else task.result()
+                yield item_index, item, result, error
+    finally:
+        for task in pending:
+            task.cancel()
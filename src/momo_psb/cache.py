@@ -0,0 +1,203 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    A thread-safe, size-bounded LRU cache whose entries expire after a TTL.
+
+    Negative results (for example an inactive account holder, or a 404 for an
+    unknown one) are cached with the shorter ``negative_ttl`` so that corrected
+    data becomes visible sooner.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        negative_ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the TTLCache.
+
+        :param maxsize: Maximum number of entries before the least recently used
+            one is evicted.
+        :param ttl: Seconds a positive result stays cached.
+        :param negative_ttl: Seconds a negative result or error stays cached.
+        :param clock: Monotonic clock.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, bool]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value, is_error = entry
+                if expires_at > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    if is_error:
+                        # Raise a copy so hits don't chain tracebacks onto, or
+                        # race on, the one cached exception.
+                        raise copy.copy(value)
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return _MISSING
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value, re-raising a cached error.
+
+        :param key: Cache key.
+        :param default: Value returned on a miss.
+        :return: The cached value, or ``default``.
+        """
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        negative: bool = False,
+        is_error: bool = False,
+    ) -> None:
+        """
+        Cache a value.
+
+        :param key: Cache key.
+        :param value: Value (or exception, with ``is_error``) to cache.
+        :param negative: Use the shorter negative TTL.
+        :param is_error: ``value`` is an exception; every hit raises a copy of it.
+        """
+        ttl = self.negative_ttl if negative or is_error else self.ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, value, is_error)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Drop one entry, or every entry when ``key`` is None.
+
+        :param key: Cache key.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Cache counters.
+
+        :return: Dictionary with 'hits', 'misses', 'evictions' and 'size'.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+    def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Any],
+        is_negative: Callable[[Any], bool] = lambda value: False,
+        cache_error: Callable[[BaseException], bool] = lambda exc: False,
+    ) -> Any:
+        """
+        Return the cached value, or fetch and cache it on a miss.
+
+        :param key: Cache key.
+        :param fetch: Callable producing the value.
+        :param is_negative: Predicate selecting values cached with the negative TTL.
+        :param cache_error: Predicate selecting exceptions to cache negatively.
+        :return: The value.
+        """
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+        try:
+            value = fetch()
+        except Exception as exc:
+            if cache_error(exc):
+                self.set(key, exc, is_error=True)
+            raise
+        self.set(key, value, negative=is_negative(value))
+        return value
+
+    async def aget_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        is_negative: Callable[[Any], bool] = lambda value: False,
+        cache_error: Callable[[BaseException], bool] = lambda exc: False,
+    ) -> Any:
+        """
+        Asyncio counterpart of :meth:`get_or_fetch`.
+
+        :param key: Cache key.
+        :param fetch: Coroutine function producing the value.
+        :param is_negative: Predicate selecting values cached with the negative TTL.
+        :param cache_error: Predicate selecting exceptions to cache negatively.
+        :return: The value.
+        """
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+        try:
+            value = await fetch()
+        except Exception as exc:
+            if cache_error(exc):
+                self.set(key, exc, is_error=True)
+            raise
+        self.set(key, value, negative=is_negative(value))
+        return value
+
+
+def is_not_found(exc: BaseException) -> bool:
+    """
+    Check whether an HTTP error is a 404 from the gateway.
+
+    :param exc: Exception raised by a lookup.
+    :return: True for a 404 response error.
+    """
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None) == 404
+
+
+def is_inactive(value: Any) -> bool:
+    """
+    Check whether an account holder lookup reported an inactive account.
+
+    :param value: Parsed lookup response.
+    :return: True when the response carries ``"result": false``.
+    """
+    return isinstance(value, Mapping) and value.get("result") is False
@@ -0,0 +1,386 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set
+from urllib.parse import unquote, urlsplit
+
+from .codec import get_codec
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+@dataclass
+class CallbackEvent:
+    """
+    A transaction notification delivered by the MoMo gateway.
+
+    :param reference_id: X-Reference-Id of the transaction, when it could be
+        determined from the request header, body or path.
+    :param payload: Parsed JSON body.
+    :param headers: Request headers with lower-cased names.
+    :param method: HTTP method used by the gateway.
+    :param path: Request path.
+    """
+
+    reference_id: Optional[str]
+    payload: Dict[str, Any]
+    headers: Dict[str, str]
+    method: str
+    path: str
+
+    @property
+    def status(self) -> Optional[str]:
+        """
+        Transaction status reported in the callback, e.g. "SUCCESSFUL".
+        """
+        return self.payload.get("status")
+
+
+class CallbackReceiver:
+    """
+    A lightweight asyncio HTTP server that receives MoMo transaction callbacks.
+
+    Point the client's ``callback_url`` at :meth:`callback_url_for` (or
+    :attr:`url`) and await :meth:`wait_for` instead of polling status endpoints.
+    Callbacks are matched to transactions by the ``X-Reference-Id`` header, a
+    ``referenceId`` body field, or the last path segment, in that order.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: str = "/momo/callback",
+        public_url: Optional[str] = None,
+        on_callback: Optional[Callable[[CallbackEvent], Any]] = None,
+        max_body_size: int = 1024 * 1024,
+        max_unclaimed: int = 10000,
+    ):
+        """
+        Initialize the CallbackReceiver.
+
+        :param host: Interface to listen on.
+        :param port: Port to listen on; 0 picks a free port.
+        :param path: Base path callbacks are delivered to.
+        :param public_url: Externally reachable URL for :attr:`path`, when the
+            receiver sits behind a proxy or tunnel.
+        :param on_callback: Callback (plain or coroutine function) invoked with
+            every :class:`CallbackEvent`.
+        :param max_body_size: Largest accepted request body in bytes.
+        :param max_unclaimed: Number of callbacks kept for reference IDs nobody
+            is waiting for yet.
+        """
+        self.host = host
+        self.port = port
+        self.path = "/" + path.strip("/")
+        self.public_url = public_url.rstrip("/") if public_url else None
+        self.on_callback = on_callback
+        self.max_body_size = max_body_size
+        self.max_unclaimed = max_unclaimed
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self._connections: Set[asyncio.StreamWriter] = set()
+        self._unclaimed: "OrderedDict[str, CallbackEvent]" = OrderedDict()
+
+    @property
+    def url(self) -> str:
+        """
+        Base URL the gateway should deliver callbacks to.
+        """
+        if self.public_url:
+            return self.public_url
+        return f"http://{self.host}:{self.port}{self.path}"
+
+    def callback_url_for(self, reference_id: str) -> str:
+        """
+        Build a per-transaction callback URL that embeds the reference ID.
+
+        :param reference_id: X-Reference-Id of the transaction.
+        :return: Callback URL.
+        """
+        return f"{self.url}/{reference_id}"
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of transactions still awaiting a callback.
+        """
+        return len(self._waiters)
+
+    async def start(self) -> None:
+        """
+        Start listening for callbacks on the running event loop.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """
+        Stop listening and cancel any outstanding waiters.
+        """
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        for future in self._waiters.values():
+            future.cancel()
+        self._waiters.clear()
+
+    async def __aenter__(self) -> "CallbackReceiver":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    def expect(self, reference_id: str) -> asyncio.Future:
+        """
+        Register interest in a transaction before (or after) submitting it.
+
+        :param reference_id: X-Reference-Id of the transaction.
+        :return: Future resolved with the matching :class:`CallbackEvent`.
+        """
+        loop = self._loop or asyncio.get_running_loop()
+        future = self._waiters.get(reference_id)
+        if future is None:
+            future = loop.create_future()
+            event = self._unclaimed.pop(reference_id, None)
+            if event is not None:
+                future.set_result(event)
+            else:
+                self._waiters[reference_id] = future
+        return future
+
+    async def wait_for(
+        self, reference_id: str, timeout: Optional[float] = None
+    ) -> CallbackEvent:
+        """
+        Wait for the callback of a transaction.
+
+        :param reference_id: X-Reference-Id of the transaction.
+        :param timeout: Seconds to wait before raising :class:`asyncio.TimeoutError`.
+        :return: The matching :class:`CallbackEvent`.
+        """
+        future = self.expect(reference_id)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        finally:
+            if future.done():
+                self._waiters.pop(reference_id, None)
+
+    def start_background(self) -> None:
+        """
+        Run the receiver on its own event loop in a daemon thread, for use from
+        synchronous code together with :meth:`wait`.
+
+        :raises OSError: If the receiver cannot listen, e.g. the port is in use.
+        """
+        ready = threading.Event()
+        loop = asyncio.new_event_loop()
+        failure: List[BaseException] = []
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            except BaseException as exc:
+                failure.append(exc)
+                return
+            finally:
+                ready.set()
+            loop.run_forever()
+
+        thread = threading.Thread(
+            target=run, name="momo-callback-receiver", daemon=True
+        )
+        thread.start()
+        ready.wait()
+        if failure:
+            thread.join()
+            loop.close()
+            self._loop = None
+            raise failure[0]
+        self._thread = thread
+
+    def stop_background(self) -> None:
+        """
+        Stop a receiver started with :meth:`start_background`.
+        """
+        if self._thread is None or self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._thread = None
+
+    def wait(self, reference_id: str, timeout: Optional[float] = None) -> CallbackEvent:
+        """
+        Block until the callback of a transaction arrives. Requires
+        :meth:`start_background`.
+
+        :param reference_id: X-Reference-Id of the transaction.
+        :param timeout: Seconds to wait before raising :class:`TimeoutError`.
+        :return: The matching :class:`CallbackEvent`.
+        """
+        if self._thread is None or self._loop is None:
+            raise RuntimeError("wait() requires start_background() to be called first")
+        future = asyncio.run_coroutine_threadsafe(
+            self.wait_for(reference_id, timeout), self._loop
+        )
+        return future.result()
+
+    async def _dispatch(self, event: CallbackEvent) -> None:
+        if self.on_callback is not None:
+            outcome = self.on_callback(event)
+            if asyncio.iscoroutine(outcome):
+                await outcome
+        if event.reference_id is None:
+            return
+        future = self._waiters.pop(event.reference_id, None)
+        if future is not None:
+            if not future.done():
+                future.set_result(event)
+            return
+        self._unclaimed[event.reference_id] = event
+        while len(self._unclaimed) > self.max_unclaimed:
+            self._unclaimed.popitem(last=False)
+
+    def _reference_id(
+        self, path: str, headers: Dict[str, str], payload: Dict[str, Any]
+    ) -> Optional[str]:
+        if headers.get("x-reference-id"):
+            return headers["x-reference-id"]
+        if payload.get("referenceId"):
+            return str(payload["referenceId"])
+        if path.startswith(self.path + "/"):
+            segment = path[len(self.path) + 1 :].strip("/")
+            if segment:
+                return segment.rsplit("/", 1)[-1]
+        return None
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    return
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, close=True)
+                    return
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                try:
+                    body = await self._read_body(reader, headers)
+                except (ValueError, asyncio.LimitOverrunError):
+                    # Malformed Content-Length or chunk; the rest of the
+                    # stream cannot be framed, so the connection is dropped.
+                    await self._respond(writer, 400, close=True)
+                    return
+                if body is None:
+                    await self._respond(writer, 413, close=True)
+                    return
+                close = (
+                    headers.get("connection", "").lower() == "close"
+                    or version == "HTTP/1.0"
+                )
+                try:
+                    status = await self._handle_request(method, target, headers, body)
+                except Exception:
+                    # Typically a failing on_callback; the gateway retries a 5xx.
+                    status = 500
+                await self._respond(writer, status, close=close)
+                if close:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _read_body(
+        self, reader: asyncio.StreamReader, headers: Dict[str, str]
+    ) -> Optional[bytes]:
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            size = 0
+            while True:
+                line = await reader.readuntil(b"\r\n")
+                chunk_size = int(line.split(b";", 1)[0], 16)
+                if chunk_size < 0:
+                    raise ValueError(f"Invalid chunk size: {chunk_size}")
+                if chunk_size == 0:
+                    await reader.readuntil(b"\r\n")
+                    return b"".join(chunks)
+                size += chunk_size
+                if size > self.max_body_size:
+                    return None
+                chunks.append(await reader.readexactly(chunk_size))
+                if await reader.readexactly(2) != b"\r\n":
+                    raise ValueError("Chunk data is not followed by CRLF")
+        length = int(headers.get("content-length", 0) or 0)
+        if length < 0:
+            raise ValueError(f"Invalid Content-Length: {length}")
+        if length > self.max_body_size:
+            return None
+        return await reader.readexactly(length) if length else b""
+
+    async def _handle_request(
+        self, method: str, target: str, headers: Dict[str, str], body: bytes
+    ) -> int:
+        path = unquote(urlsplit(target).path).rstrip("/") or "/"
+        if path != self.path and not path.startswith(self.path + "/"):
+            return 404
+        if method not in ("POST", "PUT"):
+            return 405
+        try:
+            payload = get_codec().loads(body) if body else {}
+        except ValueError:
+            return 400
+        if not isinstance(payload, dict):
+            return 400
+        event = CallbackEvent(
+            reference_id=self._reference_id(path, headers, payload),
+            payload=payload,
+            headers=headers,
+            method=method,
+            path=path,
+        )
+        await self._dispatch(event)
+        return 200
+
+    async def _respond(
+        self, writer: asyncio.StreamWriter, status: int, close: bool = False
+    ) -> None:
+        head = (
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            "Content-Length: 0\r\n"
+            f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1"))
+        await writer.drain()
@@ -0,0 +1,230 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from ._endpoints import endpoint_group
+from .exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+StateListener = Callable[[str, str, str], Any]
+"""Called with ``(group, old_state, new_state)`` on every state transition."""
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker for one endpoint group.
+
+    The breaker keeps a rolling window of recent call outcomes. A call fails when
+    it raises, returns a 5xx response or takes longer than
+    ``slow_call_threshold``. Once the failure rate over at least
+    ``minimum_calls`` calls reaches ``failure_rate_threshold`` the circuit opens
+    and calls fail fast with :class:`CircuitOpenError`. After ``reset_timeout``
+    the circuit lets ``half_open_max_calls`` trial calls through; it closes if
+    they all succeed and opens again otherwise.
+    """
+
+    def __init__(
+        self,
+        group: str,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 10,
+        window_size: int = 50,
+        slow_call_threshold: Optional[float] = None,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        on_state_change: Optional[StateListener] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the CircuitBreaker.
+
+        :param group: Endpoint group guarded by the breaker.
+        :param failure_rate_threshold: Failure rate (0-1) that opens the circuit.
+        :param minimum_calls: Calls required in the window before the rate counts.
+        :param window_size: Number of recent calls in the rolling window.
+        :param slow_call_threshold: Seconds after which a call counts as failed.
+        :param reset_timeout: Seconds the circuit stays open before a trial call.
+        :param half_open_max_calls: Trial calls allowed while half-open.
+        :param on_state_change: Listener for state transitions.
+        :param clock: Monotonic clock.
+        """
+        self.group = group
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.on_state_change = on_state_change
+        self.clock = clock
+        self._window: Deque[bool] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """
+        Current state: "closed", "open" or "half_open".
+        """
+        with self._lock:
+            self._expire_open(self.clock())
+            return self._state
+
+    @property
+    def failure_rate(self) -> float:
+        """
+        Failure rate over the rolling window.
+        """
+        with self._lock:
+            if not self._window:
+                return 0.0
+            return self._window.count(False) / len(self._window)
+
+    def _transition(self, state: str) -> Optional[str]:
+        old, self._state = self._state, state
+        if state == OPEN:
+            self._opened_at = self.clock()
+        if state in (OPEN, HALF_OPEN):
+            self._trials = 0
+            self._trial_successes = 0
+        if state == CLOSED:
+            self._window.clear()
+        return old if old != state else None
+
+    def _notify(self, old: Optional[str], new: str) -> None:
+        if old is not None and self.on_state_change is not None:
+            self.on_state_change(self.group, old, new)
+
+    def _expire_open(self, now: float) -> Optional[str]:
+        if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+            return self._transition(HALF_OPEN)
+        return None
+
+    def before_call(self) -> None:
+        """
+        Admit a call or fail fast.
+
+        :raises CircuitOpenError: When the circuit is open, or half-open with all
+            trial slots taken.
+        """
+        with self._lock:
+            now = self.clock()
+            old = self._expire_open(now)
+            state = self._state
+            if state == OPEN:
+                retry_in = self.reset_timeout - (now - self._opened_at)
+            elif state == HALF_OPEN and self._trials >= self.half_open_max_calls:
+                retry_in = 0.0
+            else:
+                retry_in = None
+                if state == HALF_OPEN:
+                    self._trials += 1
+        self._notify(old, HALF_OPEN)
+        if retry_in is not None:
+            raise CircuitOpenError(self.group, max(0.0, retry_in))
+
+    def release(self) -> None:
+        """
+        Give back the trial slot of an admitted call that was never sent, without
+        recording an outcome.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def record(self, success: bool, duration: float = 0.0) -> None:
+        """
+        Record the outcome of an admitted call.
+
+        :param success: False when the call raised or returned a 5xx response.
+        :param duration: Call latency in seconds.
+        """
+        if self.slow_call_threshold is not None and duration > self.slow_call_threshold:
+            success = False
+        with self._lock:
+            old = None
+            if self._state == HALF_OPEN:
+                if not success:
+                    old = self._transition(OPEN)
+                else:
+                    self._trial_successes += 1
+                    if self._trial_successes >= self.half_open_max_calls:
+                        old = self._transition(CLOSED)
+            elif self._state == CLOSED:
+                self._window.append(success)
+                if (
+                    len(self._window) >= self.minimum_calls
+                    and self._window.count(False) / len(self._window)
+                    >= self.failure_rate_threshold
+                ):
+                    old = self._transition(OPEN)
+            new = self._state
+        self._notify(old, new)
+
+
+class CircuitBreakerRegistry:
+    """
+    One :class:`CircuitBreaker` per endpoint group (apiuser, token, requesttopay,
+    invoice, preapproval, payment, ...), created on first use with shared
+    settings.
+    """
+
+    def __init__(
+        self,
+        on_state_change: Optional[StateListener] = None,
+        **breaker_options: Any,
+    ):
+        """
+        Initialize the CircuitBreakerRegistry.
+
+        :param on_state_change: Listener for state transitions of any breaker,
+            e.g. to export circuit state as a metric.
+        :param breaker_options: Keyword arguments for every :class:`CircuitBreaker`.
+        """
+        self.on_state_change = on_state_change
+        self.breaker_options = breaker_options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_group(self, group: str) -> CircuitBreaker:
+        """
+        Get the breaker of an endpoint group.
+
+        :param group: Endpoint group.
+        :return: The circuit breaker.
+        """
+        breaker = self._breakers.get(group)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(group)
+                if breaker is None:
+                    breaker = CircuitBreaker(
+                        group,
+                        on_state_change=self.on_state_change,
+                        **self.breaker_options,
+                    )
+                    self._breakers[group] = breaker
+        return breaker
+
+    def for_path(self, path: str) -> CircuitBreaker:
+        """
+        Get the breaker guarding a request path.
+
+        :param path: Request path relative to the base URL.
+        :return: The circuit breaker.
+        """
+        return self.for_group(endpoint_group(path))
+
+    def states(self) -> Dict[str, str]:
+        """
+        Snapshot of the state of every breaker created so far.
+
+        :return: Mapping of endpoint group to state.
+        """
+        return {group: breaker.state for group, breaker in self._breakers.items()}
@@ -1,18 +1,203 @@
-import json
+import sys
 import uuid
+from typing import Any, Callable, Dict, Mapping, Optional
 
 import click
 
-from .api import MoMoPSBAPI
+from .codec import get_codec
+
+# The client modules (and requests) are imported only by the commands that call
+# the gateway, so `--help` and shell completion start quickly.
 
 
 class Config:
     def __init__(self):
-        self.api = None
+        self.base_url = None
+        self.subscription_key = None
+        self.credentials_file = None
+        self.cache_credentials = True
+        self._api = None
+
+    @property
+    def credential_store(self):
+        """
+        The on-disk credential cache, or None when it is disabled.
+        """
+        if not self.cache_credentials:
+            return None
+        from .credentials import CredentialStore
+
+        return CredentialStore(self.credentials_file)
+
+    def client(self, **options: Any):
+        """
+        Build a client that uses the cached API user, API key and tokens.
+
+        :param options: Extra keyword arguments for the client.
+        :return: The client.
+        """
+        from .api import MoMoPSBAPI
+
+        store = self.credential_store
+        if store is not None:
+            from .credentials import StoredTokenManager
+
+            api_user, api_key = store.credentials(self.base_url, self.subscription_key)
+            options.setdefault("api_user", api_user)
+            options.setdefault("api_key", api_key)
+            options.setdefault(
+                "token_manager",
+                StoredTokenManager(store, self.base_url, self.subscription_key),
+            )
+        return MoMoPSBAPI(self.base_url, self.subscription_key, **options)
+
+    @property
+    def api(self):
+        """
+        The client, created on first use.
+        """
+        if self._api is None:
+            self._api = self.client()
+        return self._api
+
+    def reset_client(self) -> None:
+        """
+        Close the cached client, so the next command builds one from the
+        current credential cache.
+        """
+        if self._api is not None:
+            self._api.close()
+            self._api = None
 
 
 pass_config = click.make_pass_decorator(Config, ensure=True)
 
+access_token_option = click.option(
+    "--access-token",
+    help="Bearer Authentication Token; defaults to a cached token of the stored "
+    "API user (see `user login`)",
+)
+
+
+def bulk_options(fn: Callable) -> Callable:
+    """
+    Add the input, output and concurrency options shared by the bulk commands.
+    """
+    options = [
+        click.argument("rows", type=click.File("r", encoding="utf-8"), default="-"),
+        click.option(
+            "--format",
+            "row_format",
+            type=click.Choice(["csv", "jsonl"]),
+            help="Input format; inferred from the file extension, JSONL for stdin",
+        ),
+        click.option(
+            "--output",
+            type=click.File("wb"),
+            default="-",
+            help="File the JSONL results are written to (default: stdout)",
+        ),
+        click.option(
+            "--concurrency", default=10, type=int, help="Requests kept in flight"
+        ),
+        click.option(
+            "--max-attempts", default=3, type=int, help="Attempts per row on failure"
+        ),
+        access_token_option,
+    ]
+    for option in reversed(options):
+        fn = option(fn)
+    return fn
+
+
+def require(row: Mapping[str, Any], name: str) -> Any:
+    """
+    Read a required column of a bulk input row.
+    """
+    value = row.get(name)
+    if value is None or value == "":
+        raise ValueError(f"Missing column: {name}")
+    return value
+
+
+def party(row: Mapping[str, Any], prefix: str) -> Dict[str, str]:
+    """
+    Build a party from the ``<prefix>_id`` and ``<prefix>_id_type`` columns.
+    """
+    return {
+        "partyIdType": str(require(row, f"{prefix}_id_type")),
+        "partyId": str(require(row, f"{prefix}_id")),
+    }
+
+
+def run_bulk(
+    config: Config,
+    operation: str,
+    build: Callable[[Mapping[str, Any]], Dict[str, Any]],
+    defaults: Dict[str, Any],
+    rows: Any,
+    row_format: Optional[str],
+    output: Any,
+    concurrency: int,
+    max_attempts: int,
+    access_token: Optional[str],
+) -> None:
+    """
+    Submit every input row through one pooled client and stream the results.
+
+    Rows are read lazily and at most ``concurrency`` are in flight, and every
+    result is written as one JSON line as soon as it completes, so memory stays
+    flat however large the input is. Options given on the command line fill in
+    columns a row leaves empty. Rows keep their 'reference_id' column when they
+    have one, so a rerun does not create duplicate transactions.
+    """
+    from .bulk import BulkResult, map_bounded, read_rows, with_reference_id
+    from .retry import RetryPolicy
+
+    if row_format is None:
+        row_format = "csv" if rows.name.endswith(".csv") else "jsonl"
+    defaults = {name: value for name, value in defaults.items() if value is not None}
+    api = config.client(
+        pool_maxsize=max(concurrency, 1),
+        retry_policy=RetryPolicy(max_attempts=max_attempts),
+    )
+    endpoint = getattr(api, operation)
+
+    def submit(row: Dict[str, Any]) -> Any:
+        return endpoint(
+            reference_id=row["reference_id"], access_token=access_token, **build(row)
+        )
+
+    def prepare(row: Mapping[str, Any]) -> Dict[str, Any]:
+        filled = {name: value for name, value in row.items() if value not in (None, "")}
+        return with_reference_id({**defaults, **filled})
+
+    dumps = get_codec().dumps
+    submitted = failed = 0
+    with api:
+        items = (prepare(row) for row in read_rows(rows, row_format))
+        for index, row, response, error in map_bounded(submit, items, concurrency):
+            result = BulkResult(index, row["reference_id"], row, response, error)
+            record = {
+                "index": index,
+                "reference_id": result.reference_id,
+                "external_id": row.get("external_id"),
+                "ok": result.ok,
+                "status_code": getattr(response, "status_code", None),
+                "error": None,
+            }
+            if error is not None:
+                record["error"] = str(error)
+            elif not result.ok:
+                record["error"] = response.text
+            output.write(dumps(record) + b"\n")
+            output.flush()
+            submitted += 1
+            failed += not result.ok
+    click.echo(f"Submitted {submitted} rows, {failed} failed", err=True)
+    if failed:
+        sys.exit(1)
+
 
 @click.group()
 @click.option("--base-url", required=True, help="Base URL for the Wallet Platform API")
@@ -21,10 +206,30 @@ pass_config = click.make_pass_decorator(Config, ensure=True)
     required=True,
     help="Subscription key for the API Manager portal",
 )
+@click.option(
+    "--credentials-file",
+    envvar="MOMO_PSB_CREDENTIALS",
+    type=click.Path(dir_okay=False),
+    help="Credential and token cache (default: ~/.config/momo-psb/credentials.json)",
+)
+@click.option(
+    "--no-credential-cache",
+    is_flag=True,
+    help="Neither read nor write the credential and token cache",
+)
 @pass_config
-def cli(config, base_url: str, subscription_key: str):
+def cli(
+    config,
+    base_url: str,
+    subscription_key: str,
+    credentials_file: Optional[str],
+    no_credential_cache: bool,
+):
     """MTN MoMo Payment Service Bank CLI tool"""
-    config.api = MoMoPSBAPI(base_url, subscription_key)
+    config.base_url = base_url
+    config.subscription_key = subscription_key
+    config.credentials_file = credentials_file
+    config.cache_credentials = not no_credential_cache
 
 
 # User Management Commands
@@ -49,10 +254,16 @@ def create_user(config, callback_host: str):
 @click.argument("api-user")
 @pass_config
 def create_key(config, api_user: str):
-    """Create a new API key for user"""
+    """Create a new API key for user and store it in the credential cache"""
     response = config.api.create_api_key(api_user)
     click.echo(f"API Key created for user {api_user}")
     click.echo(f"Response: {response.text}")
+    store = config.credential_store
+    if store is not None and response.status_code == 201:
+        api_key = get_codec().loads(response.content)["apiKey"]
+        store.save_credentials(
+            config.base_url, config.subscription_key, api_user, api_key
+        )
 
 
 @user.command("get-details")
@@ -74,6 +285,44 @@ def get_token(config, api_user: str, api_key: str):
     click.echo(f"OAuth Token Response: {response.text}")
 
 
+@user.command("login")
+@click.argument("api-user")
+@click.argument("api-key")
+@click.option("--environment", default="sandbox", help="Target environment")
+@pass_config
+def login(config, api_user: str, api_key: str, environment: str):
+    """Store API user credentials and fetch a token for later commands"""
+    store = config.credential_store
+    if store is None:
+        raise click.UsageError("login needs the credential cache enabled")
+    from .credentials import StoredTokenManager
+
+    # Always ask the gateway, so a wrong API key is not hidden by a cached token.
+    tokens = StoredTokenManager(store, config.base_url, config.subscription_key)
+    tokens.invalidate((api_user, "collection", environment))
+    api = config.client(api_user=api_user, api_key=api_key, token_manager=tokens)
+    try:
+        api.get_access_token(environment)
+    except Exception as e:
+        raise click.ClickException(f"Login failed: {e}")
+    finally:
+        api.close()
+    store.save_credentials(config.base_url, config.subscription_key, api_user, api_key)
+    config.reset_client()
+    click.echo(f"Logged in as {api_user}; credentials cached in {store.path}")
+
+
+@user.command("logout")
+@pass_config
+def logout(config):
+    """Forget the cached credentials and tokens"""
+    store = config.credential_store
+    if store is not None:
+        store.clear(config.base_url, config.subscription_key)
+    config.reset_client()
+    click.echo("Cached credentials removed")
+
+
 # Account Commands
 @cli.group()
 def account():
@@ -82,44 +331,46 @@ def account():
 
 
 @account.command("balance")
-@click.option("--access-token", required=True, help="Bearer Authentication Token")
+@access_token_option
 @click.option("--environment", default="sandbox", help="Target environment")
 @pass_config
-def get_balance(config, access_token: str, environment: str):
+def get_balance(config, access_token: Optional[str], environment: str):
     """Get account balance"""
     try:
         result = config.api.get_account_balance(access_token, environment)
-        click.echo(json.dumps(result, indent=2))
+        click.echo(get_codec().dumps_pretty(result))
     except Exception as e:
         click.echo(f"Error: {str(e)}", err=True)
 
 
 @account.command("validate-holder")
-@click.option("--access-token", required=True, help="Bearer Authentication Token")
+@access_token_option
 @click.option("--id-type", required=True, help="Account holder ID type")
 @click.option("--id", required=True, help="Account holder ID")
 @click.option("--environment", default="sandbox", help="Target environment")
 @pass_config
 def validate_account_holder(
-    config, access_token: str, id_type: str, id: str, environment: str
+    config, access_token: Optional[str], id_type: str, id: str, environment: str
 ):
     """Validate account holder status"""
     result = config.api.validate_account_holder_status(
         access_token, id_type, id, environment
     )
-    click.echo(json.dumps(result, indent=2))
+    click.echo(get_codec().dumps_pretty(result))
 
 
 @account.command("basic-info")
-@click.option("--access-token", required=True, help="Bearer Authentication Token")
+@access_token_option
 @click.option("--id-type", required=True, help="Account holder ID type")
 @click.option("--id", required=True, help="Account holder ID")
 @click.option("--environment", default="sandbox", help="Target environment")
 @pass_config
-def get_basic_info(config, access_token: str, id_type: str, id: str, environment: str):
+def get_basic_info(
+    config, access_token: Optional[str], id_type: str, id: str, environment: str
+):
     """Get basic user information"""
     result = config.api.get_basic_user_info(access_token, id_type, id, environment)
-    click.echo(json.dumps(result, indent=2))
+    click.echo(get_codec().dumps_pretty(result))
 
 
 # Payment Commands
@@ -130,7 +381,7 @@ def payment():
 
 
 @payment.command("request")
-@click.option("--access-token", required=True, help="Bearer Authentication Token")
+@access_token_option
 @click.option("--amount", required=True, type=float, help="Amount to request")
 @click.option("--currency", required=True, help="Currency code (e.g., NGN)")
 @click.option("--payer-id", required=True, help="Payer ID")
@@ -141,7 +392,7 @@ def payment():
 @pass_config
 def request_payment(
     config,
-    access_token: str,
+    access_token: Optional[str],
     amount: float,
     currency: str,
     payer_id: str,
@@ -170,21 +421,56 @@ def request_payment(
     click.echo(f"Status Code: {response.status_code}")
 
 
+@payment.command("bulk")
+@bulk_options
+@click.option("--currency", help="Currency for rows without a currency column")
+@click.option("--payer-id-type", help="Payer ID type for rows without one")
+@click.option("--message", help="Payer message for rows without one")
+@click.option("--note", help="Payee note for rows without one")
+@pass_config
+def bulk_request_payment(config, currency, payer_id_type, message, note, **options):
+    """Request payments for every row of a CSV or JSONL file
+
+    Columns: amount, currency, payer_id, payer_id_type, message, note, and
+    optionally external_id and reference_id.
+    """
+
+    def build(row):
+        return {
+            "amount": float(require(row, "amount")),
+            "currency": require(row, "currency"),
+            "external_id": row.get("external_id") or row["reference_id"],
+            "payer": party(row, "payer"),
+            "payer_message": require(row, "message"),
+            "payee_note": require(row, "note"),
+        }
+
+    defaults = {
+        "currency": currency,
+        "payer_id_type": payer_id_type,
+        "message": message,
+        "note": note,
+    }
+    run_bulk(config, "request_to_pay", build, defaults, **options)
+
+
 @payment.command("status")
-@click.option("--access-token", required=True, help="Bearer Authentication Token")
+@access_token_option
 @click.argument("reference-id")
 @click.option("--environment", default="sandbox", help="Target environment")
 @pass_config
-def get_payment_status(config, access_token: str, reference_id: str, environment: str):
+def get_payment_status(
+    config, access_token: Optional[str], reference_id: str, environment: str
+):
     """Get payment request status"""
     result = config.api.get_request_to_pay_status(
         reference_id, access_token, environment
     )
-    click.echo(json.dumps(result, indent=2))
+    click.echo(get_codec().dumps_pretty(result))
 
 
 @payment.command("create")
-@click.option("--access-token", required=True, help="Bearer Authentication Token")
+@access_token_option
 @click.option("--external-id", required=True, help="External transaction ID")
 @click.option("--amount", required=True, type=float, help="Amount")
 @click.option("--currency", required=True, help="Currency code")
@@ -194,7 +480,7 @@ def get_payment_status(config, access_token: str, reference_id: str, environment
 @pass_config
 def create_payment(
     config,
-    access_token: str,
+    access_token: Optional[str],
     external_id: str,
     amount: float,
     currency: str,
@@ -226,7 +512,7 @@ def withdraw():
 
 
 @withdraw.command("request")
-@click.option("--access-token", required=True, help="Bearer Authentication Token")
+@access_token_option
 @click.option("--amount", required=True, type=float, help="Amount to withdraw")
 @click.option("--currency", required=True, help="Currency code")
 @click.option("--payer-id", required=True, help="Payer ID")
@@ -237,7 +523,7 @@ def withdraw():
 @pass_config
 def request_withdrawal(
     config,
-    access_token: str,
+    access_token: Optional[str],
     amount: float,
     currency: str,
     payer_id: str,
@@ -266,19 +552,56 @@ def request_withdrawal(
     click.echo(f"Status Code: {response.status_code}")
 
 
+@withdraw.command("bulk")
+@bulk_options
+@click.option("--currency", help="Currency for rows without a currency column")
+@click.option("--payer-id-type", help="Payer ID type for rows without one")
+@click.option("--message", help="Payer message for rows without one")
+@click.option("--note", help="Payee note for rows without one")
+@click.option("--environment", default="sandbox", help="Target environment")
+@pass_config
+def bulk_request_withdrawal(
+    config, currency, payer_id_type, message, note, environment, **options
+):
+    """Request withdrawals for every row of a CSV or JSONL file
+
+    Columns: amount, currency, payer_id, payer_id_type, message, note, and
+    optionally external_id and reference_id.
+    """
+
+    def build(row):
+        return {
+            "amount": float(require(row, "amount")),
+            "currency": require(row, "currency"),
+            "external_id": row.get("external_id") or row["reference_id"],
+            "payer": party(row, "payer"),
+            "payer_message": require(row, "message"),
+            "payee_note": require(row, "note"),
+            "target_environment": environment,
+        }
+
+    defaults = {
+        "currency": currency,
+        "payer_id_type": payer_id_type,
+        "message": message,
+        "note": note,
+    }
+    run_bulk(config, "request_to_withdraw", build, defaults, **options)
+
+
 @withdraw.command("status")
-@click.option("--access-token", required=True, help="Bearer Authentication Token")
+@access_token_option
 @click.argument("reference-id")
 @click.option("--environment", default="sandbox", help="Target environment")
 @pass_config
 def get_withdrawal_status(
-    config, access_token: str, reference_id: str, environment: str
+    config, access_token: Optional[str], reference_id: str, environment: str
 ):
     """Get withdrawal request status"""
     result = config.api.get_request_to_withdraw_status(
         reference_id, access_token, environment
     )
-    click.echo(json.dumps(result, indent=2))
+    click.echo(get_codec().dumps_pretty(result))
 
 
 # Invoice Commands
@@ -289,7 +612,7 @@ def invoice():
 
 
 @invoice.command("create")
-@click.option("--access-token", required=True, help="Bearer Authentication Token")
+@access_token_option
 @click.option("--external-id", required=True, help="External ID")
 @click.option("--amount", required=True, type=float, help="Amount")
 @click.option("--currency", required=True, help="Currency code")
@@ -303,7 +626,7 @@ def invoice():
 @pass_config
 def create_invoice(
     config,
-    access_token: str,
+    access_token: Optional[str],
     external_id: str,
     amount: float,
     currency: str,
@@ -336,25 +659,78 @@ def create_invoice(
     click.echo(f"Status Code: {response.status_code}")
 
 
+@invoice.command("bulk")
+@bulk_options
+@click.option("--currency", help="Currency for rows without a currency column")
+@click.option("--validity", help="Validity duration in seconds for rows without one")
+@click.option("--payer-id-type", help="Intended payer ID type for rows without one")
+@click.option("--payee-id", help="Payee ID for rows without one")
+@click.option("--payee-id-type", help="Payee ID type for rows without one")
+@click.option("--environment", default="sandbox", help="Target environment")
+@pass_config
+def bulk_create_invoice(
+    config,
+    currency,
+    validity,
+    payer_id_type,
+    payee_id,
+    payee_id_type,
+    environment,
+    **options,
+):
+    """Create invoices for every row of a CSV or JSONL file
+
+    Columns: amount, currency, validity, payer_id, payer_id_type, payee_id,
+    payee_id_type, and optionally external_id, description and reference_id.
+    """
+
+    def build(row):
+        return {
+            "external_id": row.get("external_id") or row["reference_id"],
+            "amount": float(require(row, "amount")),
+            "currency": require(row, "currency"),
+            "validity_duration": str(require(row, "validity")),
+            "intended_payer": party(row, "payer"),
+            "payee": party(row, "payee"),
+            "description": row.get("description"),
+            "target_environment": environment,
+        }
+
+    defaults = {
+        "currency": currency,
+        "validity": validity,
+        "payer_id_type": payer_id_type,
+        "payee_id": payee_id,
+        "payee_id_type": payee_id_type,
+    }
+    run_bulk(config, "create_invoice", build, defaults, **options)
+
+
 @invoice.command("status")
-@click.option("--access-token", required=True, help="Bearer Authentication Token")
+@access_token_option
 @click.argument("reference-id")
 @click.option("--environment", default="sandbox", help="Target environment")
 @pass_config
-def get_invoice_status(config, access_token: str, reference_id: str, environment: str):
+def get_invoice_status(
+    config, access_token: Optional[str], reference_id: str, environment: str
+):
     """Get invoice status"""
     result = config.api.get_invoice_status(reference_id, access_token, environment)
-    click.echo(json.dumps(result, indent=2))
+    click.echo(get_codec().dumps_pretty(result))
 
 
 @invoice.command("cancel")
-@click.option("--access-token", required=True, help="Bearer Authentication Token")
+@access_token_option
 @click.argument("reference-id")
 @click.option("--external-id", required=True, help="External ID")
 @click.option("--environment", default="sandbox", help="Target environment")
 @pass_config
 def cancel_invoice(
-    config, access_token: str, reference_id: str, external_id: str, environment: str
+    config,
+    access_token: Optional[str],
+    reference_id: str,
+    external_id: str,
+    environment: str,
 ):
     """Cancel an invoice"""
     response = config.api.cancel_invoice(
@@ -371,7 +747,7 @@ def preapproval():
 
 
 @preapproval.command("create")
-@click.option("--access-token", required=True, help="Bearer Authentication Token")
+@access_token_option
 @click.option("--payer-id", required=True, help="Payer ID")
 @click.option("--payer-id-type", required=True, help="Payer ID type")
 @click.option("--currency", required=True, help="Payer currency")
@@ -381,7 +757,7 @@ def preapproval():
 @pass_config
 def create_preapproval(
     config,
-    access_token: str,
+    access_token: Optional[str],
     payer_id: str,
     payer_id_type: str,
     currency: str,
@@ -406,26 +782,63 @@ def create_preapproval(
     click.echo(f"Status Code: {response.status_code}")
 
 
+@preapproval.command("bulk")
+@bulk_options
+@click.option("--currency", help="Payer currency for rows without one")
+@click.option("--payer-id-type", help="Payer ID type for rows without one")
+@click.option("--message", help="Payer message for rows without one")
+@click.option(
+    "--validity", type=int, help="Validity time in seconds for rows without one"
+)
+@click.option("--environment", default="sandbox", help="Target environment")
+@pass_config
+def bulk_create_preapproval(
+    config, currency, payer_id_type, message, validity, environment, **options
+):
+    """Create pre-approvals for every row of a CSV or JSONL file
+
+    Columns: payer_id, payer_id_type, currency, message, validity, and
+    optionally reference_id.
+    """
+
+    def build(row):
+        return {
+            "payer": party(row, "payer"),
+            "payer_currency": require(row, "currency"),
+            "payer_message": require(row, "message"),
+            "validity_time": int(require(row, "validity")),
+            "target_environment": environment,
+        }
+
+    defaults = {
+        "currency": currency,
+        "payer_id_type": payer_id_type,
+        "message": message,
+        "validity": validity,
+    }
+    run_bulk(config, "create_pre_approval", build, defaults, **options)
+
+
 @preapproval.command("status")
-@click.option("--access-token", required=True, help="Bearer Authentication Token")
+@access_token_option
 @click.argument("reference-id")
 @click.option("--environment", default="sandbox", help="Target environment")
 @pass_config
 def get_preapproval_status(
-    config, access_token: str, reference_id: str, environment: str
+    config, access_token: Optional[str], reference_id: str, environment: str
 ):
     """Get pre-approval status"""
     result = config.api.get_pre_approval_status(reference_id, access_token, environment)
-    click.echo(json.dumps(result, indent=2))
+    click.echo(get_codec().dumps_pretty(result))
 
 
 @preapproval.command("cancel")
-@click.option("--access-token", required=True, help="Bearer Authentication Token")
+@access_token_option
 @click.argument("preapproval-id")
 @click.option("--environment", default="sandbox", help="Target environment")
 @pass_config
 def cancel_preapproval(
-    config, access_token: str, preapproval_id: str, environment: str
+    config, access_token: Optional[str], preapproval_id: str, environment: str
 ):
     """Cancel a pre-approval"""
     response = config.api.cancel_pre_approval(preapproval_id, access_token, environment)
@@ -433,19 +846,312 @@ def cancel_preapproval(
 
 
 @preapproval.command("list-approved")
-@click.option("--access-token", required=True, help="Bearer Authentication Token")
+@access_token_option
 @click.option("--id-type", required=True, help="Account holder ID type")
 @click.option("--id", required=True, help="Account holder ID")
 @click.option("--environment", default="sandbox", help="Target environment")
 @pass_config
 def list_approved_preapprovals(
-    config, access_token: str, id_type: str, id: str, environment: str
+    config, access_token: Optional[str], id_type: str, id: str, environment: str
 ):
     """List approved pre-approvals for an account holder"""
     result = config.api.get_approved_pre_approvals(
         id_type, id, access_token, environment
     )
-    click.echo(json.dumps(result, indent=2))
+    click.echo(get_codec().dumps_pretty(result))
+
+
+# Disbursement Commands
+@cli.group()
+def disbursement():
+    """Disbursement (payout) commands
+
+    Run them with the disbursement subscription key as --subscription-key.
+    """
+    pass
+
+
+@disbursement.command("transfer")
+@access_token_option
+@click.option("--amount", required=True, type=float, help="Amount to pay out")
+@click.option("--currency", required=True, help="Currency code (e.g., NGN)")
+@click.option("--payee-id", required=True, help="Payee ID")
+@click.option("--payee-id-type", required=True, help="Payee ID type (e.g., MSISDN)")
+@click.option("--message", required=True, help="Payer message")
+@click.option("--note", required=True, help="Payee note")
+@click.option("--environment", default="sandbox", help="Target environment")
+@pass_config
+def transfer(
+    config,
+    access_token: Optional[str],
+    amount: float,
+    currency: str,
+    payee_id: str,
+    payee_id_type: str,
+    message: str,
+    note: str,
+    environment: str,
+):
+    """Transfer money to a payee"""
+    reference_id = str(uuid.uuid4())
+    response = config.api.transfer(
+        reference_id=reference_id,
+        access_token=access_token,
+        amount=amount,
+        currency=currency,
+        external_id=str(uuid.uuid4()),
+        payee={"partyIdType": payee_id_type, "partyId": payee_id},
+        payer_message=message,
+        payee_note=note,
+        target_environment=environment,
+    )
+
+    click.echo(f"Transfer created with reference ID: {reference_id}")
+    click.echo(f"Status Code: {response.status_code}")
+
+
+@disbursement.command("bulk")
+@bulk_options
+@click.option("--currency", help="Currency for rows without a currency column")
+@click.option("--payee-id-type", help="Payee ID type for rows without one")
+@click.option("--message", help="Payer message for rows without one")
+@click.option("--note", help="Payee note for rows without one")
+@click.option("--environment", default="sandbox", help="Target environment")
+@pass_config
+def bulk_transfer(
+    config, currency, payee_id_type, message, note, environment, **options
+):
+    """Pay out a transfer for every row of a CSV or JSONL file
+
+    Columns: amount, currency, payee_id, payee_id_type, message, note, and
+    optionally external_id and reference_id.
+    """
+
+    def build(row):
+        return {
+            "amount": float(require(row, "amount")),
+            "currency": require(row, "currency"),
+            "external_id": row.get("external_id") or row["reference_id"],
+            "payee": party(row, "payee"),
+            "payer_message": require(row, "message"),
+            "payee_note": require(row, "note"),
+            "target_environment": environment,
+        }
+
+    defaults = {
+        "currency": currency,
+        "payee_id_type": payee_id_type,
+        "message": message,
+        "note": note,
+    }
+    run_bulk(config, "transfer", build, defaults, **options)
+
+
+@disbursement.command("status")
+@access_token_option
+@click.argument("reference-id")
+@click.option(
+    "--kind",
+    default="transfer",
+    type=click.Choice(["transfer", "deposit", "refund"]),
+    help="Transaction kind",
+)
+@click.option("--environment", default="sandbox", help="Target environment")
+@pass_config
+def get_disbursement_status(
+    config, access_token: Optional[str], reference_id: str, kind: str, environment: str
+):
+    """Get transfer, deposit or refund status"""
+    method = getattr(config.api, f"get_{kind}_status")
+    result = method(reference_id, access_token, environment)
+    click.echo(get_codec().dumps_pretty(result))
+
+
+@disbursement.command("balance")
+@access_token_option
+@click.option("--environment", default="sandbox", help="Target environment")
+@pass_config
+def get_disbursement_balance(config, access_token: Optional[str], environment: str):
+    """Get disbursement account balance"""
+    result = config.api.get_disbursement_balance(access_token, environment)
+    click.echo(get_codec().dumps_pretty(result))
+
+
+@cli.command("reconcile")
+@click.argument("rows", type=click.File("r", encoding="utf-8"), default="-")
+@click.option(
+    "--format",
+    "row_format",
+    type=click.Choice(["csv", "jsonl"]),
+    help="Input format; inferred from the file extension, JSONL for stdin",
+)
+@click.option(
+    "--output", required=True, type=click.Path(dir_okay=False), help="JSONL report"
+)
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False),
+    help="Checkpoint file (default: the report path with a .checkpoint suffix)",
+)
+@click.option(
+    "--kind",
+    default="request_to_pay",
+    type=click.Choice(
+        [
+            "request_to_pay",
+            "request_to_withdraw",
+            "invoice",
+            "pre_approval",
+            "payment",
+            "transfer",
+            "deposit",
+            "refund",
+            "remittance_transfer",
+        ]
+    ),
+    help="Transaction kind of rows without a kind column",
+)
+@click.option("--environment", default="sandbox", help="Target environment")
+@click.option("--concurrency", default=10, type=int, help="Requests kept in flight")
+@click.option(
+    "--checkpoint-every", default=100, type=int, help="Rows between checkpoints"
+)
+@access_token_option
+@pass_config
+def reconcile(
+    config,
+    rows,
+    row_format: Optional[str],
+    output: str,
+    checkpoint: Optional[str],
+    kind: str,
+    environment: str,
+    concurrency: int,
+    checkpoint_every: int,
+    access_token: Optional[str],
+):
+    """Re-fetch the status of every transaction in a ledger file
+
+    Rows need a reference_id column and may carry kind, environment, status,
+    amount, currency and external_id; ledger values are compared against the
+    gateway. Results are written to the report as they arrive and progress is
+    checkpointed, so rerunning the same command after a crash resumes where it
+    stopped.
+    """
+    from .bulk import read_rows
+    from .reconcile import Reconciler
+
+    if row_format is None:
+        row_format = "csv" if rows.name.endswith(".csv") else "jsonl"
+    reconciler = Reconciler(
+        config.client(pool_maxsize=max(concurrency, 1)),
+        output,
+        checkpoint_path=checkpoint,
+        kind=kind,
+        target_environment=environment,
+        access_token=access_token,
+        concurrency=concurrency,
+        checkpoint_every=checkpoint_every,
+    )
+    try:
+        summary = reconciler.run(read_rows(rows, row_format), source=rows.name)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    finally:
+        reconciler.api.close()
+    if summary.resumed_at is not None:
+        click.echo(f"Resumed at row {summary.resumed_at}", err=True)
+    click.echo(
+        f"Reconciled {summary.total} rows: {summary.matched} matched, "
+        f"{summary.mismatched} mismatched, {summary.failed} failed",
+        err=True,
+    )
+    if summary.mismatched or summary.failed:
+        sys.exit(1)
+
+
+SHELL_EXIT_COMMANDS = ("exit", "quit")
+
+
+def read_command_lines(interactive: bool):
+    """
+    Yield command lines from the terminal (with line editing when available) or
+    from stdin.
+    """
+    if interactive:
+        try:
+            import readline  # noqa: F401  Enables history and line editing.
+        except ImportError:
+            pass
+        while True:
+            try:
+                yield input("momo-psb> ")
+            except EOFError:
+                click.echo()
+                return
+            except KeyboardInterrupt:
+                click.echo()
+    else:
+        for line in sys.stdin:
+            yield line
+
+
+@cli.command()
+@click.pass_context
+def shell(ctx):
+    """Run many commands over one warm client
+
+    Reads one command per line, such as `account balance`, and runs it in this
+    process. The client, its pooled connections and its tokens are kept between
+    commands, so only the first command pays for the TLS handshake and token.
+    Commands can be typed interactively or piped in from a script; lines
+    starting with # are ignored, and `exit` or end of input ends the shell.
+    When reading from a pipe the exit status is 1 if any command failed.
+    """
+    import shlex
+
+    interactive = sys.stdin.isatty()
+    failed = False
+    for line in read_command_lines(interactive):
+        try:
+            args = shlex.split(line, comments=True)
+        except ValueError as e:
+            click.echo(f"Error: {e}", err=True)
+            failed = True
+            continue
+        if not args:
+            continue
+        if args[0] in SHELL_EXIT_COMMANDS:
+            break
+        if args[0] in ("help", "?"):
+            click.echo(cli.get_help(ctx.parent or ctx))
+            continue
+        command = cli.get_command(ctx, args[0])
+        if command is None or command is shell:
+            click.echo(f"Error: No such command '{args[0]}'.", err=True)
+            failed = True
+            continue
+        try:
+            with command.make_context(args[0], args[1:], parent=ctx) as sub_ctx:
+                command.invoke(sub_ctx)
+        except click.exceptions.Exit as e:
+            failed = failed or e.exit_code != 0
+        except click.ClickException as e:
+            e.show()
+            failed = True
+        except click.Abort:
+            click.echo("Aborted!", err=True)
+            failed = True
+        except SystemExit as e:
+            failed = failed or bool(e.code)
+        except Exception as e:
+            click.echo(f"Error: {e}", err=True)
+            failed = True
+    config = ctx.find_object(Config)
+    if config is not None and config._api is not None:
+        config._api.close()
+    if failed and not interactive:
+        ctx.exit(1)
 
 
 def main():
@@ -0,0 +1,147 @@
+import json
+from typing import Any, Callable, Dict, Mapping, Optional, Union
+
+JSON_CONTENT_TYPE = "application/json"
+
+
+def _default(obj: Any) -> Any:
+    """
+    Encode values the backends do not know natively, such as result models.
+    """
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JSONCodec:
+    """
+    Encodes request bodies and decodes response bodies.
+
+    This base class uses the standard library :mod:`json` module. Subclasses
+    plug in faster backends; decoding errors are always raised as
+    :class:`ValueError`.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encode a value as compact UTF-8 JSON.
+
+        :param obj: Value to encode.
+        :return: The encoded body.
+        """
+        return json.dumps(obj, separators=(",", ":"), default=_default).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Decode a JSON document.
+
+        :param data: Encoded body.
+        :return: The decoded value.
+        """
+        return json.loads(data)
+
+    def dumps_pretty(self, obj: Any) -> str:
+        """
+        Encode a value as indented JSON text for display.
+
+        :param obj: Value to encode.
+        :return: JSON text indented by two spaces.
+        """
+        return json.dumps(obj, indent=2, default=_default)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Codec backed by orjson.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, default=_default)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps_pretty(self, obj: Any) -> str:
+        return self._orjson.dumps(
+            obj, default=_default, option=self._orjson.OPT_INDENT_2
+        ).decode()
+
+
+class MsgspecCodec(JSONCodec):
+    """
+    Codec backed by msgspec.
+    """
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder(enc_hook=_default)
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+
+    def dumps_pretty(self, obj: Any) -> str:
+        return self._msgspec.json.format(self.dumps(obj), indent=2).decode()
+
+
+CODECS: Dict[str, Callable[[], JSONCodec]] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JSONCodec,
+}
+"""Available codecs by name, fastest first."""
+
+_codec: Optional[JSONCodec] = None
+
+
+def get_codec(name: Optional[str] = None) -> JSONCodec:
+    """
+    Get a codec by name, or the default codec.
+
+    The default is the first backend in :data:`CODECS` that is installed, so
+    ``pip install momo-psb[fast]`` switches the whole SDK to orjson.
+
+    :param name: Codec name ("orjson", "msgspec" or "json").
+    :return: The codec.
+    """
+    global _codec
+    if name is not None:
+        return CODECS[name]()
+    if _codec is None:
+        for factory in CODECS.values():
+            try:
+                _codec = factory()
+            except ImportError:
+                continue
+            break
+    return _codec
+
+
+def set_codec(codec: Union[JSONCodec, str]) -> None:
+    """
+    Replace the default codec used by clients created without one, result
+    models and the CLI.
+
+    :param codec: Codec instance or name.
+    """
+    global _codec
+    _codec = get_codec(codec) if isinstance(codec, str) else codec
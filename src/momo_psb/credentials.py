@@ -0,0 +1,315 @@
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from .tokens import OAuthToken, TokenKey, TokenManager
+
+CREDENTIALS_ENV = "MOMO_PSB_CREDENTIALS"
+"""Environment variable overriding the credentials file location."""
+
+
+def default_credentials_path() -> str:
+    """
+    Location of the credentials file: ``$MOMO_PSB_CREDENTIALS``, else
+    ``momo-psb/credentials.json`` under ``$XDG_CONFIG_HOME`` (``~/.config``).
+
+    :return: The file path.
+    """
+    path = os.environ.get(CREDENTIALS_ENV)
+    if path:
+        return path
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.join(
+        os.path.expanduser("~"), ".config"
+    )
+    return os.path.join(config_home, "momo-psb", "credentials.json")
+
+
+def profile_id(base_url: str, subscription_key: str) -> str:
+    """
+    Key of the credentials kept for one gateway and subscription key.
+
+    The subscription key is hashed, so the file never contains it.
+
+    :param base_url: Base URL of the gateway.
+    :param subscription_key: Subscription key.
+    :return: Hex digest identifying the profile.
+    """
+    material = f"{base_url.rstrip('/')}\0{subscription_key}".encode()
+    return hashlib.sha256(material).hexdigest()
+
+
+def _token_id(key: TokenKey) -> str:
+    return "\0".join(key)
+
+
+class CredentialStore:
+    """
+    A private JSON file holding API users, API keys and OAuth tokens.
+
+    Entries are kept per base URL and subscription key. The file is created
+    readable by the owner only (0600), as is a directory the store has to create
+    for it (0700). Every update is written to a temporary file and renamed into
+    place, so concurrent CLI invocations never see a partially written file, and
+    updates hold an exclusive lock on a ``.lock`` file next to it, so they never
+    lose each other's changes. Token expiry is stored as wall-clock time, so
+    tokens survive across processes.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the CredentialStore.
+
+        :param path: File location; defaults to :func:`default_credentials_path`.
+        """
+        self.path = path or default_credentials_path()
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            # A corrupt cache is only a cache: start over rather than fail.
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _directory(self) -> str:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            # makedirs applies the umask. A directory that already existed is
+            # left alone: it may be the user's home or a shared one.
+            os.chmod(directory, 0o700)
+        return directory
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        self._directory()
+        descriptor = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(descriptor, fcntl.LOCK_EX)
+                yield
+            else:
+                msvcrt.locking(descriptor, msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    msvcrt.locking(descriptor, msvcrt.LK_UNLCK, 1)
+        finally:
+            # Closing the descriptor also releases an flock.
+            os.close(descriptor)
+
+    def _write(self, data: Mapping[str, Any]) -> None:
+        directory = self._directory()
+        descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=".credentials")
+        try:
+            # mkstemp creates the file with mode 0600.
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                json.dump(data, file, indent=2, sort_keys=True)
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def _update(
+        self,
+        base_url: str,
+        subscription_key: str,
+        change: Callable[[Dict[str, Any]], None],
+    ) -> None:
+        with self._lock, self._locked():
+            data = self._read()
+            profiles = data.setdefault("profiles", {})
+            profile = profiles.setdefault(
+                profile_id(base_url, subscription_key),
+                {"base_url": base_url.rstrip("/"), "tokens": {}},
+            )
+            change(profile)
+            self._write(data)
+
+    def profile(self, base_url: str, subscription_key: str) -> Dict[str, Any]:
+        """
+        Read the entry of one gateway and subscription key.
+
+        :param base_url: Base URL of the gateway.
+        :param subscription_key: Subscription key.
+        :return: The entry, empty when nothing is stored.
+        """
+        profiles = self._read().get("profiles", {})
+        return profiles.get(profile_id(base_url, subscription_key), {})
+
+    def credentials(
+        self, base_url: str, subscription_key: str
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Read the stored API user and API key.
+
+        :param base_url: Base URL of the gateway.
+        :param subscription_key: Subscription key.
+        :return: ``(api_user, api_key)``, None for what is not stored.
+        """
+        profile = self.profile(base_url, subscription_key)
+        return profile.get("api_user"), profile.get("api_key")
+
+    def save_credentials(
+        self, base_url: str, subscription_key: str, api_user: str, api_key: str
+    ) -> None:
+        """
+        Store an API user and API key, dropping the tokens of other API users.
+
+        :param base_url: Base URL of the gateway.
+        :param subscription_key: Subscription key.
+        :param api_user: API user ID.
+        :param api_key: API key.
+        """
+
+        def change(profile: Dict[str, Any]) -> None:
+            profile["tokens"] = {
+                token_id: fields
+                for token_id, fields in profile.get("tokens", {}).items()
+                if token_id.split("\0")[0] == api_user
+            }
+            profile["api_user"] = api_user
+            profile["api_key"] = api_key
+
+        self._update(base_url, subscription_key, change)
+
+    def tokens(
+        self, base_url: str, subscription_key: str
+    ) -> Dict[TokenKey, OAuthToken]:
+        """
+        Read the stored OAuth tokens.
+
+        :param base_url: Base URL of the gateway.
+        :param subscription_key: Subscription key.
+        :return: Tokens by ``(api_user, product, target_environment)``.
+        """
+        stored = self.profile(base_url, subscription_key).get("tokens", {})
+        tokens = {}
+        for token_id, fields in stored.items():
+            key = tuple(token_id.split("\0"))
+            if len(key) == 3:
+                tokens[key] = OAuthToken(**fields)
+        return tokens
+
+    def save_token(
+        self, base_url: str, subscription_key: str, key: TokenKey, token: OAuthToken
+    ) -> None:
+        """
+        Store an OAuth token, pruning tokens that have expired.
+
+        :param base_url: Base URL of the gateway.
+        :param subscription_key: Subscription key.
+        :param key: Token cache key.
+        :param token: Token whose deadlines are wall-clock times.
+        """
+        now = time.time()
+
+        def change(profile: Dict[str, Any]) -> None:
+            tokens = {
+                token_id: fields
+                for token_id, fields in profile.get("tokens", {}).items()
+                if fields.get("expires_at", 0) > now
+            }
+            tokens[_token_id(key)] = {
+                "access_token": token.access_token,
+                "token_type": token.token_type,
+                "expires_at": token.expires_at,
+                "refresh_at": token.refresh_at,
+            }
+            profile["tokens"] = tokens
+
+        self._update(base_url, subscription_key, change)
+
+    def remove_token(
+        self, base_url: str, subscription_key: str, key: Optional[TokenKey] = None
+    ) -> None:
+        """
+        Drop a stored token.
+
+        :param base_url: Base URL of the gateway.
+        :param subscription_key: Subscription key.
+        :param key: Token cache key, or None to drop every token of the entry.
+        """
+
+        def change(profile: Dict[str, Any]) -> None:
+            if key is None:
+                profile["tokens"] = {}
+            else:
+                profile.get("tokens", {}).pop(_token_id(key), None)
+
+        self._update(base_url, subscription_key, change)
+
+    def clear(self, base_url: str, subscription_key: str) -> None:
+        """
+        Forget everything stored for one gateway and subscription key.
+
+        :param base_url: Base URL of the gateway.
+        :param subscription_key: Subscription key.
+        """
+        if not os.path.exists(self.path):
+            return
+        with self._lock, self._locked():
+            data = self._read()
+            if data.get("profiles", {}).pop(
+                profile_id(base_url, subscription_key), None
+            ):
+                self._write(data)
+
+
+class StoredTokenManager(TokenManager):
+    """
+    A :class:`TokenManager` that persists tokens in a :class:`CredentialStore`.
+
+    Tokens stored by earlier processes are handed out until their refresh
+    deadline, so repeated CLI invocations skip the token endpoint. Deadlines are
+    tracked on the wall clock because they must survive across processes.
+    """
+
+    def __init__(
+        self,
+        store: CredentialStore,
+        base_url: str,
+        subscription_key: str,
+        refresh_margin: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the StoredTokenManager.
+
+        :param store: Credential store holding the tokens.
+        :param base_url: Base URL of the gateway.
+        :param subscription_key: Subscription key.
+        :param refresh_margin: Seconds before expiry at which tokens are refreshed.
+        :param clock: Wall clock used to track expiry.
+        """
+        super().__init__(refresh_margin=refresh_margin, clock=clock)
+        self.credential_store = store
+        self.base_url = base_url
+        self.subscription_key = subscription_key
+        self._tokens.update(store.tokens(base_url, subscription_key))
+
+    def store(self, key: TokenKey, payload: Mapping[str, Any]) -> OAuthToken:
+        token = super().store(key, payload)
+        self.credential_store.save_token(
+            self.base_url, self.subscription_key, key, token
+        )
+        return token
+
+    def invalidate(self, key: Optional[TokenKey] = None) -> None:
+        super().invalidate(key)
+        self.credential_store.remove_token(self.base_url, self.subscription_key, key)
@@ -0,0 +1,1199 @@
+import argparse
+import base64
+import random
+import re
+import socket
+import threading
+import time
+import urllib.request
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .codec import JSON_CONTENT_TYPE, get_codec
+
+PENDING = "PENDING"
+
+SANDBOX_OUTCOMES: Dict[str, str] = {
+    "46733123450": "FAILED",
+    "46733123451": "REJECTED",
+    "46733123454": PENDING,
+}
+"""Payer numbers the MoMo sandbox reserves for non-successful outcomes."""
+
+_REASONS = {
+    "FAILED": "INTERNAL_PROCESSING_ERROR",
+    "REJECTED": "APPROVAL_REJECTED",
+}
+
+Deliver = Callable[[str, bytes, Dict[str, str]], int]
+"""Sends a callback body to a URL and returns the HTTP status code."""
+
+
+@dataclass
+class EmulatorResponse:
+    """
+    Response produced by :meth:`GatewayEmulator.handle`.
+
+    :param status: HTTP status code.
+    :param body: Encoded response body.
+    :param headers: Response headers.
+    :param delay: Seconds the transport should wait before answering.
+    """
+
+    status: int
+    body: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+    delay: float = 0.0
+
+
+@dataclass
+class Transaction:
+    """
+    A transaction created on the emulator.
+
+    :param kind: Endpoint that created it: "requesttopay", "requesttowithdraw",
+        "invoice", "preapproval" or "payment" for collection, and the product
+        path, such as "disbursement/v1_0/transfer", for payouts.
+    :param reference_id: X-Reference-Id of the creating request.
+    :param payload: Request body.
+    :param outcome: Status the transaction settles into.
+    :param settle_at: Clock time at which it settles.
+    :param callback_url: X-Callback-Url of the creating request.
+    :param status: Current status.
+    :param financial_transaction_id: Gateway ID assigned on success.
+    :param notified: Whether the settlement callback was sent.
+    :param created_at: Creation time.
+    """
+
+    kind: str
+    reference_id: str
+    payload: Dict[str, Any]
+    outcome: str
+    settle_at: float
+    callback_url: Optional[str] = None
+    status: str = PENDING
+    financial_transaction_id: Optional[str] = None
+    notified: bool = False
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+@dataclass
+class Delivery:
+    """
+    A callback the emulator attempted to deliver.
+
+    :param url: Callback URL.
+    :param reference_id: Transaction reference ID.
+    :param status: Transaction status sent.
+    :param response_status: HTTP status returned by the receiver, if any.
+    :param error: Delivery error, if any.
+    """
+
+    url: str
+    reference_id: str
+    status: str
+    response_status: Optional[int] = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class _Injection:
+    status: int
+    remaining: int
+    path_prefix: Optional[str]
+    after_processing: bool
+
+
+_PRODUCT_PREFIXES = ("/collection/", "/disbursement/", "/remittance/")
+
+_PAYOUT_FIELDS = ("externalId", "payee", "payerMessage", "payeeNote")
+
+
+def _deliver_http(url: str, body: bytes, headers: Dict[str, str]) -> int:
+    request = urllib.request.Request(url, data=body, headers=headers, method="PUT")
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return response.status
+
+
+def _amount(value: Any) -> str:
+    try:
+        return format(Decimal(str(value)).normalize(), "f")
+    except InvalidOperation:
+        return str(value)
+
+
+class GatewayEmulator:
+    """
+    An in-memory stand-in for the MoMo gateway.
+
+    It covers API user provisioning, tokens, request to pay, request to withdraw,
+    invoices, pre-approvals, payments, balance and account holder lookups, plus
+    disbursement transfers, deposits and refunds and remittance transfers. New
+    transactions start as PENDING and settle after ``settle_after`` seconds into
+    the outcome chosen by the payer number (see :data:`SANDBOX_OUTCOMES`); a
+    callback is delivered to their X-Callback-Url when they settle. Latency, 5xx
+    errors and 429 throttling can be injected at random or on demand.
+
+    The emulator is transport-agnostic: :meth:`handle` maps one request to one
+    :class:`EmulatorResponse`. :class:`EmulatorServer` serves it over loopback
+    HTTP, :class:`EmulatorAdapter` mounts it on a requests session and
+    :func:`httpx_transport` plugs it into an httpx client.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        settle_after: float = 0.0,
+        outcomes: Optional[Mapping[str, str]] = None,
+        token_ttl: int = 3600,
+        subscription_keys: Optional[Iterable[str]] = None,
+        strict_auth: bool = True,
+        inactive_accounts: Iterable[str] = (),
+        balance: str = "1000",
+        currency: str = "EUR",
+        deliver: Optional[Deliver] = None,
+        clock: Callable[[], float] = time.monotonic,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the GatewayEmulator.
+
+        :param latency: Seconds added to every response.
+        :param latency_jitter: Maximum random seconds added on top of ``latency``.
+        :param error_rate: Probability (0-1) of answering 500 without processing.
+        :param throttle_rate: Probability (0-1) of answering 429 with Retry-After.
+        :param retry_after: Retry-After seconds sent with 429 responses.
+        :param settle_after: Seconds a transaction stays PENDING.
+        :param outcomes: Final status by payer party ID, merged over
+            :data:`SANDBOX_OUTCOMES`. Other payers succeed. PENDING never settles.
+        :param token_ttl: Lifetime of issued access tokens in seconds.
+        :param subscription_keys: Accepted subscription keys. Any non-empty key is
+            accepted when None.
+        :param strict_auth: Require a valid Basic auth for tokens and an issued,
+            unexpired Bearer token for collection endpoints.
+        :param inactive_accounts: Account holder IDs reported as inactive.
+        :param balance: Available balance reported by the balance endpoint.
+        :param currency: Currency of the balance.
+        :param deliver: Callback sender; defaults to an HTTP PUT.
+        :param clock: Monotonic clock.
+        :param seed: Seed for latency jitter and error injection.
+        """
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.settle_after = settle_after
+        self.outcomes = {**SANDBOX_OUTCOMES, **(outcomes or {})}
+        self.token_ttl = token_ttl
+        self.subscription_keys = (
+            set(subscription_keys) if subscription_keys is not None else None
+        )
+        self.strict_auth = strict_auth
+        self.inactive_accounts = set(inactive_accounts)
+        self.balance = balance
+        self.currency = currency
+        self.deliver = deliver or _deliver_http
+        self.clock = clock
+        self.codec = get_codec()
+        self.deliveries: List[Delivery] = []
+        self.request_count = 0
+        self._rng = random.Random(seed)
+        self._users: Dict[str, Dict[str, Any]] = {}
+        self._tokens: Dict[str, float] = {}
+        self._transactions: Dict[Tuple[str, str], Transaction] = {}
+        self._injections: List[_Injection] = []
+        self._timers: Dict[Tuple[str, str], threading.Timer] = {}
+        self._lock = threading.RLock()
+        self._routes: List[Tuple[str, "re.Pattern[str]", Callable[..., Any]]] = [
+            ("POST", r"/v1_0/apiuser", self._create_api_user),
+            ("POST", r"/v1_0/apiuser/(?P<user>[^/]+)/apikey", self._create_api_key),
+            ("GET", r"/v1_0/apiuser/(?P<user>[^/]+)", self._get_api_user),
+            (
+                "POST",
+                r"/(?:collection|disbursement|remittance)/token",
+                self._create_token,
+            ),
+            (
+                "GET",
+                r"/(?:collection|disbursement|remittance)/v1_0/account/balance",
+                self._get_balance,
+            ),
+            (
+                "GET",
+                r"/collection/v1_0/accountholder/(?P<id_type>[^/]+)/(?P<id>[^/]+)/active",
+                self._get_account_active,
+            ),
+            (
+                "GET",
+                r"/collection/v1_0/accountholder/(?P<id_type>[^/]+)/(?P<id>[^/]+)/basicuserinfo",
+                self._get_basic_user_info,
+            ),
+            (
+                "POST",
+                r"/collection/v1_0/(?P<kind>requesttopay|requesttowithdraw)",
+                self._create_transaction,
+            ),
+            (
+                "GET",
+                r"/collection/v1_0/(?P<kind>requesttopay|requesttowithdraw)/(?P<ref>[^/]+)",
+                self._get_transaction,
+            ),
+            (
+                "POST",
+                r"/collection/v2_0/(?P<kind>invoice|preapproval|payment)",
+                self._create_transaction,
+            ),
+            (
+                "GET",
+                r"/collection/v2_0/(?P<kind>invoice|preapproval|payment)/(?P<ref>[^/]+)",
+                self._get_transaction,
+            ),
+            (
+                "DELETE",
+                r"/collection/v2_0/(?P<kind>invoice)/(?P<ref>[^/]+)",
+                self._cancel_transaction,
+            ),
+            (
+                "DELETE",
+                r"/collection/v1_0/(?P<kind>preapproval)/(?P<ref>[^/]+)",
+                self._cancel_transaction,
+            ),
+            (
+                "GET",
+                r"/collection/v1_0/preapprovals/(?P<id_type>[^/]+)/(?P<id>[^/]+)",
+                self._list_pre_approvals,
+            ),
+            (
+                "POST",
+                r"/(?P<kind>disbursement/v1_0/(?:transfer|deposit|refund)"
+                r"|remittance/v1_0/transfer)",
+                self._create_transaction,
+            ),
+            (
+                "GET",
+                r"/(?P<kind>disbursement/v1_0/(?:transfer|deposit|refund)"
+                r"|remittance/v1_0/transfer)/(?P<ref>[^/]+)",
+                self._get_transaction,
+            ),
+        ]
+        self._routes = [
+            (method, re.compile(pattern + "/?"), handler)
+            for method, pattern, handler in self._routes
+        ]
+
+    # -- Test controls -------------------------------------------------------
+
+    def inject(
+        self,
+        status: int,
+        count: int = 1,
+        path_prefix: Optional[str] = None,
+        after_processing: bool = False,
+    ) -> None:
+        """
+        Answer the next ``count`` matching requests with ``status``.
+
+        :param status: HTTP status to return, e.g. 429 or 503.
+        :param count: Number of requests affected.
+        :param path_prefix: Only affect paths starting with this prefix.
+        :param after_processing: Process the request before failing, as when a
+            gateway times out after creating the transaction.
+        """
+        with self._lock:
+            self._injections.append(
+                _Injection(status, count, path_prefix, after_processing)
+            )
+
+    def transaction(self, kind: str, reference_id: str) -> Optional[Transaction]:
+        """
+        Get a transaction with its current status.
+
+        :param kind: Endpoint that created it, e.g. "requesttopay".
+        :param reference_id: Transaction reference ID.
+        :return: The transaction, or None when unknown.
+        """
+        with self._lock:
+            transaction = self._transactions.get((kind, reference_id))
+            if transaction is not None:
+                self._advance(transaction)
+            return transaction
+
+    def settle_all(self) -> None:
+        """
+        Settle every pending transaction now and deliver its callback.
+        """
+        with self._lock:
+            pending = [
+                transaction
+                for transaction in self._transactions.values()
+                if transaction.status == PENDING and transaction.outcome != PENDING
+            ]
+            for transaction in pending:
+                transaction.settle_at = self.clock()
+        for transaction in pending:
+            self._settle_and_notify(transaction)
+
+    def close(self) -> None:
+        """
+        Cancel scheduled callback deliveries.
+        """
+        with self._lock:
+            timers, self._timers = self._timers, {}
+        for timer in timers.values():
+            timer.cancel()
+
+    # -- Request handling ----------------------------------------------------
+
+    def handle(
+        self, method: str, path: str, headers: Mapping[str, str], body: bytes = b""
+    ) -> EmulatorResponse:
+        """
+        Handle one gateway request.
+
+        :param method: HTTP method.
+        :param path: Request path, optionally with a query string.
+        :param headers: Request headers.
+        :param body: Raw request body.
+        :return: The response.
+        """
+        method = method.upper()
+        path = urlsplit(path).path
+        headers = {name.lower(): value for name, value in headers.items()}
+        with self._lock:
+            self.request_count += 1
+            delay = self.latency
+            if self.latency_jitter:
+                delay += self._rng.uniform(0, self.latency_jitter)
+            injection = self._take_injection(path)
+            if injection is None:
+                if self.throttle_rate and self._rng.random() < self.throttle_rate:
+                    injection = _Injection(429, 1, None, False)
+                elif self.error_rate and self._rng.random() < self.error_rate:
+                    injection = _Injection(500, 1, None, False)
+            if injection is not None and not injection.after_processing:
+                response = self._injected(injection.status)
+            else:
+                response = self._dispatch(method, path, headers, body)
+                if injection is not None:
+                    response = self._injected(injection.status)
+        response.delay = delay
+        return response
+
+    def _take_injection(self, path: str) -> Optional[_Injection]:
+        for injection in self._injections:
+            if injection.path_prefix is None or path.startswith(injection.path_prefix):
+                injection.remaining -= 1
+                if injection.remaining <= 0:
+                    self._injections.remove(injection)
+                return injection
+        return None
+
+    def _injected(self, status: int) -> EmulatorResponse:
+        if status == 429:
+            response = self._error(429, "TOO_MANY_REQUESTS", "Rate limit is exceeded.")
+            response.headers["Retry-After"] = f"{self.retry_after:g}"
+            return response
+        return self._error(status, "INTERNAL_PROCESSING_ERROR", "Injected failure.")
+
+    def _dispatch(
+        self, method: str, path: str, headers: Dict[str, str], body: bytes
+    ) -> EmulatorResponse:
+        key = headers.get("ocp-apim-subscription-key")
+        if not key or (
+            self.subscription_keys is not None and key not in self.subscription_keys
+        ):
+            return self._error(
+                401,
+                "ACCESS_DENIED",
+                "Access denied due to invalid or missing subscription key.",
+            )
+        known_path = False
+        for route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            known_path = True
+            if route_method != method:
+                continue
+            if path.startswith(_PRODUCT_PREFIXES) and handler != self._create_token:
+                if "x-target-environment" not in headers:
+                    return self._error(
+                        400, "BAD_REQUEST", "X-Target-Environment is required."
+                    )
+                if self.strict_auth and not self._authorized(headers):
+                    return self._error(401, "UNAUTHORIZED", "Invalid access token.")
+            return handler(headers, body, **match.groupdict())
+        if known_path:
+            return self._error(405, "METHOD_NOT_ALLOWED", "Method not allowed.")
+        return self._error(
+            404, "RESOURCE_NOT_FOUND", "Requested resource was not found."
+        )
+
+    def _authorized(self, headers: Dict[str, str]) -> bool:
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        expires_at = self._tokens.get(token)
+        return (
+            scheme.lower() == "bearer"
+            and expires_at is not None
+            and (expires_at > self.clock())
+        )
+
+    def _json(self, status: int, data: Any) -> EmulatorResponse:
+        return EmulatorResponse(
+            status, self.codec.dumps(data), {"Content-Type": JSON_CONTENT_TYPE}
+        )
+
+    def _error(self, status: int, code: str, message: str) -> EmulatorResponse:
+        return self._json(status, {"code": code, "message": message})
+
+    def _reference_id(self, headers: Dict[str, str]) -> Optional[str]:
+        reference_id = headers.get("x-reference-id", "")
+        try:
+            uuid.UUID(reference_id)
+        except ValueError:
+            return None
+        return reference_id
+
+    def _body(self, body: bytes) -> Optional[Dict[str, Any]]:
+        try:
+            data = self.codec.loads(body) if body else {}
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    # -- API user provisioning -----------------------------------------------
+
+    def _create_api_user(
+        self, headers: Dict[str, str], body: bytes
+    ) -> EmulatorResponse:
+        reference_id = self._reference_id(headers)
+        payload = self._body(body)
+        if reference_id is None:
+            return self._error(400, "BAD_REQUEST", "X-Reference-Id must be a UUID.")
+        if not payload or not payload.get("providerCallbackHost"):
+            return self._error(400, "BAD_REQUEST", "providerCallbackHost is required.")
+        if reference_id in self._users:
+            return self._error(
+                409, "RESOURCE_ALREADY_EXIST", "Duplicated reference id."
+            )
+        self._users[reference_id] = {
+            "providerCallbackHost": payload["providerCallbackHost"],
+            "apiKey": None,
+        }
+        return EmulatorResponse(201)
+
+    def _create_api_key(
+        self, headers: Dict[str, str], body: bytes, user
+    ) -> EmulatorResponse:
+        if user not in self._users:
+            return self._error(404, "RESOURCE_NOT_FOUND", "API user not found.")
+        api_key = uuid.uuid4().hex
+        self._users[user]["apiKey"] = api_key
+        return self._json(201, {"apiKey": api_key})
+
+    def _get_api_user(
+        self, headers: Dict[str, str], body: bytes, user
+    ) -> EmulatorResponse:
+        if user not in self._users:
+            return self._error(404, "RESOURCE_NOT_FOUND", "API user not found.")
+        return self._json(
+            200,
+            {
+                "providerCallbackHost": self._users[user]["providerCallbackHost"],
+                "targetEnvironment": "sandbox",
+            },
+        )
+
+    def _create_token(self, headers: Dict[str, str], body: bytes) -> EmulatorResponse:
+        if self.strict_auth:
+            scheme, _, credentials = headers.get("authorization", "").partition(" ")
+            try:
+                decoded = base64.b64decode(credentials).decode()
+            except ValueError:
+                decoded = ""
+            api_user, _, api_key = decoded.partition(":")
+            user = self._users.get(api_user)
+            if scheme.lower() != "basic" or not user or user["apiKey"] != api_key:
+                return self._error(401, "UNAUTHORIZED", "Invalid API user or key.")
+        token = uuid.uuid4().hex
+        self._tokens[token] = self.clock() + self.token_ttl
+        return self._json(
+            200,
+            {
+                "access_token": token,
+                "token_type": "access_token",
+                "expires_in": self.token_ttl,
+            },
+        )
+
+    # -- Accounts ------------------------------------------------------------
+
+    def _get_balance(self, headers: Dict[str, str], body: bytes) -> EmulatorResponse:
+        return self._json(
+            200, {"availableBalance": self.balance, "currency": self.currency}
+        )
+
+    def _get_account_active(
+        self, headers: Dict[str, str], body: bytes, id_type, id
+    ) -> EmulatorResponse:
+        return self._json(200, {"result": id not in self.inactive_accounts})
+
+    def _get_basic_user_info(
+        self, headers: Dict[str, str], body: bytes, id_type, id
+    ) -> EmulatorResponse:
+        if id in self.inactive_accounts:
+            return self._error(404, "RESOURCE_NOT_FOUND", "Account holder not found.")
+        return self._json(
+            200,
+            {
+                "given_name": "Sand",
+                "family_name": "Box",
+                "birthdate": "1976-08-13",
+                "locale": "sv_SE",
+                "gender": "MALE",
+                "status": "ACTIVE",
+            },
+        )
+
+    # -- Transactions --------------------------------------------------------
+
+    def _create_transaction(
+        self, headers: Dict[str, str], body: bytes, kind
+    ) -> EmulatorResponse:
+        reference_id = self._reference_id(headers)
+        payload = self._body(body)
+        if reference_id is None:
+            return self._error(400, "BAD_REQUEST", "X-Reference-Id must be a UUID.")
+        if payload is None:
+            return self._error(400, "BAD_REQUEST", "Request body must be JSON.")
+        if (kind, reference_id) in self._transactions:
+            return self._error(
+                409, "RESOURCE_ALREADY_EXIST", "Duplicated reference id."
+            )
+        party = (
+            payload.get("payer")
+            or payload.get("intendedPayer")
+            or payload.get("payee")
+            or {}
+        )
+        transaction = Transaction(
+            kind=kind,
+            reference_id=reference_id,
+            payload=payload,
+            outcome=self.outcomes.get(str(party.get("partyId", "")), "SUCCESSFUL"),
+            settle_at=self.clock() + self.settle_after,
+            callback_url=headers.get("x-callback-url"),
+        )
+        self._transactions[(kind, reference_id)] = transaction
+        self._advance(transaction)
+        if transaction.callback_url and transaction.outcome != PENDING:
+            timer = threading.Timer(
+                self.settle_after, self._settle_and_notify, (transaction,)
+            )
+            timer.daemon = True
+            self._timers[(kind, reference_id)] = timer
+            timer.start()
+        return EmulatorResponse(202)
+
+    def _advance(self, transaction: Transaction) -> None:
+        if (
+            transaction.status == PENDING
+            and transaction.outcome != PENDING
+            and self.clock() >= transaction.settle_at
+        ):
+            transaction.status = transaction.outcome
+            if transaction.status == "SUCCESSFUL":
+                transaction.financial_transaction_id = str(
+                    self._rng.randrange(10**8, 10**9)
+                )
+
+    def _settle_and_notify(self, transaction: Transaction) -> None:
+        with self._lock:
+            if transaction.status == PENDING:
+                transaction.settle_at = min(transaction.settle_at, self.clock())
+                self._advance(transaction)
+            self._timers.pop((transaction.kind, transaction.reference_id), None)
+            url = transaction.callback_url
+            # Deliver once, even if a timer and settle_all race.
+            if transaction.status == PENDING or not url or transaction.notified:
+                return
+            transaction.notified = True
+            body = self.codec.dumps(self._representation(transaction))
+        delivery = Delivery(url, transaction.reference_id, transaction.status)
+        try:
+            delivery.response_status = self.deliver(
+                url,
+                body,
+                {
+                    "Content-Type": JSON_CONTENT_TYPE,
+                    "X-Reference-Id": transaction.reference_id,
+                },
+            )
+        except Exception as exc:
+            delivery.error = exc
+        with self._lock:
+            self.deliveries.append(delivery)
+
+    def _get_transaction(
+        self, headers: Dict[str, str], body: bytes, kind, ref
+    ) -> EmulatorResponse:
+        transaction = self._transactions.get((kind, ref))
+        if transaction is None:
+            return self._error(
+                404, "RESOURCE_NOT_FOUND", "Requested resource was not found."
+            )
+        self._advance(transaction)
+        return self._json(200, self._representation(transaction))
+
+    def _cancel_transaction(
+        self, headers: Dict[str, str], body: bytes, kind, ref
+    ) -> EmulatorResponse:
+        transaction = self._transactions.get((kind, ref))
+        if transaction is None:
+            return self._error(
+                404, "RESOURCE_NOT_FOUND", "Requested resource was not found."
+            )
+        self._advance(transaction)
+        if transaction.status != PENDING and transaction.status != "SUCCESSFUL":
+            return self._error(409, "NOT_ALLOWED", "Transaction cannot be cancelled.")
+        transaction.status = transaction.outcome = "CANCELLED"
+        return EmulatorResponse(200)
+
+    def _list_pre_approvals(
+        self, headers: Dict[str, str], body: bytes, id_type, id
+    ) -> EmulatorResponse:
+        approvals = []
+        for (kind, reference_id), transaction in self._transactions.items():
+            payer = transaction.payload.get("payer") or {}
+            if kind != "preapproval" or str(payer.get("partyId")) != id:
+                continue
+            self._advance(transaction)
+            if transaction.status != "SUCCESSFUL":
+                continue
+            approvals.append(
+                {
+                    "preApprovalId": reference_id,
+                    "fromFri": f"FRI:{id}/{id_type.upper()}",
+                    "fromCurrency": transaction.payload.get("payerCurrency"),
+                    "createdTime": transaction.created_at.isoformat(),
+                    "status": "APPROVED",
+                    "message": transaction.payload.get("payerMessage"),
+                    "frequency": "ONCE",
+                }
+            )
+        return self._json(200, approvals)
+
+    def _representation(self, transaction: Transaction) -> Dict[str, Any]:
+        payload = transaction.payload
+        status = transaction.status
+        if transaction.kind in ("requesttopay", "requesttowithdraw"):
+            data = {
+                "amount": _amount(payload.get("amount")),
+                "currency": payload.get("currency"),
+                "externalId": payload.get("externalId"),
+                "payer": payload.get("payer"),
+                "payerMessage": payload.get("payerMessage"),
+                "payeeNote": payload.get("payeeNote"),
+                "status": status,
+            }
+        elif transaction.kind == "invoice":
+            expires = transaction.created_at + timedelta(
+                seconds=int(payload.get("validityDuration") or 0)
+            )
+            data = {
+                "referenceId": transaction.reference_id,
+                "externalId": payload.get("externalId"),
+                "amount": _amount(payload.get("amount")),
+                "currency": payload.get("currency"),
+                "status": status,
+                "paymentReference": transaction.reference_id[:8],
+                "invoiceId": transaction.reference_id,
+                "expiryDateTime": expires.isoformat(),
+                "intendedPayer": payload.get("intendedPayer"),
+                "description": payload.get("description"),
+            }
+        elif transaction.kind == "preapproval":
+            expires = transaction.created_at + timedelta(
+                seconds=int(payload.get("validityTime") or 0)
+            )
+            data = {
+                "payer": payload.get("payer"),
+                "payerCurrency": payload.get("payerCurrency"),
+                "payerMessage": payload.get("payerMessage"),
+                "status": status,
+                "expirationDateTime": expires.isoformat(),
+            }
+        elif "/" in transaction.kind:
+            data = {
+                "amount": _amount(payload.get("amount")),
+                "currency": payload.get("currency"),
+                **{name: payload[name] for name in _PAYOUT_FIELDS if name in payload},
+                "status": status,
+            }
+        else:
+            data = {"referenceId": transaction.reference_id, "status": status}
+        if transaction.financial_transaction_id:
+            data["financialTransactionId"] = transaction.financial_transaction_id
+        if status in _REASONS:
+            data["reason"] = _REASONS[status]
+        return data
+
+
+class EmulatorServer:
+    """
+    Serves a :class:`GatewayEmulator` over loopback HTTP/1.1 with keep-alive.
+
+    ``connections`` counts the connections accepted so far.
+    """
+
+    def __init__(
+        self,
+        emulator: Optional[GatewayEmulator] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize the EmulatorServer.
+
+        :param emulator: Emulator to serve. A default one is created when omitted.
+        :param host: Interface to bind.
+        :param port: Port to bind; 0 picks a free port.
+        """
+        self.emulator = emulator or GatewayEmulator()
+        self.host = host
+        self.port = port
+        self.connections = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """
+        Base URL of the running server.
+        """
+        if self._server is None:
+            raise RuntimeError("The emulator server is not running.")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "EmulatorServer":
+        """
+        Start serving on a background thread.
+
+        :return: The server.
+        """
+        emulator = self.emulator
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; with Nagle enabled the
+            # body waits for the client's delayed ACK (~40 ms per request).
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                response = emulator.handle(
+                    self.command, self.path, dict(self.headers.items()), body
+                )
+                if response.delay:
+                    time.sleep(response.delay)
+                self.send_response(response.status)
+                for name, value in response.headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(response.body)))
+                self.end_headers()
+                self.wfile.write(response.body)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="momo-emulator", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop the server and cancel pending callback deliveries.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.emulator.close()
+
+    def __enter__(self) -> "EmulatorServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+class EmulatorH2Server:
+    """
+    Serves a :class:`GatewayEmulator` over loopback HTTP/2 without TLS (h2c with
+    prior knowledge).
+
+    Every stream is answered on its own thread, so concurrent requests on one
+    connection are processed in parallel, as on a real HTTP/2 gateway. Requires
+    the h2 package. ``connections`` counts the connections accepted so far.
+    """
+
+    def __init__(
+        self,
+        emulator: Optional[GatewayEmulator] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize the EmulatorH2Server.
+
+        :param emulator: Emulator to serve. A default one is created when omitted.
+        :param host: Interface to bind.
+        :param port: Port to bind; 0 picks a free port.
+        """
+        self.emulator = emulator or GatewayEmulator()
+        self.host = host
+        self.port = port
+        self.connections = 0
+        self._listener: Optional[socket.socket] = None
+        self._sockets: List[socket.socket] = []
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    @property
+    def url(self) -> str:
+        """
+        Base URL of the running server.
+        """
+        if self._listener is None:
+            raise RuntimeError("The emulator server is not running.")
+        host, port = self._listener.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "EmulatorH2Server":
+        """
+        Start serving on a background thread.
+
+        :return: The server.
+        """
+        try:
+            import h2.connection  # noqa: F401
+        except ImportError as exc:
+            raise ImportError(
+                "EmulatorH2Server requires h2. "
+                "Install it with `pip install momo-psb[http2]`."
+            ) from exc
+        self._stopping.clear()
+        self._listener = socket.create_server((self.host, self.port))
+        self._thread = threading.Thread(
+            target=self._accept, name="momo-emulator-h2", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def _accept(self) -> None:
+        listener = self._listener
+        # Closing a socket does not wake a blocked accept(), so poll for stop().
+        listener.settimeout(0.1)
+        while not self._stopping.is_set():
+            try:
+                connection, _ = listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            connection.settimeout(None)
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with self._lock:
+                self.connections += 1
+                self._sockets.append(connection)
+            threading.Thread(
+                target=self._serve, args=(connection,), name="momo-emulator-h2-conn"
+            ).start()
+
+    def _serve(self, sock: socket.socket) -> None:
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        connection = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        # Guards the connection state and the socket; responders wait on it
+        # for flow-control window updates.
+        condition = threading.Condition()
+        requests_by_stream: Dict[int, Tuple[Dict[str, str], bytearray]] = {}
+        with condition:
+            connection.initiate_connection()
+            sock.sendall(connection.data_to_send())
+        try:
+            while True:
+                try:
+                    data = sock.recv(65536)
+                except OSError:
+                    return
+                if not data:
+                    return
+                with condition:
+                    events = connection.receive_data(data)
+                    for event in events:
+                        if isinstance(event, h2.events.RequestReceived):
+                            requests_by_stream[event.stream_id] = (
+                                dict(event.headers),
+                                bytearray(),
+                            )
+                        elif isinstance(event, h2.events.DataReceived):
+                            requests_by_stream[event.stream_id][1].extend(event.data)
+                            connection.acknowledge_received_data(
+                                event.flow_controlled_length, event.stream_id
+                            )
+                        elif isinstance(event, h2.events.StreamEnded):
+                            headers, body = requests_by_stream.pop(event.stream_id)
+                            threading.Thread(
+                                target=self._respond,
+                                args=(
+                                    sock,
+                                    connection,
+                                    condition,
+                                    event.stream_id,
+                                    headers,
+                                    bytes(body),
+                                ),
+                                daemon=True,
+                            ).start()
+                        elif isinstance(event, h2.events.ConnectionTerminated):
+                            return
+                    condition.notify_all()
+                    sock.sendall(connection.data_to_send())
+        finally:
+            with condition:
+                condition.notify_all()
+            sock.close()
+            with self._lock:
+                if sock in self._sockets:
+                    self._sockets.remove(sock)
+
+    def _respond(
+        self,
+        sock: socket.socket,
+        connection: Any,
+        condition: threading.Condition,
+        stream_id: int,
+        headers: Dict[str, str],
+        body: bytes,
+    ) -> None:
+        response = self.emulator.handle(
+            headers[":method"],
+            headers[":path"],
+            {name: value for name, value in headers.items() if name[0] != ":"},
+            body,
+        )
+        if response.delay:
+            time.sleep(response.delay)
+        response_headers = [
+            (":status", str(response.status)),
+            ("content-length", str(len(response.body))),
+        ] + [(name.lower(), value) for name, value in response.headers.items()]
+        try:
+            with condition:
+                connection.send_headers(
+                    stream_id, response_headers, end_stream=not response.body
+                )
+                remaining = memoryview(response.body)
+                while remaining:
+                    window = min(
+                        connection.local_flow_control_window(stream_id),
+                        connection.max_outbound_frame_size,
+                    )
+                    if window <= 0:
+                        sock.sendall(connection.data_to_send())
+                        if not condition.wait(timeout=5):
+                            return
+                        continue
+                    chunk, remaining = remaining[:window], remaining[window:]
+                    connection.send_data(
+                        stream_id, chunk.tobytes(), end_stream=not remaining
+                    )
+                sock.sendall(connection.data_to_send())
+        except Exception:
+            # The client went away or reset the stream; nothing left to answer.
+            return
+
+    def stop(self) -> None:
+        """
+        Stop the server, close its connections and cancel pending callbacks.
+        """
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        with self._lock:
+            sockets, self._sockets = self._sockets, []
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.emulator.close()
+
+    def __enter__(self) -> "EmulatorH2Server":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+class EmulatorAdapter(BaseAdapter):
+    """
+    Transport adapter that answers a requests session from a
+    :class:`GatewayEmulator` in-process, without sockets.
+
+    Mount it on the client session: ``api.session.mount(base_url, adapter)``.
+    """
+
+    def __init__(self, emulator: GatewayEmulator):
+        super().__init__()
+        self.emulator = emulator
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any):
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode()
+        split = urlsplit(request.url)
+        path = split.path + (f"?{split.query}" if split.query else "")
+        result = self.emulator.handle(request.method, path, request.headers, body)
+        if result.delay:
+            time.sleep(result.delay)
+        response = requests.Response()
+        response.status_code = result.status
+        response.headers = CaseInsensitiveDict(result.headers)
+        response._content = result.body
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def httpx_transport(emulator: GatewayEmulator):
+    """
+    Build an httpx transport answering from a :class:`GatewayEmulator`
+    in-process, for both ``httpx.Client`` and ``httpx.AsyncClient``.
+
+    :param emulator: The emulator.
+    :return: The transport.
+    """
+    import asyncio
+
+    import httpx
+
+    def respond(request: "httpx.Request", body: bytes) -> EmulatorResponse:
+        path = request.url.raw_path.decode()
+        return emulator.handle(request.method, path, request.headers, body)
+
+    class EmulatorTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+        def handle_request(self, request: "httpx.Request") -> "httpx.Response":
+            result = respond(request, request.read())
+            if result.delay:
+                time.sleep(result.delay)
+            return httpx.Response(
+                result.status, headers=result.headers, content=result.body
+            )
+
+        async def handle_async_request(
+            self, request: "httpx.Request"
+        ) -> "httpx.Response":
+            result = respond(request, await request.aread())
+            if result.delay:
+                await asyncio.sleep(result.delay)
+            return httpx.Response(
+                result.status, headers=result.headers, content=result.body
+            )
+
+    return EmulatorTransport()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Run the emulator server from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Local MoMo gateway stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--settle-after", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--http2", action="store_true", help="Serve HTTP/2 (h2c) instead of HTTP/1.1."
+    )
+    args = parser.parse_args(argv)
+    emulator = GatewayEmulator(
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        settle_after=args.settle_after,
+        seed=args.seed,
+    )
+    server_class = EmulatorH2Server if args.http2 else EmulatorServer
+    server = server_class(emulator, args.host, args.port).start()
+    print(f"MoMo gateway emulator listening on {server.url}", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+        print(f"Served {server.connections} connection(s)", flush=True)
+
+
+if __name__ == "__main__":
+    main()
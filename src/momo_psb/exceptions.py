@@ -0,0 +1,23 @@
+class MoMoPSBError(Exception):
+    """
+    Base class for errors raised by the MoMo PSB SDK itself.
+    """
+
+
+class CircuitOpenError(MoMoPSBError):
+    """
+    Raised instead of sending a request while the endpoint's circuit is open.
+    """
+
+    def __init__(self, group: str, retry_in: float):
+        """
+        Initialize the CircuitOpenError.
+
+        :param group: Endpoint group whose circuit is open.
+        :param retry_in: Seconds until the circuit lets a trial request through.
+        """
+        super().__init__(
+            f"Circuit for {group!r} is open; retry in {retry_in:.1f} seconds."
+        )
+        self.group = group
+        self.retry_in = retry_in
@@ -0,0 +1,89 @@
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+SUBSCRIPTION_KEY_HEADER = "Ocp-Apim-Subscription-Key"
+
+
+class HeaderTemplates:
+    """
+    Immutable request header templates, precomputed per product and target
+    environment.
+
+    Templates are read-only and never change once built, so a single client can
+    be shared between threads: every request copies its template and adds the
+    per-request fields (Authorization, X-Reference-Id, X-Callback-Url) to the
+    copy only.
+    """
+
+    def __init__(
+        self,
+        subscription_key: str,
+        product_keys: Optional[Mapping[str, str]] = None,
+    ):
+        """
+        Initialize the HeaderTemplates.
+
+        :param subscription_key: Default subscription key.
+        :param product_keys: Subscription keys overriding the default per product.
+        """
+        self.subscription_key = subscription_key
+        self.product_keys = dict(product_keys or {})
+        self.base: Mapping[str, str] = MappingProxyType(
+            {SUBSCRIPTION_KEY_HEADER: subscription_key}
+        )
+        self._templates: Dict[
+            Tuple[Optional[str], Optional[str]], Mapping[str, str]
+        ] = {}
+
+    def template(
+        self, product: Optional[str] = None, target_environment: Optional[str] = None
+    ) -> Mapping[str, str]:
+        """
+        Get the read-only template of a product and target environment.
+
+        :param product: API product, e.g. "collection". None for endpoints outside
+            a product, such as API user provisioning.
+        :param target_environment: Value of the X-Target-Environment header.
+        :return: The template.
+        """
+        key = (product, target_environment)
+        template = self._templates.get(key)
+        if template is None:
+            headers = {
+                SUBSCRIPTION_KEY_HEADER: self.product_keys.get(
+                    product, self.subscription_key
+                )
+            }
+            if target_environment is not None:
+                headers["X-Target-Environment"] = target_environment
+            # Threads racing on a new key build equal templates; setdefault keeps
+            # whichever is stored first.
+            template = self._templates.setdefault(key, MappingProxyType(headers))
+        return template
+
+    def build(
+        self,
+        product: Optional[str] = None,
+        target_environment: Optional[str] = None,
+        access_token: Optional[str] = None,
+        reference_id: Optional[str] = None,
+        callback_url: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """
+        Build the headers of one request.
+
+        :param product: API product.
+        :param target_environment: Value of the X-Target-Environment header.
+        :param access_token: Bearer token for the Authorization header.
+        :param reference_id: Value of the X-Reference-Id header.
+        :param callback_url: Value of the X-Callback-Url header.
+        :return: A new dictionary owned by the caller.
+        """
+        headers = dict(self.template(product, target_environment))
+        if access_token:
+            headers["Authorization"] = f"Bearer {access_token}"
+        if reference_id:
+            headers["X-Reference-Id"] = reference_id
+        if callback_url:
+            headers["X-Callback-Url"] = callback_url
+        return headers
@@ -0,0 +1,237 @@
+import asyncio
+import os
+import ssl
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import (
+    DEFAULT_CA_BUNDLE_PATH,
+    get_encoding_from_headers,
+    select_proxy,
+)
+
+# Connection-specific headers are forbidden in HTTP/2 (RFC 9113, section 8.2.2).
+_HOP_BY_HOP_HEADERS = frozenset(
+    {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"}
+)
+
+
+def require_h2() -> None:
+    """
+    Check that the HTTP/2 dependencies are installed.
+
+    :raises ImportError: If httpx or h2 is missing.
+    """
+    try:
+        import h2  # noqa: F401
+        import httpx  # noqa: F401
+    except ImportError as exc:
+        raise ImportError(
+            "HTTP/2 support requires httpx and h2. "
+            "Install them with `pip install momo-psb[http2]`."
+        ) from exc
+
+
+def _ssl_context(verify: Any, cert: Any) -> ssl.SSLContext:
+    """
+    Build an SSL context from requests-style ``verify`` and ``cert`` settings.
+    """
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif verify is True:
+        context = ssl.create_default_context(cafile=DEFAULT_CA_BUNDLE_PATH)
+    elif os.path.isdir(verify):
+        context = ssl.create_default_context(capath=verify)
+    else:
+        context = ssl.create_default_context(cafile=verify)
+    if isinstance(cert, str):
+        context.load_cert_chain(cert)
+    elif cert is not None:
+        context.load_cert_chain(*cert)
+    return context
+
+
+class HTTP2Adapter(BaseAdapter):
+    """
+    Transport adapter that sends a requests session's traffic over HTTP/2.
+
+    Requests go through an :class:`httpx.AsyncClient` with HTTP/2 enabled, so
+    concurrent requests to one host are multiplexed as streams over a single
+    connection instead of each holding a pooled connection of its own. The
+    client runs on a private event loop thread that every calling thread hands
+    its requests to; httpx's synchronous HTTP/2 connection cannot be shared
+    between threads. Hosts that do not offer HTTP/2 during the TLS handshake
+    (ALPN) are served over HTTP/1.1 with ordinary keep-alive pooling. Plain
+    ``http://`` URLs use HTTP/1.1 unless ``http1`` is False, which speaks HTTP/2
+    with prior knowledge (h2c).
+
+    Per-request ``verify``, ``cert`` and ``proxies`` settings (e.g.
+    ``session.verify = False``, a CA bundle path, a client certificate, or
+    ``HTTPS_PROXY``) are honoured as on the HTTP/1.1 adapter. Requests with
+    settings other than the defaults go through a separate client built for
+    those settings, so they share connections only with requests that use the
+    same settings.
+
+    Mount it on a session: ``session.mount("https://", HTTP2Adapter())``.
+    Requires ``httpx[http2]``.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 10,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = 5.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        http1: bool = True,
+    ):
+        """
+        Initialize the HTTP2Adapter.
+
+        :param max_connections: Maximum number of open connections. With HTTP/2
+            one connection per host usually suffices.
+        :param max_keepalive_connections: Maximum number of idle connections
+            kept open; defaults to ``max_connections``.
+        :param keepalive_expiry: Seconds an idle connection is kept open.
+        :param ssl_context: SSL context shared by every connection. The default
+            context verifies certificates against the system trust store.
+        :param http1: Allow falling back to HTTP/1.1. When False, every
+            connection speaks HTTP/2, including h2c on ``http://`` URLs.
+        """
+        require_h2()
+        import httpx
+
+        super().__init__()
+        self._httpx = httpx
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="momo-http2", daemon=True
+        )
+        self._thread.start()
+        self._client_options = {
+            "http1": http1,
+            "http2": True,
+            "limits": httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=(
+                    max_connections
+                    if max_keepalive_connections is None
+                    else max_keepalive_connections
+                ),
+                keepalive_expiry=keepalive_expiry,
+            ),
+            "trust_env": False,
+        }
+        self._verify = ssl_context if ssl_context is not None else True
+        self.client = httpx.AsyncClient(verify=self._verify, **self._client_options)
+        # Clients for requests whose verify/cert/proxy differ from the defaults.
+        self._clients: Dict[Tuple[Any, Any, Optional[str]], Any] = {}
+        self._lock = threading.Lock()
+
+    def _client_for(
+        self, url: str, verify: Any, cert: Any, proxy: Optional[str]
+    ) -> Any:
+        if not url.startswith("https:"):
+            verify, cert = True, None
+        if verify is True and cert is None and proxy is None:
+            return self.client
+        key = (verify, tuple(cert) if isinstance(cert, list) else cert, proxy)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._httpx.AsyncClient(
+                    verify=(
+                        self._verify
+                        if verify is True and cert is None
+                        else _ssl_context(verify, cert)
+                    ),
+                    proxy=proxy,
+                    **self._client_options,
+                )
+                self._clients[key] = client
+        return client
+
+    def _timeout(self, timeout: Any) -> Any:
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return self._httpx.Timeout(read, connect=connect)
+        return self._httpx.Timeout(timeout)
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: Any = True,
+        cert: Any = None,
+        proxies: Any = None,
+    ) -> requests.Response:
+        """
+        Send a prepared request over the HTTP/2 client.
+
+        Transport errors are raised as the matching :mod:`requests` exceptions,
+        so retry policies behave as they do over HTTP/1.1.
+
+        :param request: The prepared request.
+        :param timeout: Seconds, or a ``(connect, read)`` tuple, or None.
+        :param verify: Whether to verify the server's certificate, or the path
+            of a CA bundle or directory to verify it against.
+        :param cert: Client certificate file, or a ``(cert, key)`` tuple.
+        :param proxies: Proxy URLs by scheme or ``scheme://host``, as in
+            :attr:`requests.Session.proxies`.
+        :return: The response, with its body read.
+        """
+        httpx = self._httpx
+        body = request.body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        headers = [
+            (name, value)
+            for name, value in request.headers.items()
+            if name.lower() not in _HOP_BY_HOP_HEADERS
+        ]
+        proxy = select_proxy(request.url, proxies) if proxies else None
+        client = self._client_for(request.url, verify, cert, proxy)
+        call = client.request(
+            request.method,
+            request.url,
+            headers=headers,
+            content=body,
+            timeout=self._timeout(timeout),
+        )
+        try:
+            result = asyncio.run_coroutine_threadsafe(call, self._loop).result()
+        except httpx.ConnectTimeout as exc:
+            raise requests.ConnectTimeout(exc, request=request) from exc
+        except httpx.TimeoutException as exc:
+            raise requests.ReadTimeout(exc, request=request) from exc
+        except httpx.TransportError as exc:
+            raise requests.ConnectionError(exc, request=request) from exc
+
+        response = requests.Response()
+        response.status_code = result.status_code
+        response.headers = CaseInsensitiveDict(result.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = result.reason_phrase
+        response._content = result.content
+        response.url = request.url
+        response.request = request
+        response.elapsed = result.elapsed
+        response.connection = self
+        return response
+
+    def close(self) -> None:
+        """
+        Close the connections held by the adapter and stop its event loop.
+        """
+        if self._loop.is_closed():
+            return
+        for client in [self.client, *self._clients.values()]:
+            asyncio.run_coroutine_threadsafe(client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
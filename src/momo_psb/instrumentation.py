@@ -0,0 +1,413 @@
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from ._endpoints import endpoint_group, route_template
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+"""Default latency histogram bucket bounds in seconds."""
+
+
+@dataclass(frozen=True)
+class RequestEvent:
+    """
+    A request about to be sent to the gateway.
+    """
+
+    method: str
+    url: str
+    endpoint: str
+
+
+@dataclass(frozen=True)
+class ResponseEvent:
+    """
+    The outcome of a request: a response status code or the error it raised.
+    """
+
+    request: RequestEvent
+    status_code: Optional[int]
+    elapsed: float
+    error: Optional[BaseException] = None
+
+
+@dataclass(frozen=True)
+class RetryEvent:
+    """
+    A retry scheduled after a transient failure.
+    """
+
+    method: str
+    endpoint: str
+    attempt: int
+    delay: float
+    status_code: Optional[int] = None
+    error: Optional[BaseException] = None
+
+
+@dataclass(frozen=True)
+class ThrottleEvent:
+    """
+    A 429 response from the gateway.
+    """
+
+    method: str
+    endpoint: str
+    retry_after: Optional[float]
+
+
+class Instrumentation:
+    """
+    Hooks called by the clients around every request sent to the gateway.
+
+    Subclass it and override the hooks you need; the defaults do nothing. Hooks
+    run on the calling thread (or event loop) and should return quickly. A client
+    built without instrumentation skips the hooks entirely, so an uninstrumented
+    client pays a single attribute check per request.
+    """
+
+    def on_request(self, event: RequestEvent) -> Any:
+        """
+        Called before a request is sent, including each retry attempt.
+
+        :param event: The request.
+        :return: A context object handed back to :meth:`on_response`.
+        """
+        return None
+
+    def on_response(self, event: ResponseEvent, context: Any) -> None:
+        """
+        Called when a request returned a response or raised.
+
+        :param event: The outcome.
+        :param context: The value returned by :meth:`on_request`.
+        """
+
+    def on_retry(self, event: RetryEvent) -> None:
+        """
+        Called when a failed attempt is about to be retried.
+
+        :param event: The retry.
+        """
+
+    def on_throttle(self, event: ThrottleEvent) -> None:
+        """
+        Called when the gateway answered 429 Too Many Requests.
+
+        :param event: The throttled request.
+        """
+
+    def on_circuit_state(self, group: str, old: str, new: str) -> None:
+        """
+        Listener for circuit breaker transitions; pass it as the ``on_state_change``
+        of a :class:`momo_psb.circuit.CircuitBreakerRegistry`.
+
+        :param group: Endpoint group of the breaker.
+        :param old: Previous state.
+        :param new: New state.
+        """
+
+
+class CompositeInstrumentation(Instrumentation):
+    """
+    Fans every hook out to several instrumentations, e.g. metrics and tracing.
+    """
+
+    def __init__(self, *instrumentations: Instrumentation):
+        """
+        Initialize the CompositeInstrumentation.
+
+        :param instrumentations: Instrumentations called in order.
+        """
+        self.instrumentations = instrumentations
+
+    def on_request(self, event: RequestEvent) -> Any:
+        return [item.on_request(event) for item in self.instrumentations]
+
+    def on_response(self, event: ResponseEvent, context: Any) -> None:
+        for item, item_context in zip(self.instrumentations, context):
+            item.on_response(event, item_context)
+
+    def on_retry(self, event: RetryEvent) -> None:
+        for item in self.instrumentations:
+            item.on_retry(event)
+
+    def on_throttle(self, event: ThrottleEvent) -> None:
+        for item in self.instrumentations:
+            item.on_throttle(event)
+
+    def on_circuit_state(self, group: str, old: str, new: str) -> None:
+        for item in self.instrumentations:
+            item.on_circuit_state(group, old, new)
+
+
+def request_event(method: str, url: str, base_url: str) -> RequestEvent:
+    """
+    Build the event for a request to ``url``.
+
+    :param method: HTTP method.
+    :param url: Absolute request URL.
+    :param base_url: Base URL of the client.
+    :return: The event, labelled with the endpoint group of the path.
+    """
+    return RequestEvent(method, url, endpoint_group(url[len(base_url) :]))
+
+
+def _status_label(event: ResponseEvent) -> str:
+    if event.status_code is not None:
+        return str(event.status_code)
+    return type(event.error).__name__
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+
+class MetricsCollector(Instrumentation):
+    """
+    In-memory request metrics per method and endpoint group.
+
+    Collects a latency histogram, request counts by status code (or exception
+    name for requests that raised), retries, 429 responses and circuit breaker
+    transitions. :meth:`render_prometheus` renders them in the Prometheus text
+    exposition format, for serving from a ``/metrics`` endpoint.
+    """
+
+    def __init__(
+        self, buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = "momo_psb"
+    ):
+        """
+        Initialize the MetricsCollector.
+
+        :param buckets: Upper bounds of the latency histogram buckets, in seconds.
+        :param namespace: Prefix of the exported metric names.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self._latency: Dict[Tuple[str, str], _Histogram] = {}
+        self._requests: Dict[Tuple[str, str, str], int] = {}
+        self._retries: Dict[Tuple[str, str], int] = {}
+        self._throttled: Dict[Tuple[str, str], int] = {}
+        self._transitions: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def on_response(self, event: ResponseEvent, context: Any) -> None:
+        request = event.request
+        key = (request.method, request.endpoint)
+        status = _status_label(event)
+        index = bisect_left(self.buckets, event.elapsed)
+        with self._lock:
+            histogram = self._latency.get(key)
+            if histogram is None:
+                histogram = self._latency[key] = _Histogram(len(self.buckets) + 1)
+            histogram.counts[index] += 1
+            histogram.total += event.elapsed
+            histogram.count += 1
+            status_key = key + (status,)
+            self._requests[status_key] = self._requests.get(status_key, 0) + 1
+
+    def on_retry(self, event: RetryEvent) -> None:
+        key = (event.method, event.endpoint)
+        with self._lock:
+            self._retries[key] = self._retries.get(key, 0) + 1
+
+    def on_throttle(self, event: ThrottleEvent) -> None:
+        key = (event.method, event.endpoint)
+        with self._lock:
+            self._throttled[key] = self._throttled.get(key, 0) + 1
+
+    def on_circuit_state(self, group: str, old: str, new: str) -> None:
+        key = (group, new)
+        with self._lock:
+            self._transitions[key] = self._transitions.get(key, 0) + 1
+
+    def reset(self) -> None:
+        """
+        Clear every collected metric.
+        """
+        with self._lock:
+            self._latency.clear()
+            self._requests.clear()
+            self._retries.clear()
+            self._throttled.clear()
+            self._transitions.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Copy the current metrics.
+
+        :return: Request counts, retries, throttles and circuit transitions keyed
+            by label tuples, and latency histograms as cumulative bucket counts.
+        """
+        with self._lock:
+            latency = {}
+            for key, histogram in self._latency.items():
+                cumulative, running = [], 0
+                for count in histogram.counts:
+                    running += count
+                    cumulative.append(running)
+                latency[key] = {
+                    "buckets": dict(zip(self.buckets + (float("inf"),), cumulative)),
+                    "sum": histogram.total,
+                    "count": histogram.count,
+                }
+            return {
+                "requests": dict(self._requests),
+                "latency": latency,
+                "retries": dict(self._retries),
+                "throttled": dict(self._throttled),
+                "circuit_transitions": dict(self._transitions),
+            }
+
+    def render_prometheus(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format (0.0.4).
+
+        :return: The exposition text.
+        """
+        snapshot = self.snapshot()
+        prefix = self.namespace
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> str:
+            full_name = f"{prefix}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            return full_name
+
+        name = family("requests_total", "counter", "Requests sent to the gateway.")
+        for (method, endpoint, status), value in sorted(snapshot["requests"].items()):
+            labels = _labels(method=method, endpoint=endpoint, status=status)
+            lines.append(f"{name}{labels} {value}")
+
+        name = family(
+            "request_duration_seconds", "histogram", "Gateway request latency."
+        )
+        for (method, endpoint), histogram in sorted(snapshot["latency"].items()):
+            for bound, value in histogram["buckets"].items():
+                labels = _labels(method=method, endpoint=endpoint, le=_bound(bound))
+                lines.append(f"{name}_bucket{labels} {value}")
+            labels = _labels(method=method, endpoint=endpoint)
+            lines.append(f"{name}_sum{labels} {_number(histogram['sum'])}")
+            lines.append(f"{name}_count{labels} {histogram['count']}")
+
+        name = family("retries_total", "counter", "Retried gateway requests.")
+        for (method, endpoint), value in sorted(snapshot["retries"].items()):
+            lines.append(f"{name}{_labels(method=method, endpoint=endpoint)} {value}")
+
+        name = family("throttled_total", "counter", "429 responses from the gateway.")
+        for (method, endpoint), value in sorted(snapshot["throttled"].items()):
+            lines.append(f"{name}{_labels(method=method, endpoint=endpoint)} {value}")
+
+        name = family(
+            "circuit_transitions_total", "counter", "Circuit breaker transitions."
+        )
+        for (group, state), value in sorted(snapshot["circuit_transitions"].items()):
+            lines.append(f"{name}{_labels(endpoint=group, state=state)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else _number(bound)
+
+
+def _number(value: float) -> str:
+    return repr(float(value))
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    Records every gateway request as an OpenTelemetry client span.
+
+    Spans are children of the span current when the request is made, and
+    retries and throttling are added to that span as events. Requires the
+    ``opentelemetry-api`` package (``pip install momo-psb[otel]``).
+    """
+
+    def __init__(self, tracer: Any = None):
+        """
+        Initialize the OpenTelemetryInstrumentation.
+
+        :param tracer: Tracer to create spans with; defaults to the tracer of the
+            global tracer provider.
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError as exc:
+            raise ImportError(
+                "OpenTelemetryInstrumentation requires opentelemetry-api. "
+                "Install it with `pip install momo-psb[otel]`."
+            ) from exc
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("momo_psb")
+
+    def on_request(self, event: RequestEvent) -> Any:
+        # The full URL carries reference IDs and payer MSISDNs; only the route
+        # template is exported.
+        return self.tracer.start_span(
+            f"{event.method} {event.endpoint}",
+            kind=self._trace.SpanKind.CLIENT,
+            attributes={
+                "http.request.method": event.method,
+                "url.template": route_template(urlsplit(event.url).path),
+                "momo.endpoint": event.endpoint,
+            },
+        )
+
+    def on_response(self, event: ResponseEvent, context: Any) -> None:
+        span = context
+        if event.status_code is not None:
+            span.set_attribute("http.response.status_code", event.status_code)
+            if event.status_code >= 500:
+                span.set_status(self._trace.StatusCode.ERROR)
+        if event.error is not None:
+            span.record_exception(event.error)
+            span.set_attribute("error.type", type(event.error).__name__)
+            span.set_status(self._trace.StatusCode.ERROR, str(event.error))
+        span.end()
+
+    def on_retry(self, event: RetryEvent) -> None:
+        attributes: Dict[str, Any] = {
+            "momo.endpoint": event.endpoint,
+            "momo.attempt": event.attempt,
+            "momo.retry_delay": event.delay,
+        }
+        if event.status_code is not None:
+            attributes["http.response.status_code"] = event.status_code
+        if event.error is not None:
+            attributes["error.type"] = type(event.error).__name__
+        self._trace.get_current_span().add_event("momo.retry", attributes)
+
+    def on_throttle(self, event: ThrottleEvent) -> None:
+        attributes: Dict[str, Any] = {"momo.endpoint": event.endpoint}
+        if event.retry_after is not None:
+            attributes["momo.retry_after"] = event.retry_after
+        self._trace.get_current_span().add_event("momo.throttled", attributes)
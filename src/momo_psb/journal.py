@@ -0,0 +1,326 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Mapping, Optional, Sequence, Tuple
+
+from .polling import TERMINAL_STATUSES
+
+SUBMITTING = "SUBMITTING"
+"""The request is about to be sent; its outcome is not known yet."""
+SUBMITTED = "SUBMITTED"
+"""The gateway accepted the request (2xx) or already had it (409)."""
+DECLINED = "DECLINED"
+"""The gateway refused the request (4xx other than 409); no transaction was created."""
+UNKNOWN = "UNKNOWN"
+"""The request failed ambiguously (5xx or a network error); check its status."""
+
+FINAL_STATES = frozenset(TERMINAL_STATUSES | {DECLINED})
+"""States after which a transaction needs no further attention."""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    reference_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    target_environment TEXT NOT NULL,
+    external_id TEXT,
+    amount TEXT,
+    currency TEXT,
+    state TEXT NOT NULL,
+    status_code INTEGER,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_state ON transactions (state, updated_at);
+CREATE INDEX IF NOT EXISTS transactions_external_id ON transactions (external_id);
+"""
+
+# A resubmitted reference ID keeps the state its transaction already reached;
+# only an answer to a submission whose outcome is still open moves it on.
+_BEGIN = """
+INSERT INTO transactions (
+    reference_id, kind, target_environment, external_id, amount, currency,
+    state, created_at, updated_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (reference_id) DO NOTHING
+"""
+_FINISH = f"""
+UPDATE transactions SET state = ?, status_code = ?, error = ?, updated_at = ?
+WHERE reference_id = ? AND state IN ('{SUBMITTING}', '{UNKNOWN}')
+"""
+_STATUS = "UPDATE transactions SET state = ?, updated_at = ? WHERE reference_id = ?"
+_COLUMNS = (
+    "reference_id, kind, target_environment, external_id, amount, currency, "
+    "state, status_code, error, created_at, updated_at"
+)
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    """
+    One outbound transaction recorded in the journal.
+    """
+
+    reference_id: str
+    kind: str
+    target_environment: str
+    external_id: Optional[str]
+    amount: Optional[str]
+    currency: Optional[str]
+    state: str
+    status_code: Optional[int]
+    error: Optional[str]
+    created_at: float
+    updated_at: float
+
+
+def _summarize(payload: Mapping[str, Any]) -> Tuple[Any, Any, Any]:
+    """
+    Pick the external ID, amount and currency out of any write request body.
+    """
+    money = payload.get("money") or {}
+    external_id = payload.get("externalId") or payload.get("externalTransactionId")
+    amount = payload.get("amount", money.get("amount"))
+    currency = (
+        payload.get("currency") or money.get("currency") or payload.get("payerCurrency")
+    )
+    return external_id, None if amount is None else str(amount), currency
+
+
+def state_for(status_code: Optional[int]) -> str:
+    """
+    Journal state of a write request that returned ``status_code``.
+
+    :param status_code: HTTP status code, or None when the request raised.
+    :return: The state.
+    """
+    if status_code is None or status_code >= 500:
+        return UNKNOWN
+    # 409: the reference ID is taken, so an earlier submission created it.
+    if 200 <= status_code < 300 or status_code == 409:
+        return SUBMITTED
+    return DECLINED
+
+
+class TransactionJournal:
+    """
+    A local SQLite record of every transaction the clients create.
+
+    Pass a journal to a client and each write call (request to pay, request to
+    withdraw, invoice, pre-approval, payment) is recorded as ``SUBMITTING``
+    before it is sent. The journal then moves it to ``SUBMITTED``, ``DECLINED`` or
+    ``UNKNOWN`` once the gateway answers. Resubmitting a recorded reference ID
+    never sets its transaction back. Final gateway statuses can be recorded
+    with :meth:`record_status` (for example from a
+    :class:`momo_psb.polling.StatusPoller` ``on_result`` callback). After a crash,
+    :meth:`pending` lists the transactions whose outcome still has to be checked,
+    without asking the gateway.
+
+    The database runs in WAL mode. Writes are buffered and committed in batches
+    of ``batch_size``, or ``flush_interval`` seconds after the first buffered
+    write, so high-volume workers do not pay for a commit per call. A crash can
+    lose at most the buffered writes; use ``batch_size=1`` to commit every write.
+    Reads flush the buffer first.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the TransactionJournal.
+
+        :param path: SQLite database file, created when missing.
+        :param batch_size: Buffered writes that trigger a commit.
+        :param flush_interval: Maximum seconds a write stays buffered.
+        :param clock: Wall clock used for the timestamps.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._buffer: List[Tuple[str, Sequence[Any]]] = []
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self) -> "TransactionJournal":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _write(self, statement: str, params: Sequence[Any]) -> None:
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("The journal is closed.")
+            self._buffer.append((statement, params))
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._closed or not self._buffer:
+            return
+        buffer, self._buffer = self._buffer, []
+        connection = self._connection
+        connection.execute("BEGIN")
+        try:
+            for statement, params in buffer:
+                connection.execute(statement, params)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def flush(self) -> None:
+        """
+        Commit every buffered write.
+        """
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """
+        Commit buffered writes and close the database. Later writes raise
+        :class:`sqlite3.ProgrammingError`.
+        """
+        with self._lock:
+            self._flush_locked()
+            self._closed = True
+            self._connection.close()
+
+    def begin(
+        self,
+        kind: str,
+        reference_id: str,
+        payload: Mapping[str, Any],
+        target_environment: str = "sandbox",
+    ) -> None:
+        """
+        Record a transaction that is about to be submitted.
+
+        :param kind: Transaction kind, a key of :data:`momo_psb.polling.STATUS_METHODS`.
+        :param reference_id: X-Reference-Id of the transaction.
+        :param payload: Request body of the write call.
+        :param target_environment: The target environment.
+        """
+        external_id, amount, currency = _summarize(payload)
+        now = self.clock()
+        self._write(
+            _BEGIN,
+            (
+                reference_id,
+                kind,
+                target_environment,
+                external_id,
+                amount,
+                currency,
+                SUBMITTING,
+                now,
+                now,
+            ),
+        )
+
+    def finish(
+        self,
+        reference_id: str,
+        status_code: Optional[int] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Record the gateway's answer to a submitted transaction.
+
+        :param reference_id: X-Reference-Id of the transaction.
+        :param status_code: HTTP status code of the response.
+        :param error: Exception raised instead of a response.
+        """
+        message = None if error is None else f"{type(error).__name__}: {error}"
+        self._write(
+            _FINISH,
+            (state_for(status_code), status_code, message, self.clock(), reference_id),
+        )
+
+    def record_status(self, reference_id: str, status: str) -> None:
+        """
+        Record the status the gateway reports for a transaction, e.g. "SUCCESSFUL".
+
+        :param reference_id: X-Reference-Id of the transaction.
+        :param status: Gateway status.
+        """
+        self._write(_STATUS, (status, self.clock(), reference_id))
+
+    def record_result(self, result: Any) -> None:
+        """
+        Record a :class:`momo_psb.polling.PollResult`; usable as ``on_result``.
+
+        :param result: Final polling result.
+        """
+        if result.status is not None:
+            self.record_status(result.reference_id, result.status)
+
+    def get(self, reference_id: str) -> Optional[JournalEntry]:
+        """
+        Look up one transaction.
+
+        :param reference_id: X-Reference-Id of the transaction.
+        :return: The entry, or None when it was never recorded.
+        """
+        with self._lock:
+            self._flush_locked()
+            row = self._connection.execute(
+                f"SELECT {_COLUMNS} FROM transactions WHERE reference_id = ?",
+                (reference_id,),
+            ).fetchone()
+        return None if row is None else JournalEntry(*row)
+
+    def pending(
+        self,
+        kind: Optional[str] = None,
+        older_than: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[JournalEntry]:
+        """
+        List transactions that have not reached a final state, oldest first.
+
+        :param kind: Only transactions of this kind.
+        :param older_than: Only transactions not updated for this many seconds.
+        :param limit: Maximum number of entries.
+        :return: The entries.
+        """
+        final = sorted(FINAL_STATES)
+        query = (
+            f"SELECT {_COLUMNS} FROM transactions "
+            f"WHERE state NOT IN ({', '.join('?' * len(final))})"
+        )
+        params: List[Any] = list(final)
+        if kind is not None:
+            query += " AND kind = ?"
+            params.append(kind)
+        if older_than is not None:
+            query += " AND updated_at <= ?"
+            params.append(self.clock() - older_than)
+        query += " ORDER BY updated_at"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            self._flush_locked()
+            rows = self._connection.execute(query, params).fetchall()
+        return [JournalEntry(*row) for row in rows]
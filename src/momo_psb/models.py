@@ -0,0 +1,231 @@
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from .codec import get_codec
+
+T = TypeVar("T")
+M = TypeVar("M", bound="Model")
+
+RawBody = Union[bytes, str, Mapping[str, Any]]
+
+
+class Field(Generic[T]):
+    """
+    Typed, read-only attribute backed by one key of a model's JSON body.
+    """
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: str):
+        """
+        Initialize the Field.
+
+        :param key: JSON key holding the value.
+        """
+        self.key = key
+
+    def __get__(self, instance: Optional["Model"], owner: type) -> Optional[T]:
+        if instance is None:
+            return self  # type: ignore[return-value]
+        return instance._parsed().get(self.key)
+
+
+class Model(Mapping[str, Any]):
+    """
+    Immutable gateway result that keeps the raw response body and parses it on
+    first access.
+
+    Models are read-only mappings, so code written against the parsed
+    dictionaries keeps working (``result["status"]``, ``result.get("reason")``),
+    while typed attributes (``result.status``) give editors and type checkers
+    something to work with. Until a field is read a model holds only the raw
+    bytes, and once parsed the bytes are released, so results that are stored
+    but never inspected cost neither parse time nor a dictionary graph.
+    """
+
+    __slots__ = ("_raw", "_data")
+
+    def __init__(self, raw: RawBody = b""):
+        """
+        Initialize the Model.
+
+        :param raw: Raw JSON body, or an already parsed mapping.
+        """
+        if isinstance(raw, Mapping):
+            object.__setattr__(self, "_raw", None)
+            object.__setattr__(self, "_data", raw)
+        else:
+            object.__setattr__(self, "_raw", raw)
+            object.__setattr__(self, "_data", None)
+
+    @classmethod
+    def from_response(cls: Type[M], response: Any) -> M:
+        """
+        Wrap the body of a requests or httpx response without parsing it.
+
+        :param response: The response object.
+        :return: The model.
+        """
+        return cls(response.content)
+
+    def _parsed(self) -> Mapping[str, Any]:
+        # Read the raw body before the parsed data: a concurrent parse stores the
+        # data before it clears the body, so one of the two is always visible.
+        raw = self._raw
+        data = self._data
+        if data is None:
+            data = get_codec().loads(raw) if raw else {}
+            object.__setattr__(self, "_data", data)
+            object.__setattr__(self, "_raw", None)
+        return data
+
+    @property
+    def parsed(self) -> bool:
+        """
+        Whether the body has been parsed yet.
+        """
+        return self._data is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Copy the parsed body into a plain dictionary.
+
+        :return: The response body.
+        """
+        return dict(self._parsed())
+
+    def __getitem__(self, key: str) -> Any:
+        return self._parsed()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._parsed())
+
+    def __len__(self) -> int:
+        return len(self._parsed())
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return type(self), (self.to_dict(),)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class TransactionStatus(Model):
+    """
+    Status of a request to pay, request to withdraw, payment, transfer, deposit
+    or refund.
+    """
+
+    __slots__ = ()
+
+    reference_id = Field[str]("referenceId")
+    status = Field[str]("status")
+    amount = Field[str]("amount")
+    currency = Field[str]("currency")
+    financial_transaction_id = Field[str]("financialTransactionId")
+    external_id = Field[str]("externalId")
+    payer = Field[Dict[str, str]]("payer")
+    payee = Field[Dict[str, str]]("payee")
+    payer_message = Field[str]("payerMessage")
+    payee_note = Field[str]("payeeNote")
+    reason = Field[Any]("reason")
+
+
+class Balance(Model):
+    """
+    Account balance.
+    """
+
+    __slots__ = ()
+
+    available_balance = Field[str]("availableBalance")
+    currency = Field[str]("currency")
+
+
+class Invoice(Model):
+    """
+    Status of an invoice.
+    """
+
+    __slots__ = ()
+
+    reference_id = Field[str]("referenceId")
+    external_id = Field[str]("externalId")
+    status = Field[str]("status")
+    amount = Field[str]("amount")
+    currency = Field[str]("currency")
+    payment_reference = Field[str]("paymentReference")
+    invoice_id = Field[str]("invoiceId")
+    expiry_date_time = Field[str]("expiryDateTime")
+    intended_payer = Field[Dict[str, str]]("intendedPayer")
+    description = Field[str]("description")
+    error_reason = Field[Any]("errorReason")
+
+
+class PreApproval(Model):
+    """
+    Status of a pre-approval, or one entry of the approved pre-approvals list.
+    """
+
+    __slots__ = ()
+
+    pre_approval_id = Field[str]("preApprovalId")
+    status = Field[str]("status")
+    payer = Field[Dict[str, str]]("payer")
+    payer_currency = Field[str]("payerCurrency")
+    payer_message = Field[str]("payerMessage")
+    expiration_date_time = Field[str]("expirationDateTime")
+    frequency = Field[str]("frequency")
+    reason = Field[Any]("reason")
+
+
+class BasicUserInfo(Model):
+    """
+    Basic information about an account holder.
+    """
+
+    __slots__ = ()
+
+    given_name = Field[str]("given_name")
+    family_name = Field[str]("family_name")
+    birthdate = Field[str]("birthdate")
+    locale = Field[str]("locale")
+    gender = Field[str]("gender")
+    status = Field[str]("status")
+
+
+class AccountHolderStatus(Model):
+    """
+    Result of an account holder validation.
+    """
+
+    __slots__ = ()
+
+    result = Field[bool]("result")
+
+
+def parse_list(model: Type[M], raw: Union[bytes, str]) -> List[M]:
+    """
+    Parse a JSON array body into a list of models.
+
+    :param model: Model class of the items.
+    :param raw: Raw JSON body.
+    :return: One model per array item.
+    """
+    return [model(item) for item in (get_codec().loads(raw) if raw else [])]
@@ -0,0 +1,435 @@
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .bulk import map_bounded
+
+TERMINAL_STATUSES: FrozenSet[str] = frozenset(
+    {"SUCCESSFUL", "FAILED", "REJECTED", "EXPIRED"}
+)
+
+STATUS_METHODS: Dict[str, str] = {
+    "request_to_pay": "get_request_to_pay_status",
+    "request_to_withdraw": "get_request_to_withdraw_status",
+    "invoice": "get_invoice_status",
+    "pre_approval": "get_pre_approval_status",
+    "payment": "get_payment_status",
+    "transfer": "get_transfer_status",
+    "deposit": "get_deposit_status",
+    "refund": "get_refund_status",
+    "remittance_transfer": "get_remittance_transfer_status",
+}
+"""Maps a transaction kind to the client method that fetches its status."""
+
+
+def is_permanent_error(error: BaseException) -> bool:
+    """
+    Check whether a status check failed in a way that retrying cannot fix.
+
+    :param error: Exception raised by a status check.
+    :return: True for a 4xx response error other than 408 and 429, such as a
+        404 for an unknown reference ID or a 401 for a rejected token.
+    """
+    response = getattr(error, "response", None)
+    status_code = getattr(response, "status_code", None)
+    return (
+        status_code is not None
+        and 400 <= status_code < 500
+        and status_code not in (408, 429)
+    )
+
+
+@dataclass(frozen=True)
+class Backoff:
+    """
+    Exponential backoff with jitter between status checks of one transaction.
+
+    :param initial_delay: Seconds before the first status check.
+    :param multiplier: Factor applied to the delay after every non-terminal check.
+    :param max_delay: Upper bound for the delay between checks.
+    :param jitter: Fraction of the delay randomised in both directions, so
+        transactions submitted together do not poll in lockstep.
+    """
+
+    initial_delay: float = 1.0
+    multiplier: float = 2.0
+    max_delay: float = 30.0
+    jitter: float = 0.2
+
+    def delay(self, attempt: int, rng: Callable[[], float] = random.random) -> float:
+        """
+        Compute the delay before the next check.
+
+        :param attempt: Number of checks already made for the transaction.
+        :param rng: Source of uniform random numbers in [0, 1).
+        :return: Delay in seconds.
+        """
+        base = min(self.max_delay, self.initial_delay * self.multiplier**attempt)
+        return base * (1 + self.jitter * (2 * rng() - 1))
+
+
+@dataclass
+class PollResult:
+    """
+    Final outcome of a tracked transaction.
+
+    :param kind: Transaction kind, a key of :data:`STATUS_METHODS`.
+    :param reference_id: X-Reference-Id of the transaction.
+    :param status: Last status reported by the gateway, if any.
+    :param data: Last status response body.
+    :param attempts: Number of status requests made.
+    :param error: Last error raised while checking the status, if any. A
+        transaction is given up on at once when the error is permanent (see
+        :func:`is_permanent_error`); other errors are retried on the backoff
+        schedule.
+    :param timed_out: True when the transaction was still not terminal at its
+        deadline.
+    """
+
+    kind: str
+    reference_id: str
+    status: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+    attempts: int = 0
+    error: Optional[BaseException] = None
+    timed_out: bool = False
+
+
+@dataclass(order=True)
+class _Tracked:
+    due: float
+    seq: int
+    kind: str = field(compare=False)
+    reference_id: str = field(compare=False)
+    target_environment: str = field(compare=False)
+    deadline: Optional[float] = field(compare=False)
+    result: PollResult = field(compare=False)
+
+
+class _Schedule:
+    """
+    Min-heap of tracked transactions ordered by their next due time.
+    """
+
+    def __init__(
+        self,
+        backoff: Backoff,
+        terminal_statuses: FrozenSet[str],
+        timeout: Optional[float],
+        clock: Callable[[], float],
+        rng: Callable[[], float],
+    ):
+        self.backoff = backoff
+        self.terminal_statuses = terminal_statuses
+        self.timeout = timeout
+        self.clock = clock
+        self.rng = rng
+        self._heap: List[_Tracked] = []
+        self._tracked: set = set()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def add(
+        self,
+        kind: str,
+        reference_id: str,
+        target_environment: str,
+        timeout: Optional[float],
+    ) -> None:
+        if kind not in STATUS_METHODS:
+            raise ValueError(f"Unknown transaction kind: {kind!r}")
+        now = self.clock()
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            if (kind, reference_id) in self._tracked:
+                return
+            self._tracked.add((kind, reference_id))
+            heapq.heappush(
+                self._heap,
+                _Tracked(
+                    due=now + self.backoff.delay(0, self.rng),
+                    seq=next(self._seq),
+                    kind=kind,
+                    reference_id=reference_id,
+                    target_environment=target_environment,
+                    deadline=None if timeout is None else now + timeout,
+                    result=PollResult(kind, reference_id),
+                ),
+            )
+
+    def pop_due(self) -> List[_Tracked]:
+        now = self.clock()
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0].due <= now:
+                due.append(heapq.heappop(self._heap))
+        return due
+
+    def seconds_until_next(self) -> Optional[float]:
+        with self._lock:
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0].due - self.clock())
+
+    def settle(
+        self,
+        tracked: _Tracked,
+        data: Optional[Dict[str, Any]],
+        error: Optional[BaseException],
+    ) -> Optional[PollResult]:
+        """
+        Record one status check and either finish or reschedule the transaction.
+
+        :return: The final result when the transaction is finished, else None.
+        """
+        result = tracked.result
+        result.attempts += 1
+        result.error = error
+        if data is not None:
+            result.data = data
+            result.status = data.get("status")
+        now = self.clock()
+        if result.status in self.terminal_statuses:
+            return self._finish(tracked)
+        if error is not None and is_permanent_error(error):
+            return self._finish(tracked)
+        if tracked.deadline is not None and now >= tracked.deadline:
+            result.timed_out = True
+            return self._finish(tracked)
+        tracked.due = now + self.backoff.delay(result.attempts, self.rng)
+        if tracked.deadline is not None:
+            tracked.due = min(tracked.due, tracked.deadline)
+        with self._lock:
+            heapq.heappush(self._heap, tracked)
+        return None
+
+    def _finish(self, tracked: _Tracked) -> PollResult:
+        with self._lock:
+            self._tracked.discard((tracked.kind, tracked.reference_id))
+        return tracked.result
+
+
+class StatusPoller:
+    """
+    Poll the status of many transactions until each reaches a terminal state.
+
+    Every transaction is checked on its own exponential backoff schedule with
+    jitter, so long-pending transactions cost fewer requests over time. Final
+    results are streamed from :meth:`results` and optionally passed to
+    ``on_result``.
+    """
+
+    def __init__(
+        self,
+        api: Any,
+        backoff: Optional[Backoff] = None,
+        terminal_statuses: Iterable[str] = TERMINAL_STATUSES,
+        timeout: Optional[float] = None,
+        concurrency: int = 10,
+        access_token: Optional[str] = None,
+        on_result: Optional[Callable[[PollResult], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+    ):
+        """
+        Initialize the StatusPoller.
+
+        :param api: A :class:`momo_psb.api.MoMoPSBAPI` instance.
+        :param backoff: Backoff policy between checks of one transaction.
+        :param terminal_statuses: Statuses that end polling for a transaction.
+        :param timeout: Default seconds after which a transaction stops being polled.
+        :param concurrency: Maximum number of status requests in flight.
+        :param access_token: Bearer token; the client's managed token when None.
+        :param on_result: Callback invoked with every final :class:`PollResult`.
+        """
+        self.api = api
+        self.concurrency = concurrency
+        self.access_token = access_token
+        self.on_result = on_result
+        self.sleep = sleep
+        self._schedule = _Schedule(
+            backoff or Backoff(), frozenset(terminal_statuses), timeout, clock, rng
+        )
+
+    def __len__(self) -> int:
+        return len(self._schedule)
+
+    def track(
+        self,
+        kind: str,
+        reference_id: str,
+        target_environment: str = "sandbox",
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Start tracking a transaction. Tracking the same transaction twice is a no-op.
+
+        :param kind: Transaction kind, a key of :data:`STATUS_METHODS`.
+        :param reference_id: X-Reference-Id of the transaction.
+        :param target_environment: The target environment (default is "sandbox").
+        :param timeout: Seconds after which to stop polling this transaction.
+        """
+        self._schedule.add(kind, reference_id, target_environment, timeout)
+
+    def _check(self, tracked: _Tracked) -> Dict[str, Any]:
+        method = getattr(self.api, STATUS_METHODS[tracked.kind])
+        return method(
+            tracked.reference_id, self.access_token, tracked.target_environment
+        )
+
+    def results(self) -> Iterator[PollResult]:
+        """
+        Poll until every tracked transaction is finished, yielding final results
+        as they become available.
+
+        :return: Iterator of :class:`PollResult`.
+        """
+        while True:
+            wait_for = self._schedule.seconds_until_next()
+            if wait_for is None:
+                return
+            if wait_for > 0:
+                self.sleep(wait_for)
+            due = self._schedule.pop_due()
+            for _, tracked, data, error in map_bounded(
+                self._check, due, self.concurrency
+            ):
+                result = self._schedule.settle(tracked, data, error)
+                if result is not None:
+                    if self.on_result is not None:
+                        self.on_result(result)
+                    yield result
+
+    def run(self) -> Dict[Tuple[str, str], PollResult]:
+        """
+        Poll until every tracked transaction is finished.
+
+        :return: Final results keyed by ``(kind, reference_id)``.
+        """
+        return {(r.kind, r.reference_id): r for r in self.results()}
+
+
+class AsyncStatusPoller:
+    """
+    Asyncio counterpart of :class:`StatusPoller` for
+    :class:`momo_psb.async_api.AsyncMoMoPSBAPI`.
+    """
+
+    def __init__(
+        self,
+        api: Any,
+        backoff: Optional[Backoff] = None,
+        terminal_statuses: Iterable[str] = TERMINAL_STATUSES,
+        timeout: Optional[float] = None,
+        concurrency: int = 100,
+        access_token: Optional[str] = None,
+        on_result: Optional[Callable[[PollResult], Any]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ):
+        """
+        Initialize the AsyncStatusPoller.
+
+        :param api: A :class:`momo_psb.async_api.AsyncMoMoPSBAPI` instance.
+        :param backoff: Backoff policy between checks of one transaction.
+        :param terminal_statuses: Statuses that end polling for a transaction.
+        :param timeout: Default seconds after which a transaction stops being polled.
+        :param concurrency: Maximum number of status requests in flight.
+        :param access_token: Bearer token; the client's managed token when None.
+        :param on_result: Callback (plain or coroutine function) invoked with every
+            final :class:`PollResult`.
+        """
+        self.api = api
+        self.access_token = access_token
+        self.on_result = on_result
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._schedule = _Schedule(
+            backoff or Backoff(), frozenset(terminal_statuses), timeout, clock, rng
+        )
+
+    def __len__(self) -> int:
+        return len(self._schedule)
+
+    def track(
+        self,
+        kind: str,
+        reference_id: str,
+        target_environment: str = "sandbox",
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Start tracking a transaction. Tracking the same transaction twice is a no-op.
+
+        :param kind: Transaction kind, a key of :data:`STATUS_METHODS`.
+        :param reference_id: X-Reference-Id of the transaction.
+        :param target_environment: The target environment (default is "sandbox").
+        :param timeout: Seconds after which to stop polling this transaction.
+        """
+        self._schedule.add(kind, reference_id, target_environment, timeout)
+
+    async def _check(
+        self, tracked: _Tracked
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[BaseException]]:
+        method = getattr(self.api, STATUS_METHODS[tracked.kind])
+        async with self._semaphore:
+            try:
+                data = await method(
+                    tracked.reference_id,
+                    self.access_token,
+                    tracked.target_environment,
+                )
+            except Exception as exc:
+                return None, exc
+        return data, None
+
+    async def results(self) -> AsyncIterator[PollResult]:
+        """
+        Poll until every tracked transaction is finished, yielding final results
+        as they become available.
+
+        :return: Async iterator of :class:`PollResult`.
+        """
+        while True:
+            wait_for = self._schedule.seconds_until_next()
+            if wait_for is None:
+                return
+            if wait_for > 0:
+                await asyncio.sleep(wait_for)
+            due = self._schedule.pop_due()
+            outcomes = await asyncio.gather(*(self._check(t) for t in due))
+            for tracked, (data, error) in zip(due, outcomes):
+                result = self._schedule.settle(tracked, data, error)
+                if result is not None:
+                    if self.on_result is not None:
+                        outcome = self.on_result(result)
+                        if asyncio.iscoroutine(outcome):
+                            await outcome
+                    yield result
+
+    async def run(self) -> Dict[Tuple[str, str], PollResult]:
+        """
+        Poll until every tracked transaction is finished.
+
+        :return: Final results keyed by ``(kind, reference_id)``.
+        """
+        return {(r.kind, r.reference_id): r async for r in self.results()}
@@ -0,0 +1,193 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from ._endpoints import endpoint_family
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket that can be awaited from asyncio code.
+
+    Callers reserve tokens under a short lock and then sleep outside it, so
+    waiting threads and tasks are served in arrival order and the bucket is
+    drained at exactly ``rate`` requests per second under sustained load.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the TokenBucket.
+
+        :param rate: Tokens added per second.
+        :param capacity: Maximum burst size; defaults to one second of tokens.
+        :param clock: Monotonic clock.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, going into debt if necessary.
+
+        :param tokens: Number of tokens to take.
+        :return: Seconds the caller must wait before proceeding.
+        """
+        with self._lock:
+            self._refill(self.clock())
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Take tokens only if they are available right now.
+
+        :param tokens: Number of tokens to take.
+        :return: True when the tokens were taken.
+        """
+        with self._lock:
+            self._refill(self.clock())
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Block the calling thread until the tokens are available.
+
+        :param tokens: Number of tokens to take.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: float = 1.0) -> None:
+        """
+        Suspend the calling task until the tokens are available.
+
+        :param tokens: Number of tokens to take.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back every caller for ``seconds``, e.g. after the gateway throttled us.
+
+        :param seconds: Time during which no new tokens are handed out.
+        """
+        with self._lock:
+            self._refill(self.clock())
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class RateLimiter:
+    """
+    Client-side rate limits per subscription key and, optionally, per endpoint
+    family such as "collection/v1_0" or "collection/v2_0".
+
+    One limiter can be shared by several clients and threads; buckets are keyed
+    by subscription key so every caller using the same key draws from the same
+    budget.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        per_family: bool = False,
+        family_limits: Optional[Mapping[str, Tuple[float, Optional[float]]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the RateLimiter.
+
+        :param rate: Requests per second allowed per subscription key (and per
+            endpoint family when ``per_family`` is set).
+        :param burst: Maximum burst size; defaults to one second of requests.
+        :param per_family: Give every endpoint family its own bucket.
+        :param family_limits: ``(rate, burst)`` overrides for specific endpoint
+            families; families listed here always get their own bucket.
+        :param clock: Monotonic clock.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.per_family = per_family
+        self.family_limits = dict(family_limits or {})
+        self.clock = clock
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, subscription_key: str, path: str) -> TokenBucket:
+        """
+        Get the bucket that governs a request.
+
+        :param subscription_key: Subscription key the request is sent with.
+        :param path: Request path relative to the base URL.
+        :return: The token bucket.
+        """
+        family = endpoint_family(path)
+        if family in self.family_limits:
+            rate, burst = self.family_limits[family]
+        elif self.per_family:
+            rate, burst = self.rate, self.burst
+        else:
+            family, rate, burst = "", self.rate, self.burst
+        key = (subscription_key, family)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = TokenBucket(rate, burst, self.clock)
+                    self._buckets[key] = bucket
+        return bucket
+
+    def acquire(self, subscription_key: str, path: str) -> None:
+        """
+        Block until a request may be sent.
+
+        :param subscription_key: Subscription key the request is sent with.
+        :param path: Request path relative to the base URL.
+        """
+        self.bucket(subscription_key, path).acquire()
+
+    async def aacquire(self, subscription_key: str, path: str) -> None:
+        """
+        Wait asynchronously until a request may be sent.
+
+        :param subscription_key: Subscription key the request is sent with.
+        :param path: Request path relative to the base URL.
+        """
+        await self.bucket(subscription_key, path).aacquire()
+
+    def throttled(self, subscription_key: str, path: str, delay: float) -> None:
+        """
+        Record that the gateway throttled a request, pausing the matching bucket.
+
+        :param subscription_key: Subscription key the request was sent with.
+        :param path: Request path relative to the base URL.
+        :param delay: Seconds to hold back further requests.
+        """
+        self.bucket(subscription_key, path).pause(delay)
@@ -0,0 +1,315 @@
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .bulk import map_bounded
+from .cache import is_not_found
+from .codec import get_codec
+from .polling import STATUS_METHODS
+
+LEDGER_FIELDS: Dict[str, str] = {
+    "status": "status",
+    "amount": "amount",
+    "currency": "currency",
+    "external_id": "externalId",
+}
+"""Maps optional ledger columns of an input row to the status response key."""
+
+
+@dataclass
+class ReconcileResult:
+    """
+    Gateway status of one ledger row, compared against the row.
+
+    :param index: Position of the row in the input.
+    :param kind: Transaction kind, a key of :data:`momo_psb.polling.STATUS_METHODS`.
+    :param reference_id: X-Reference-Id of the transaction.
+    :param status: Status reported by the gateway; "NOT_FOUND" for unknown
+        transactions and None when the lookup failed.
+    :param data: Status response body.
+    :param mismatches: Ledger columns whose value differs from the gateway.
+    :param error: Error raised by the lookup, if any.
+    """
+
+    index: int
+    kind: str
+    reference_id: str
+    status: Optional[str] = None
+    data: Optional[Mapping[str, Any]] = None
+    mismatches: List[str] = field(default_factory=list)
+    error: Optional[BaseException] = None
+
+    @property
+    def matched(self) -> bool:
+        """
+        True when the gateway knows the transaction and agrees with the ledger.
+        """
+        return self.error is None and not self.mismatches
+
+    def to_record(self) -> Dict[str, Any]:
+        """
+        Describe the result as one line of the JSONL report.
+
+        :return: The record.
+        """
+        data = self.data or {}
+        return {
+            "index": self.index,
+            "kind": self.kind,
+            "reference_id": self.reference_id,
+            "status": self.status,
+            "amount": data.get("amount"),
+            "currency": data.get("currency"),
+            "financial_transaction_id": data.get("financialTransactionId"),
+            "matched": self.matched,
+            "mismatches": self.mismatches,
+            "error": None if self.error is None else str(self.error),
+        }
+
+
+@dataclass
+class ReconcileSummary:
+    """
+    Totals of a reconciliation run, including rows done before a resume.
+
+    :param total: Rows reconciled.
+    :param matched: Rows the gateway agrees with.
+    :param mismatched: Rows that differ from the gateway.
+    :param failed: Rows whose lookup failed, including unknown transactions.
+    :param resumed_at: Index of the first row not covered by the checkpoint the
+        run resumed from, or None for a fresh run.
+    """
+
+    total: int = 0
+    matched: int = 0
+    mismatched: int = 0
+    failed: int = 0
+    resumed_at: Optional[int] = None
+
+
+def _differs(name: str, expected: Any, actual: Any) -> bool:
+    if name == "amount":
+        try:
+            return float(expected) != float(actual)
+        except (TypeError, ValueError):
+            return True
+    return str(expected) != str(actual)
+
+
+def _write_atomic(path: str, data: Mapping[str, Any]) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=".checkpoint")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+class _Progress:
+    """
+    Completed rows, kept as a watermark below which every row is done plus the
+    few rows done above it, since lookups finish out of order.
+    """
+
+    def __init__(self, watermark: int = 0, done: Iterable[int] = ()):
+        self.watermark = watermark
+        self.done: Set[int] = set(done)
+
+    def is_done(self, index: int) -> bool:
+        return index < self.watermark or index in self.done
+
+    def complete(self, index: int) -> None:
+        self.done.add(index)
+        while self.watermark in self.done:
+            self.done.remove(self.watermark)
+            self.watermark += 1
+
+
+class Reconciler:
+    """
+    Re-fetch the gateway status of ledger rows and write a JSONL report.
+
+    Rows are streamed from any iterable, looked up with bounded concurrency and
+    written to the report as each lookup completes. Every ``checkpoint_every``
+    rows the report is flushed to disk and a checkpoint records which rows are
+    done and how long the report is. A run that finds a checkpoint resumes from
+    it: the report is cut back to the checkpointed length and only rows not yet
+    done are looked up, so a crash costs at most ``checkpoint_every`` repeated
+    lookups and the report never holds a row twice. The checkpoint is removed
+    when a run completes.
+
+    Input rows need a 'reference_id'. 'kind' and 'environment' default to the
+    reconciler's settings, and the optional ledger columns 'status', 'amount',
+    'currency' and 'external_id' are compared against the gateway.
+    """
+
+    def __init__(
+        self,
+        api: Any,
+        output_path: str,
+        checkpoint_path: Optional[str] = None,
+        kind: str = "request_to_pay",
+        target_environment: str = "sandbox",
+        access_token: Optional[str] = None,
+        concurrency: int = 10,
+        checkpoint_every: int = 100,
+    ):
+        """
+        Initialize the Reconciler.
+
+        :param api: A :class:`momo_psb.api.MoMoPSBAPI` instance.
+        :param output_path: File the JSONL report is written to.
+        :param checkpoint_path: Checkpoint file; defaults to the report path with
+            a ".checkpoint" suffix.
+        :param kind: Transaction kind of rows without a 'kind' column.
+        :param target_environment: Environment of rows without an 'environment'
+            column.
+        :param access_token: Bearer token; the client's managed token when None.
+        :param concurrency: Maximum number of status requests in flight.
+        :param checkpoint_every: Rows written between checkpoints.
+        """
+        if kind not in STATUS_METHODS:
+            raise ValueError(f"Unknown transaction kind: {kind}")
+        self.api = api
+        self.output_path = output_path
+        self.checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+        self.kind = kind
+        self.target_environment = target_environment
+        self.access_token = access_token
+        self.concurrency = concurrency
+        self.checkpoint_every = checkpoint_every
+
+    def _lookup(self, item: Tuple[int, Mapping[str, Any]]) -> Mapping[str, Any]:
+        _, row = item
+        kind = row.get("kind") or self.kind
+        method = getattr(self.api, STATUS_METHODS[kind])
+        return method(
+            row["reference_id"],
+            self.access_token,
+            row.get("environment") or self.target_environment,
+        )
+
+    def _result(
+        self,
+        index: int,
+        row: Mapping[str, Any],
+        data: Optional[Mapping[str, Any]],
+        error: Optional[BaseException],
+    ) -> ReconcileResult:
+        result = ReconcileResult(
+            index, row.get("kind") or self.kind, str(row.get("reference_id"))
+        )
+        if error is not None:
+            result.error = error
+            if is_not_found(error):
+                result.status = "NOT_FOUND"
+            return result
+        result.data = data
+        result.status = data.get("status")
+        for column, key in LEDGER_FIELDS.items():
+            expected = row.get(column)
+            if expected not in (None, "") and _differs(column, expected, data.get(key)):
+                result.mismatches.append(column)
+        return result
+
+    def _load_checkpoint(self, source: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as file:
+                checkpoint = json.load(file)
+        except FileNotFoundError:
+            return None
+        if checkpoint.get("source") != source:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} belongs to "
+                f"{checkpoint.get('source')!r}, not {source!r}"
+            )
+        return checkpoint
+
+    def _save_checkpoint(
+        self, output: Any, source: str, progress: _Progress, summary: ReconcileSummary
+    ) -> None:
+        output.flush()
+        os.fsync(output.fileno())
+        _write_atomic(
+            self.checkpoint_path,
+            {
+                "source": source,
+                "watermark": progress.watermark,
+                "done": sorted(progress.done),
+                "output_offset": output.tell(),
+                "summary": {
+                    "total": summary.total,
+                    "matched": summary.matched,
+                    "mismatched": summary.mismatched,
+                    "failed": summary.failed,
+                },
+            },
+        )
+
+    def run(
+        self, rows: Iterable[Mapping[str, Any]], source: str = ""
+    ) -> ReconcileSummary:
+        """
+        Reconcile every row, resuming from a checkpoint when one exists.
+
+        :param rows: Ledger rows in a stable order; a resumed run must be given
+            the same rows.
+        :param source: Name of the input, checked against the checkpoint so a
+            run does not resume from another input's progress.
+        :return: Totals over the whole input.
+        """
+        checkpoint = self._load_checkpoint(source)
+        if checkpoint is None:
+            progress = _Progress()
+            summary = ReconcileSummary()
+            output = open(self.output_path, "wb")
+        else:
+            progress = _Progress(checkpoint["watermark"], checkpoint["done"])
+            summary = ReconcileSummary(
+                **checkpoint["summary"], resumed_at=progress.watermark
+            )
+            output = open(self.output_path, "r+b")
+            output.truncate(checkpoint["output_offset"])
+            output.seek(checkpoint["output_offset"])
+
+        dumps = get_codec().dumps
+        pending = (
+            (index, row)
+            for index, row in enumerate(rows)
+            if not progress.is_done(index)
+        )
+        since_checkpoint = 0
+        with output:
+            try:
+                for _, (index, row), data, error in map_bounded(
+                    self._lookup, pending, self.concurrency
+                ):
+                    result = self._result(index, row, data, error)
+                    output.write(dumps(result.to_record()) + b"\n")
+                    progress.complete(index)
+                    summary.total += 1
+                    if result.error is not None:
+                        summary.failed += 1
+                    elif result.mismatches:
+                        summary.mismatched += 1
+                    else:
+                        summary.matched += 1
+                    since_checkpoint += 1
+                    if since_checkpoint >= self.checkpoint_every:
+                        self._save_checkpoint(output, source, progress, summary)
+                        since_checkpoint = 0
+            except BaseException:
+                self._save_checkpoint(output, source, progress, summary)
+                raise
+        try:
+            os.unlink(self.checkpoint_path)
+        except FileNotFoundError:
+            pass
+        return summary
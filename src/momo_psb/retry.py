@@ -0,0 +1,106 @@
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, FrozenSet, Mapping, Optional
+
+IDEMPOTENT_METHODS: FrozenSet[str] = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+
+NOT_PROCESSED_STATUSES: FrozenSet[int] = frozenset({429, 503})
+"""Statuses that guarantee the gateway did not act on the request."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value given either in seconds or as an HTTP date.
+
+    :param value: Header value.
+    :return: Non-negative delay in seconds, or None when absent or invalid.
+    """
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return max(0.0, delay)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry transient failures with exponential backoff.
+
+    Write calls are retried with the same X-Reference-Id. After an ambiguous
+    failure (a timeout, a dropped connection or a 5xx other than 503) the
+    transaction's status endpoint is checked first, so a transaction the gateway
+    already accepted is never submitted twice.
+
+    :param max_attempts: Total attempts per call, including the first one.
+    :param backoff_factor: Delay before the second attempt; doubled after that.
+    :param max_backoff: Upper bound for the computed backoff delay.
+    :param jitter: Fraction of the backoff delay randomised in both directions.
+    :param retry_statuses: HTTP status codes worth retrying.
+    :param respect_retry_after: Honour the Retry-After response header.
+    :param max_retry_after: Upper bound for a Retry-After delay.
+    """
+
+    max_attempts: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    jitter: float = 0.1
+    retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    respect_retry_after: bool = True
+    max_retry_after: float = 60.0
+
+    def backoff(self, attempt: int, rng: Callable[[], float] = random.random) -> float:
+        """
+        Compute the backoff delay after a failed attempt.
+
+        :param attempt: Number of the attempt that failed, starting at 1.
+        :param rng: Source of uniform random numbers in [0, 1).
+        :return: Delay in seconds.
+        """
+        base = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        return max(0.0, base * (1 + self.jitter * (2 * rng() - 1)))
+
+    def retry_after(self, headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Parse the Retry-After header, given either in seconds or as an HTTP date.
+
+        :param headers: Response headers.
+        :return: Delay in seconds, or None when the header is absent or invalid.
+        """
+        delay = parse_retry_after(headers.get("Retry-After"))
+        if delay is None:
+            return None
+        return min(delay, self.max_retry_after)
+
+    def delay(self, attempt: int, response: Any = None) -> float:
+        """
+        Compute how long to wait before the next attempt.
+
+        :param attempt: Number of the attempt that failed, starting at 1.
+        :param response: Response of the failed attempt, if one was received.
+        :return: Delay in seconds.
+        """
+        if response is not None and self.respect_retry_after:
+            retry_after = self.retry_after(response.headers)
+            if retry_after is not None:
+                return retry_after
+        return self.backoff(attempt)
+
+    def should_retry(self, method: str, idempotent: Optional[bool] = None) -> bool:
+        """
+        Check whether a call may be retried at all.
+
+        :param method: HTTP method.
+        :param idempotent: Overrides the method-based idempotency check.
+        :return: True when the call may be retried.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        return idempotent and self.max_attempts > 1
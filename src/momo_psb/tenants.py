@@ -0,0 +1,375 @@
+import abc
+import ssl
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generic, List, Mapping, Optional, TypeVar
+
+import requests
+
+from .api import MoMoPSBAPI
+
+ClientT = TypeVar("ClientT")
+
+
+@dataclass(frozen=True)
+class Tenant:
+    """
+    Credentials and settings of one tenant (for example a merchant).
+
+    :param subscription_key: The tenant's subscription key.
+    :param api_user: API User ID used to fetch the tenant's access tokens.
+    :param api_key: API Key used to fetch the tenant's access tokens.
+    :param callback_url: Default callback URL of the tenant's transactions.
+    :param options: Client options overriding the registry's shared ones for
+        this tenant, e.g. a dedicated ``rate_limiter``.
+    """
+
+    subscription_key: str
+    api_user: Optional[str] = None
+    api_key: Optional[str] = None
+    callback_url: Optional[str] = None
+    options: Mapping[str, Any] = field(default_factory=dict)
+
+
+class _Entry(Generic[ClientT]):
+    __slots__ = ("client", "last_used")
+
+    def __init__(self, client: ClientT, last_used: float):
+        self.client = client
+        self.last_used = last_used
+
+
+class _Registry(abc.ABC, Generic[ClientT]):
+    """
+    Per-tenant clients over one shared transport, evicting idle tenants.
+
+    Subclasses build the clients in :meth:`_build`.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_tenants: int,
+        idle_timeout: Optional[float],
+        loader: Optional[Callable[[str], Optional[Tenant]]],
+        clock: Callable[[], float],
+        client_options: Dict[str, Any],
+    ):
+        self.base_url = base_url
+        self.max_tenants = max_tenants
+        self.idle_timeout = idle_timeout
+        self.loader = loader
+        self.clock = clock
+        self.client_options = client_options
+        self._tenants: Dict[str, Tenant] = {}
+        self._clients: "OrderedDict[str, _Entry[ClientT]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __contains__(self, tenant_id: object) -> bool:
+        return tenant_id in self._clients
+
+    @abc.abstractmethod
+    def _build(self, tenant: Tenant) -> ClientT:
+        """
+        Build the client of a tenant.
+        """
+
+    def register(
+        self,
+        tenant_id: str,
+        subscription_key: str,
+        api_user: Optional[str] = None,
+        api_key: Optional[str] = None,
+        callback_url: Optional[str] = None,
+        **options: Any,
+    ) -> None:
+        """
+        Register a tenant, replacing its previous settings and client.
+
+        :param tenant_id: Identifier the tenant's client is looked up by.
+        :param subscription_key: The tenant's subscription key.
+        :param api_user: API User ID used to fetch the tenant's access tokens.
+        :param api_key: API Key used to fetch the tenant's access tokens.
+        :param callback_url: Default callback URL of the tenant's transactions.
+        :param options: Client options overriding the shared ones for this tenant.
+        """
+        tenant = Tenant(subscription_key, api_user, api_key, callback_url, options)
+        with self._lock:
+            self._tenants[tenant_id] = tenant
+            self._clients.pop(tenant_id, None)
+
+    def unregister(self, tenant_id: str) -> None:
+        """
+        Forget a tenant and drop its client.
+
+        :param tenant_id: Identifier of the tenant.
+        """
+        with self._lock:
+            self._tenants.pop(tenant_id, None)
+            self._clients.pop(tenant_id, None)
+
+    def _evict_locked(self, now: float) -> List[str]:
+        evicted = []
+        if self.idle_timeout is not None:
+            # Entries are kept in least recently used order.
+            while self._clients:
+                tenant_id, entry = next(iter(self._clients.items()))
+                if now - entry.last_used < self.idle_timeout:
+                    break
+                del self._clients[tenant_id]
+                evicted.append(tenant_id)
+        while len(self._clients) > self.max_tenants:
+            evicted.append(self._clients.popitem(last=False)[0])
+        return evicted
+
+    def evict_idle(self) -> List[str]:
+        """
+        Drop the clients of tenants idle for longer than ``idle_timeout``.
+
+        :return: Identifiers of the evicted tenants.
+        """
+        with self._lock:
+            return self._evict_locked(self.clock())
+
+    def get(self, tenant_id: str) -> ClientT:
+        """
+        Get the client of a tenant, building it on first use.
+
+        :param tenant_id: Identifier of the tenant.
+        :return: The tenant's client.
+        :raises KeyError: If the tenant is neither registered nor found by the loader.
+        """
+        while True:
+            with self._lock:
+                now = self.clock()
+                entry = self._clients.get(tenant_id)
+                if entry is not None:
+                    entry.last_used = now
+                    self._clients.move_to_end(tenant_id)
+                    self._evict_locked(now)
+                    return entry.client
+                tenant = self._tenants.get(tenant_id)
+            loaded = tenant is None
+            if loaded and self.loader is not None:
+                # The loader may query a database; keep it outside the lock.
+                tenant = self.loader(tenant_id)
+            if tenant is None:
+                raise KeyError(f"Unknown tenant: {tenant_id}")
+            client = self._build(tenant)
+            with self._lock:
+                registered = self._tenants.get(tenant_id)
+                if registered is tenant or (loaded and registered is None):
+                    now = self.clock()
+                    entry = self._clients.setdefault(tenant_id, _Entry(client, now))
+                    entry.last_used = now
+                    self._clients.move_to_end(tenant_id)
+                    self._evict_locked(now)
+                    return entry.client
+            # The tenant was registered again (or removed) while its client was
+            # being built; start over from its current settings.
+
+    def _client_kwargs(self, tenant: Tenant) -> Dict[str, Any]:
+        return {
+            "api_user": tenant.api_user,
+            "api_key": tenant.api_key,
+            "callback_url": tenant.callback_url,
+            **self.client_options,
+            **tenant.options,
+        }
+
+
+class ClientRegistry(_Registry[MoMoPSBAPI]):
+    """
+    Hand out a :class:`MoMoPSBAPI` per tenant, all sharing one pooled session.
+
+    Each tenant's client carries its own subscription key, credentials and token
+    cache, but requests of every tenant go through the registry's session, so
+    connections to the gateway are opened once and reused across tenants.
+    Clients are built on first use and kept in least recently used order. A
+    client is dropped once its tenant has been idle for ``idle_timeout`` seconds
+    or when more than ``max_tenants`` clients are held, so memory stays bounded
+    however many tenants are registered. An evicted tenant's next call builds a
+    fresh client and fetches a new token.
+
+    Rate limits are per tenant when a shared ``rate_limiter`` is passed, since
+    :class:`momo_psb.ratelimit.RateLimiter` keeps its buckets per subscription key.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_tenants: int = 1000,
+        idle_timeout: Optional[float] = 900.0,
+        loader: Optional[Callable[[str], Optional[Tenant]]] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 50,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        http2: bool = False,
+        session: Optional[requests.Session] = None,
+        clock: Callable[[], float] = time.monotonic,
+        **client_options: Any,
+    ):
+        """
+        Initialize the ClientRegistry.
+
+        :param base_url: Base URL for the Wallet Platform API.
+        :param max_tenants: Maximum number of tenant clients kept at once.
+        :param idle_timeout: Seconds after which an unused tenant client is
+            dropped. Clients are only dropped for ``max_tenants`` when None.
+        :param loader: Called with an unregistered tenant ID to look up its
+            :class:`Tenant`; returns None for unknown tenants.
+        :param pool_connections: Number of per-host connection pools to cache.
+        :param pool_maxsize: Maximum number of connections kept open per host,
+            shared by every tenant.
+        :param pool_block: Block when the pool is exhausted instead of opening
+            extra, non-pooled connections.
+        :param keep_alive: Keep connections open between requests.
+        :param ssl_context: SSL context shared by every pooled connection.
+        :param http2: Multiplex every tenant's requests over HTTP/2.
+        :param session: Pre-configured session to use instead of building one.
+            The registry does not close a session it did not create.
+        :param clock: Monotonic clock used to track idleness.
+        :param client_options: Options passed to every :class:`MoMoPSBAPI`, e.g.
+            ``timeout``, ``retry_policy``, ``rate_limiter`` or ``instrumentation``.
+        """
+        super().__init__(
+            base_url, max_tenants, idle_timeout, loader, clock, client_options
+        )
+        self._owns_session = session is None
+        if session is None:
+            session = MoMoPSBAPI._build_session(
+                pool_connections,
+                pool_maxsize,
+                pool_block,
+                keep_alive,
+                ssl_context,
+                http2,
+            )
+        self.session = session
+
+    def _build(self, tenant: Tenant) -> MoMoPSBAPI:
+        return MoMoPSBAPI(
+            self.base_url,
+            tenant.subscription_key,
+            session=self.session,
+            **self._client_kwargs(tenant),
+        )
+
+    def close(self) -> None:
+        """
+        Drop every tenant client and close the shared session.
+        """
+        with self._lock:
+            self._clients.clear()
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self) -> "ClientRegistry":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class AsyncClientRegistry(_Registry[Any]):
+    """
+    Hand out an :class:`momo_psb.async_api.AsyncMoMoPSBAPI` per tenant, all
+    sharing one pooled :class:`httpx.AsyncClient`.
+
+    Behaves like :class:`ClientRegistry`. Requires httpx.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_tenants: int = 1000,
+        idle_timeout: Optional[float] = 900.0,
+        loader: Optional[Callable[[str], Optional[Tenant]]] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        http2: bool = False,
+        client: Any = None,
+        timeout: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        **client_options: Any,
+    ):
+        """
+        Initialize the AsyncClientRegistry.
+
+        :param base_url: Base URL for the Wallet Platform API.
+        :param max_tenants: Maximum number of tenant clients kept at once.
+        :param idle_timeout: Seconds after which an unused tenant client is
+            dropped. Clients are only dropped for ``max_tenants`` when None.
+        :param loader: Called with an unregistered tenant ID to look up its
+            :class:`Tenant`; returns None for unknown tenants.
+        :param max_connections: Maximum number of concurrent connections, shared
+            by every tenant.
+        :param max_keepalive_connections: Maximum number of idle keep-alive
+            connections kept in the pool.
+        :param keepalive_expiry: Seconds an idle keep-alive connection is kept.
+        :param ssl_context: SSL context shared by every pooled connection.
+        :param http2: Multiplex every tenant's requests over HTTP/2.
+        :param client: Pre-configured :class:`httpx.AsyncClient` to use instead of
+            building one. The registry does not close a client it did not create.
+        :param timeout: Seconds to wait for the gateway before giving up on a
+            request. No timeout is applied when None.
+        :param clock: Monotonic clock used to track idleness.
+        :param client_options: Options passed to every client, e.g.
+            ``retry_policy``, ``rate_limiter`` or ``instrumentation``.
+        """
+        import httpx
+
+        from .http2 import require_h2
+
+        super().__init__(
+            base_url, max_tenants, idle_timeout, loader, clock, client_options
+        )
+        self._owns_client = client is None
+        if client is None:
+            if http2:
+                require_h2()
+            client = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+                verify=ssl_context if ssl_context is not None else True,
+                timeout=timeout,
+            )
+        self.client = client
+
+    def _build(self, tenant: Tenant) -> Any:
+        from .async_api import AsyncMoMoPSBAPI
+
+        return AsyncMoMoPSBAPI(
+            self.base_url,
+            tenant.subscription_key,
+            client=self.client,
+            **self._client_kwargs(tenant),
+        )
+
+    async def aclose(self) -> None:
+        """
+        Drop every tenant client and close the shared HTTP client.
+        """
+        with self._lock:
+            self._clients.clear()
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncClientRegistry":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+TokenKey = Tuple[str, str, str]
+"""Cache key for a token: ``(api_user, product, target_environment)``."""
+
+
+@dataclass(frozen=True)
+class OAuthToken:
+    """
+    An OAuth 2.0 access token together with its refresh deadline.
+    """
+
+    access_token: str
+    token_type: str
+    expires_at: float
+    refresh_at: float
+
+    def is_fresh(self, now: float) -> bool:
+        """
+        Check whether the token can still be handed out without refreshing.
+
+        :param now: Current clock reading.
+        :return: True while the token is before its refresh deadline.
+        """
+        return now < self.refresh_at
+
+
+class TokenManager:
+    """
+    Cache OAuth tokens and refresh them ahead of expiry.
+
+    Tokens are cached per ``(api_user, product, target_environment)``. A token is
+    refreshed ``refresh_margin`` seconds before it expires (but never before half
+    of its lifetime has passed), and concurrent callers asking for the same
+    expired token share a single request to the token endpoint.
+    """
+
+    def __init__(
+        self,
+        refresh_margin: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the TokenManager.
+
+        :param refresh_margin: Seconds before expiry at which tokens are refreshed.
+        :param clock: Monotonic clock used to track expiry.
+        """
+        self.refresh_margin = refresh_margin
+        self.clock = clock
+        self._tokens: Dict[TokenKey, OAuthToken] = {}
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[TokenKey, threading.Lock] = {}
+        self._async_fetch_locks: Dict[TokenKey, asyncio.Lock] = {}
+
+    def get_cached(self, key: TokenKey) -> Optional[OAuthToken]:
+        """
+        Get a cached token that does not need refreshing yet.
+
+        :param key: Token cache key.
+        :return: The cached token, or None if it is missing or due for refresh.
+        """
+        token = self._tokens.get(key)
+        if token is not None and token.is_fresh(self.clock()):
+            return token
+        return None
+
+    def store(self, key: TokenKey, payload: Mapping[str, Any]) -> OAuthToken:
+        """
+        Cache a token from a token endpoint response body.
+
+        :param key: Token cache key.
+        :param payload: Parsed token response with 'access_token' and 'expires_in'.
+        :return: The cached token.
+        """
+        now = self.clock()
+        expires_in = float(payload.get("expires_in", 3600))
+        token = OAuthToken(
+            access_token=payload["access_token"],
+            token_type=payload.get("token_type", "access_token"),
+            expires_at=now + expires_in,
+            refresh_at=now + max(expires_in - self.refresh_margin, expires_in / 2),
+        )
+        self._tokens[key] = token
+        return token
+
+    def invalidate(self, key: Optional[TokenKey] = None) -> None:
+        """
+        Drop a cached token so the next caller fetches a new one.
+
+        :param key: Token cache key, or None to drop every cached token.
+        """
+        if key is None:
+            self._tokens.clear()
+        else:
+            self._tokens.pop(key, None)
+
+    def get_token(self, key: TokenKey, fetch: Callable[[], Mapping[str, Any]]) -> str:
+        """
+        Get an access token, fetching it at most once across concurrent threads.
+
+        :param key: Token cache key.
+        :param fetch: Callable returning the parsed token endpoint response.
+        :return: The access token.
+        """
+        token = self.get_cached(key)
+        if token is not None:
+            return token.access_token
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(key, threading.Lock())
+        with fetch_lock:
+            # Another thread may have refreshed the token while we waited.
+            token = self.get_cached(key)
+            if token is None:
+                token = self.store(key, fetch())
+        return token.access_token
+
+    async def aget_token(
+        self, key: TokenKey, fetch: Callable[[], Awaitable[Mapping[str, Any]]]
+    ) -> str:
+        """
+        Get an access token, fetching it at most once across concurrent tasks.
+
+        :param key: Token cache key.
+        :param fetch: Coroutine function returning the parsed token endpoint response.
+        :return: The access token.
+        """
+        token = self.get_cached(key)
+        if token is not None:
+            return token.access_token
+        fetch_lock = self._async_fetch_locks.setdefault(key, asyncio.Lock())
+        async with fetch_lock:
+            token = self.get_cached(key)
+            if token is None:
+                token = self.store(key, await fetch())
+        return token.access_token
@@ -4,8 +4,10 @@ import uuid
 import pytest
 
 from momo_psb.api import MoMoPSBAPI
+from momo_psb.emulator import EmulatorServer
 
 BASE_URL = "https://sandbox.momodeveloper.mtn.com"
+# Tests run against the live sandbox when a key is set, else a local emulator.
 SUBSCRIPTION_KEY = os.environ.get("SUBSCRIPTION_KEY")
 REFERENCE_ID = str(uuid.uuid4())
 CALLBACK_HOST = "https://clinic.com"
@@ -18,12 +20,24 @@ PAYEE_NOTE = "Test note"
 TARGET_ENVIRONMENT = "sandbox"
 
 
-@pytest.fixture
-def momo_api():
-    return MoMoPSBAPI(base_url=BASE_URL, subscription_key=SUBSCRIPTION_KEY)
+@pytest.fixture(scope="session")
+def gateway_url():
+    if SUBSCRIPTION_KEY:
+        yield BASE_URL
+        return
+    with EmulatorServer() as server:
+        yield server.url
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def momo_api(gateway_url):
+    with MoMoPSBAPI(
+        base_url=gateway_url, subscription_key=SUBSCRIPTION_KEY or "local-key"
+    ) as api:
+        yield api
+
+
+@pytest.fixture(scope="session")
 def api_user(momo_api):
     response = momo_api.create_api_user(
         reference_id=REFERENCE_ID, provider_callback_host=CALLBACK_HOST
@@ -32,14 +46,14 @@ def api_user(momo_api):
     return REFERENCE_ID
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def api_key(momo_api, api_user):
     response = momo_api.create_api_key(api_user=api_user)
     assert response.status_code in (200, 201)
     return response.json().get("apiKey")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def access_token(momo_api, api_user, api_key):
     response = momo_api.get_oauth_token(api_user=api_user, api_key=api_key)
     assert response.status_code == 200
@@ -1,6 +1,14 @@
 from requests.models import Response
 
-from tests.conftest import REFERENCE_ID
+from tests.conftest import (
+    AMOUNT,
+    CURRENCY,
+    EXTERNAL_ID,
+    PAYEE_NOTE,
+    PAYER,
+    PAYER_MESSAGE,
+    REFERENCE_ID,
+)
 
 
 def test_create_api_user(api_user):
@@ -27,13 +35,13 @@ def test_request_to_pay(momo_api, access_token):
         payee_note=PAYEE_NOTE,
     )
     assert isinstance(response, Response)
-    assert response.status_code in (200, 201)
+    assert response.status_code in (200, 201, 202)
 
 
 def test_get_account_balance(momo_api, access_token):
     response = momo_api.get_account_balance(access_token=access_token)
     assert isinstance(response, dict)
-    assert "balance" in response
+    assert "availableBalance" in response
 
 
 def test_validate_account_holder_status(momo_api, access_token):
@@ -43,7 +51,7 @@ def test_validate_account_holder_status(momo_api, access_token):
         account_holder_id="1234567890",
     )
     assert isinstance(response, dict)
-    assert "status" in response
+    assert "result" in response
 
 
 def test_get_request_to_pay_status(momo_api, access_token):
@@ -62,7 +70,7 @@ def test_get_basic_user_info(momo_api, access_token):
         account_holder_id="1234567890",
     )
     assert isinstance(response, dict)
-    assert "userInfo" in response
+    assert "given_name" in response
 
 
 def test_request_to_withdraw(momo_api, access_token):
@@ -77,7 +85,7 @@ def test_request_to_withdraw(momo_api, access_token):
         payee_note=PAYEE_NOTE,
     )
     assert isinstance(response, Response)
-    assert response.status_code in (200, 201)
+    assert response.status_code in (200, 201, 202)
 
 
 def test_get_request_to_withdraw_status(momo_api, access_token):
@@ -101,7 +109,7 @@ def test_create_invoice(momo_api, access_token):
         payee=PAYER,
     )
     assert isinstance(response, Response)
-    assert response.status_code in (200, 201)
+    assert response.status_code in (200, 201, 202)
 
 
 def test_get_invoice_status(momo_api, access_token):
@@ -133,7 +141,7 @@ def test_create_pre_approval(momo_api, access_token):
         validity_time=3600,
     )
     assert isinstance(response, Response)
-    assert response.status_code in (200, 201)
+    assert response.status_code in (200, 201, 202)
 
 
 def test_get_pre_approval_status(momo_api, access_token):
@@ -175,7 +183,7 @@ def test_create_payment(momo_api, access_token):
         service_provider_user_name="test_provider",
     )
     assert isinstance(response, Response)
-    assert response.status_code in (200, 201)
+    assert response.status_code in (200, 201, 202)
 
 
 def test_get_payment_status(momo_api, access_token):
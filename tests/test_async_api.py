@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from momo_psb.async_api import AsyncMoMoPSBAPI  # noqa: E402
+
+from tests.conftest import AMOUNT, CURRENCY, PAYER, REFERENCE_ID  # noqa: E402
+
+
+def _gateway(request: httpx.Request) -> httpx.Response:
+    if request.method == "POST" and request.url.path.endswith("/requesttopay"):
+        return httpx.Response(202)
+    if request.method == "GET" and "/requesttopay/" in request.url.path:
+        return httpx.Response(200, json={"status": "SUCCESSFUL"})
+    return httpx.Response(404)
+
+
+def _client(handler=_gateway) -> AsyncMoMoPSBAPI:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncMoMoPSBAPI("https://gateway.test", "key", client=client)
+
+
+def test_async_request_to_pay_sends_expected_request():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return _gateway(request)
+
+    async def main():
+        async with _client(handler) as api:
+            return await api.request_to_pay(
+                reference_id=REFERENCE_ID,
+                access_token="token",
+                amount=AMOUNT,
+                currency=CURRENCY,
+                external_id="external",
+                payer=PAYER,
+                payer_message="message",
+                payee_note="note",
+            )
+
+    response = asyncio.run(main())
+    assert response.status_code == 202
+    request = seen[0]
+    assert request.headers["X-Reference-Id"] == REFERENCE_ID
+    assert request.headers["Authorization"] == "Bearer token"
+    assert request.headers["Ocp-Apim-Subscription-Key"] == "key"
+    assert json.loads(request.content)["amount"] == AMOUNT
+
+
+def test_async_status_calls_run_concurrently_on_one_client():
+    async def main():
+        async with _client() as api:
+            return await asyncio.gather(
+                *(api.get_request_to_pay_status(str(i), "token") for i in range(50))
+            )
+
+    results = asyncio.run(main())
+    assert results == [{"status": "SUCCESSFUL"}] * 50
+
+
+def test_async_create_api_user_does_not_leak_reference_id():
+    api = _client(lambda request: httpx.Response(201))
+    asyncio.run(api.create_api_user(REFERENCE_ID, "https://callback.test"))
+    assert "X-Reference-Id" not in api.headers
+
+
+def test_async_client_fetches_token_once_for_concurrent_calls():
+    token_requests = []
+
+    def handler(request):
+        if request.url.path == "/collection/token/":
+            token_requests.append(request)
+            return httpx.Response(
+                200, json={"access_token": "managed", "expires_in": 3600}
+            )
+        assert request.headers["Authorization"] == "Bearer managed"
+        return _gateway(request)
+
+    async def main():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncMoMoPSBAPI(
+            "https://gateway.test",
+            "key",
+            api_user="user",
+            api_key="secret",
+            client=client,
+        ) as api:
+            return await asyncio.gather(
+                *(api.get_request_to_pay_status(str(i)) for i in range(10))
+            )
+
+    assert asyncio.run(main()) == [{"status": "SUCCESSFUL"}] * 10
+    assert len(token_requests) == 1
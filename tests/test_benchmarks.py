@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from benchmarks.run import main
+
+
+def test_benchmarks_write_machine_readable_results(tmp_path):
+    output = tmp_path / "bench.json"
+    args = [
+        "--transports",
+        "inprocess",
+        "--modes",
+        "sync,threads",
+        "--iterations",
+        "10",
+        "--warmup",
+        "1",
+        "--concurrency",
+        "2",
+        "--alloc-iterations",
+        "2",
+    ]
+    assert main(args + ["--output", str(output)]) == 0
+
+    report = json.loads(output.read_text())
+    results = {(r["flow"], r["mode"]): r for r in report["results"]}
+    assert len(results) == 8
+    pay = results[("request_to_pay", "sync")]
+    assert pay["ops"] == 10
+    assert pay["requests_per_op"] == 2
+    assert {"p50", "p95", "p99"} <= set(pay["latency_ms"])
+    assert "retained_bytes_per_op" in pay
+
+    # An impossible baseline makes every benchmark a regression.
+    for result in report["results"]:
+        result["ops_per_sec"] *= 1000
+    output.write_text(json.dumps(report))
+    assert (
+        main(
+            args + ["--output", str(tmp_path / "again.json"), "--compare", str(output)]
+        )
+        == 1
+    )
+
+
+def test_http2_benchmark_compares_connection_counts(tmp_path):
+    pytest.importorskip("h2")
+    from benchmarks.http2 import main as http2_main
+
+    output = tmp_path / "http2.json"
+    args = ["--requests", "20", "--concurrency", "4", "--latency", "0.01"]
+    assert http2_main(args + ["--output", str(output)]) == 0
+
+    results = {r["mode"]: r for r in json.loads(output.read_text())["results"]}
+    assert set(results) == {"sync_http1", "sync_http2", "async_http1", "async_http2"}
+    assert results["sync_http2"]["connections"] == 1
+    assert results["async_http2"]["connections"] == 1
+    assert results["sync_http1"]["requests"] == 20
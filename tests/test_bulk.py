@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.bulk import amap_bounded, map_bounded
+
+from tests.conftest import AMOUNT, CURRENCY, PAYER
+
+
+def _payments(count):
+    for i in range(count):
+        yield {
+            "amount": AMOUNT,
+            "currency": CURRENCY,
+            "external_id": f"ext-{i}",
+            "payer": PAYER,
+            "payer_message": "message",
+            "payee_note": "note",
+        }
+
+
+def test_map_bounded_limits_in_flight_calls_and_pulls_lazily():
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+    pulled = []
+
+    def work(item):
+        with lock:
+            in_flight.append(item)
+            peak.append(len(in_flight))
+        time.sleep(0.01)
+        with lock:
+            in_flight.remove(item)
+        return item * 2
+
+    def items():
+        for i in range(40):
+            pulled.append(i)
+            yield i
+
+    results = map_bounded(work, items(), concurrency=4)
+    first = next(results)
+    assert len(pulled) <= 5
+    rest = list(results)
+    assert sorted(r[2] for r in [first, *rest]) == [i * 2 for i in range(40)]
+    assert max(peak) <= 4
+
+
+def test_map_bounded_reports_errors_per_item():
+    def work(item):
+        if item == 2:
+            raise RuntimeError("boom")
+        return item
+
+    results = {index: error for index, _, _, error in map_bounded(work, range(4), 2)}
+    assert isinstance(results[2], RuntimeError)
+    assert results[0] is None
+
+
+def test_amap_bounded_limits_in_flight_tasks():
+    in_flight = 0
+    peak = 0
+
+    async def work(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return item
+
+    async def main():
+        return [r async for r in amap_bounded(work, range(30), concurrency=5)]
+
+    assert len(asyncio.run(main())) == 30
+    assert peak <= 5
+
+
+def test_request_to_pay_many_assigns_reference_ids(monkeypatch):
+    api = MoMoPSBAPI("https://gateway.test", "key")
+    calls = []
+
+    def request_to_pay(**kwargs):
+        calls.append(kwargs)
+        response = type("Response", (), {"status_code": 202})()
+        return response
+
+    monkeypatch.setattr(api, "request_to_pay", request_to_pay)
+
+    results = list(api.request_to_pay_many(_payments(25), concurrency=5))
+
+    assert len(results) == 25
+    assert all(result.ok for result in results)
+    reference_ids = {result.reference_id for result in results}
+    assert len(reference_ids) == 25
+    assert {call["reference_id"] for call in calls} == reference_ids
+
+
+def test_async_request_to_pay_many():
+    httpx = pytest.importorskip("httpx")
+    from momo_psb.async_api import AsyncMoMoPSBAPI
+
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers["X-Reference-Id"])
+        return httpx.Response(202)
+
+    async def main():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncMoMoPSBAPI("https://gateway.test", "key", client=client) as api:
+            payments = (
+                {**payment, "access_token": "token"} for payment in _payments(30)
+            )
+            return [
+                result
+                async for result in api.request_to_pay_many(payments, concurrency=8)
+            ]
+
+    results = asyncio.run(main())
+    assert sorted(result.index for result in results) == list(range(30))
+    assert {result.reference_id for result in results} == set(seen)
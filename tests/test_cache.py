@@ -0,0 +1,131 @@
+import asyncio
+import traceback
+
+import pytest
+import requests
+
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _json_response(status_code, body):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    return response
+
+
+def test_entries_expire_and_lru_is_evicted():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    clock.now += 11
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 2, "misses": 2, "evictions": 1, "size": 1}
+
+
+def test_negative_results_use_shorter_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttl=300, negative_ttl=5, clock=clock)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"result": False}
+
+    for _ in range(3):
+        cache.get_or_fetch("k", fetch, is_negative=lambda v: not v["result"])
+    clock.now += 6
+    cache.get_or_fetch("k", fetch, is_negative=lambda v: not v["result"])
+    assert len(calls) == 2
+
+
+@pytest.fixture
+def cached_api(monkeypatch):
+    cache = TTLCache(maxsize=100, ttl=60, negative_ttl=10)
+    api = MoMoPSBAPI("https://gateway.test", "key", account_cache=cache)
+    calls = []
+
+    def request(method, url, **kwargs):
+        calls.append(url)
+        if url.endswith("/unknown/active"):
+            return _json_response(404, b"{}")
+        return _json_response(200, b'{"result": true}')
+
+    monkeypatch.setattr(api.session, "request", request)
+    return api, cache, calls
+
+
+def test_repeated_validations_are_served_locally(cached_api):
+    api, cache, calls = cached_api
+    for id_type in ("MSISDN", "msisdn", "MSISDN"):
+        assert api.validate_account_holder_status("token", id_type, "2348056042384")
+    assert len(calls) == 1
+    assert cache.hits == 2
+
+
+def test_lookups_are_keyed_by_environment_and_kind(cached_api):
+    api, _, calls = cached_api
+    api.validate_account_holder_status("token", "MSISDN", "1", "sandbox")
+    api.validate_account_holder_status("token", "MSISDN", "1", "mtnnigeria")
+    api.get_basic_user_info("token", "MSISDN", "1", "sandbox")
+    assert len(calls) == 3
+
+
+def test_unknown_account_holders_are_cached_negatively(cached_api):
+    api, _, calls = cached_api
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            api.validate_account_holder_status("token", "MSISDN", "unknown")
+    assert len(calls) == 1
+
+
+def test_cached_errors_are_raised_as_fresh_copies(cached_api):
+    api, _, calls = cached_api
+    raised = []
+    for _ in range(3):
+        with pytest.raises(requests.HTTPError) as excinfo:
+            api.validate_account_holder_status("token", "MSISDN", "unknown")
+        raised.append(excinfo.value)
+
+    assert len(calls) == 1
+    assert len({id(exc) for exc in raised}) == 3
+    assert all(exc.response.status_code == 404 for exc in raised)
+    depths = [len(traceback.extract_tb(exc.__traceback__)) for exc in raised[1:]]
+    assert depths[0] == depths[1]
+
+
+def test_async_client_uses_account_cache():
+    httpx = pytest.importorskip("httpx")
+    from momo_psb.async_api import AsyncMoMoPSBAPI
+
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"given_name": "Ada"})
+
+    async def main():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncMoMoPSBAPI(
+            "https://gateway.test", "key", client=client, account_cache=TTLCache()
+        ) as api:
+            return [
+                await api.get_basic_user_info("token", "MSISDN", "1") for _ in range(3)
+            ]
+
+    assert asyncio.run(main()) == [{"given_name": "Ada"}] * 3
+    assert len(calls) == 1
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import socket
+import urllib.request
+
+import pytest
+
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.callbacks import CallbackReceiver
+
+from tests.conftest import REFERENCE_ID
+
+
+async def _deliver(receiver, path, payload, headers=None):
+    reader, writer = await asyncio.open_connection(receiver.host, receiver.port)
+    body = json.dumps(payload).encode()
+    head = f"PUT {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n"
+    for name, value in (headers or {}).items():
+        head += f"{name}: {value}\r\n"
+    writer.write(head.encode() + b"\r\n" + body)
+    await writer.drain()
+    status_line = await reader.readline()
+    writer.close()
+    return int(status_line.split()[1])
+
+
+def test_callback_resolves_waiter_by_header():
+    async def main():
+        async with CallbackReceiver() as receiver:
+            waiter = asyncio.ensure_future(receiver.wait_for(REFERENCE_ID, timeout=5))
+            await asyncio.sleep(0)
+            status = await _deliver(
+                receiver,
+                receiver.path,
+                {"status": "SUCCESSFUL", "externalId": "ext"},
+                {"X-Reference-Id": REFERENCE_ID},
+            )
+            return status, await waiter, receiver.pending
+
+    status, event, pending = asyncio.run(main())
+    assert status == 200
+    assert event.reference_id == REFERENCE_ID
+    assert event.status == "SUCCESSFUL"
+    assert pending == 0
+
+
+def test_early_callback_is_kept_until_claimed_by_path():
+    async def main():
+        async with CallbackReceiver() as receiver:
+            url = receiver.callback_url_for("ref-1")
+            path = url[url.index(receiver.path) :]
+            await _deliver(receiver, path, {"status": "FAILED"})
+            return await receiver.wait_for("ref-1", timeout=1)
+
+    assert asyncio.run(main()).status == "FAILED"
+
+
+def test_receiver_rejects_unknown_paths_and_bad_json():
+    async def main():
+        async with CallbackReceiver() as receiver:
+            not_found = await _deliver(receiver, "/elsewhere", {})
+            reader, writer = await asyncio.open_connection(receiver.host, receiver.port)
+            writer.write(
+                f"POST {receiver.path} HTTP/1.1\r\nContent-Length: 3\r\n\r\n{{x}}".encode()
+            )
+            await writer.drain()
+            bad_json = int((await reader.readline()).split()[1])
+            writer.close()
+            return not_found, bad_json
+
+    assert asyncio.run(main()) == (404, 400)
+
+
+def test_receiver_answers_malformed_framing_with_400_and_closes():
+    async def main():
+        async with CallbackReceiver() as receiver:
+            responses = []
+            for framing in (
+                "Content-Length: abc\r\n\r\n",
+                "Transfer-Encoding: chunked\r\n\r\nzz\r\n",
+                "Transfer-Encoding: chunked\r\n\r\n2\r\n{}XX",
+                "Transfer-Encoding: chunked\r\n\r\n" + "0" * 70000 + "2\r\n",
+            ):
+                reader, writer = await asyncio.open_connection(
+                    receiver.host, receiver.port
+                )
+                writer.write(f"POST {receiver.path} HTTP/1.1\r\n{framing}".encode())
+                await writer.drain()
+                responses.append(await asyncio.wait_for(reader.read(), 5))
+                writer.close()
+            return responses
+
+    for response in asyncio.run(main()):
+        assert response.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+        assert b"Connection: close" in response
+
+
+def test_failing_handler_answers_500_so_the_gateway_retries():
+    calls = []
+
+    def on_callback(event):
+        calls.append(event)
+        if len(calls) == 1:
+            raise RuntimeError("database down")
+
+    async def main():
+        async with CallbackReceiver(on_callback=on_callback) as receiver:
+            path = f"{receiver.path}/retry-ref"
+            payload = {"status": "SUCCESSFUL"}
+            statuses = [await _deliver(receiver, path, payload) for _ in range(2)]
+            event = await receiver.wait_for("retry-ref", timeout=1)
+            return statuses, event.status
+
+    assert asyncio.run(main()) == ([500, 200], "SUCCESSFUL")
+
+
+def test_background_receiver_serves_synchronous_callers():
+    receiver = CallbackReceiver()
+    receiver.start_background()
+    try:
+        request = urllib.request.Request(
+            receiver.callback_url_for("sync-ref"),
+            data=b'{"status": "SUCCESSFUL"}',
+            method="POST",
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            assert response.status == 200
+        assert receiver.wait("sync-ref", timeout=5).status == "SUCCESSFUL"
+    finally:
+        receiver.stop_background()
+
+
+def test_background_receiver_raises_when_the_port_is_in_use():
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        receiver = CallbackReceiver(port=taken.getsockname()[1])
+        with pytest.raises(OSError):
+            receiver.start_background()
+    receiver.stop_background()
+
+
+@pytest.mark.parametrize(
+    "client_url, call_url, expected",
+    [
+        (None, None, None),
+        ("https://merchant.test/cb", None, "https://merchant.test/cb"),
+        ("https://merchant.test/cb", "https://other.test/cb", "https://other.test/cb"),
+    ],
+)
+def test_callback_url_is_configurable(client_url, call_url, expected):
+    api = MoMoPSBAPI("https://gateway.test", "key", callback_url=client_url)
+    headers = api._headers(callback_url=call_url or api.callback_url)
+    assert headers.get("X-Callback-Url") == expected
@@ -0,0 +1,154 @@
+import pytest
+import requests
+
+from momo_psb._endpoints import endpoint_group
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.circuit import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+)
+from momo_psb.exceptions import CircuitOpenError
+from momo_psb.instrumentation import Instrumentation
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.parametrize(
+    "path, group",
+    [
+        ("/v1_0/apiuser/abc/apikey", "apiuser"),
+        ("/collection/token/", "token"),
+        ("/collection/v1_0/requesttopay/abc", "requesttopay"),
+        ("/collection/v2_0/invoice", "invoice"),
+        ("/collection/v1_0/preapprovals/msisdn/123", "preapproval"),
+        ("/collection/v2_0/payment/abc", "payment"),
+    ],
+)
+def test_endpoint_group(path, group):
+    assert endpoint_group(path) == group
+
+
+def _breaker(clock, transitions, **kwargs):
+    options = dict(minimum_calls=4, window_size=10, reset_timeout=30)
+    options.update(kwargs)
+    return CircuitBreaker(
+        "payment",
+        clock=clock,
+        on_state_change=lambda *change: transitions.append(change),
+        **options,
+    )
+
+
+def test_breaker_opens_fails_fast_and_recovers_through_half_open():
+    clock = FakeClock()
+    transitions = []
+    breaker = _breaker(clock, transitions)
+    for success in (True, False, False, True):
+        breaker.before_call()
+        breaker.record(success)
+    assert breaker.state == OPEN
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.retry_in == 30
+
+    clock.now += 30
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record(True)
+
+    assert breaker.state == CLOSED
+    assert transitions == [
+        ("payment", CLOSED, OPEN),
+        ("payment", OPEN, HALF_OPEN),
+        ("payment", HALF_OPEN, CLOSED),
+    ]
+
+
+def test_failed_trial_reopens_circuit():
+    clock = FakeClock()
+    breaker = _breaker(clock, [], minimum_calls=1)
+    breaker.before_call()
+    breaker.record(False)
+    clock.now += 30
+    breaker.before_call()
+    breaker.record(False)
+    assert breaker.state == OPEN
+
+
+def test_slow_calls_count_as_failures():
+    breaker = _breaker(FakeClock(), [], minimum_calls=2, slow_call_threshold=1.0)
+    breaker.record(True, duration=5.0)
+    breaker.record(True, duration=5.0)
+    assert breaker.state == OPEN
+
+
+def test_registry_keeps_one_breaker_per_group():
+    registry = CircuitBreakerRegistry(minimum_calls=1)
+    invoice = registry.for_path("/collection/v2_0/invoice/abc")
+    assert invoice is registry.for_path("/collection/v2_0/invoice")
+    assert invoice is not registry.for_path("/collection/v2_0/payment")
+    invoice.record(False)
+    assert registry.states() == {"invoice": OPEN, "payment": CLOSED}
+
+
+def test_client_fails_fast_while_group_is_open(monkeypatch):
+    registry = CircuitBreakerRegistry(minimum_calls=2)
+    api = MoMoPSBAPI("https://gateway.test", "key", circuit_breakers=registry)
+    calls = []
+
+    def request(method, url, **kwargs):
+        calls.append(url)
+        raise requests.ConnectTimeout()
+
+    monkeypatch.setattr(api.session, "request", request)
+    for _ in range(2):
+        with pytest.raises(requests.ConnectTimeout):
+            api.get_payment_status("ref", "token")
+
+    with pytest.raises(CircuitOpenError):
+        api.get_payment_status("ref", "token")
+    assert len(calls) == 2
+    assert registry.states()["payment"] == OPEN
+
+
+def test_failing_instrumentation_releases_the_half_open_trial(monkeypatch):
+    clock = FakeClock()
+    registry = CircuitBreakerRegistry(clock=clock, minimum_calls=1, reset_timeout=30)
+    registry.for_path("/collection/v2_0/payment").record(False)
+    clock.now += 30
+
+    class Failing(Instrumentation):
+        def on_request(self, event):
+            raise RuntimeError("exporter down")
+
+    api = MoMoPSBAPI(
+        "https://gateway.test",
+        "key",
+        circuit_breakers=registry,
+        instrumentation=Failing(),
+    )
+    with pytest.raises(RuntimeError):
+        api.get_payment_status("ref", "token")
+    assert registry.states()["payment"] == HALF_OPEN
+
+    api.instrumentation = Instrumentation()
+    monkeypatch.setattr(api.session, "request", _raise_timeout)
+    with pytest.raises(requests.ConnectTimeout):
+        api.get_payment_status("ref", "token")
+    assert registry.states()["payment"] == OPEN
+
+
+def _raise_timeout(method, url, **kwargs):
+    raise requests.ConnectTimeout()
@@ -0,0 +1,142 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from momo_psb.cli import cli
+from momo_psb.emulator import EmulatorServer, GatewayEmulator
+
+
+@pytest.fixture
+def gateway():
+    emulator = GatewayEmulator(strict_auth=False)
+    with EmulatorServer(emulator) as server:
+        yield emulator, server.url
+
+
+def _invoke(url, *args, input=None):
+    return CliRunner().invoke(
+        cli,
+        [
+            "--base-url",
+            url,
+            "--subscription-key",
+            "key",
+            "--no-credential-cache",
+            *args,
+        ],
+        input=input,
+    )
+
+
+def test_payment_bulk_streams_csv_rows(gateway, tmp_path):
+    emulator, url = gateway
+    rows = tmp_path / "payments.csv"
+    rows.write_text(
+        "amount,payer_id,external_id,reference_id\n"
+        "10,46733123452,order-1,\n"
+        "20,46733123453,order-2,7c3f2bd4-9a3c-4bde-8a41-1f1bd3a0c001\n"
+        ",46733123454,order-3,\n"
+    )
+
+    result = _invoke(
+        url,
+        "payment",
+        "bulk",
+        str(rows),
+        "--access-token",
+        "t",
+        "--currency",
+        "EUR",
+        "--payer-id-type",
+        "MSISDN",
+        "--message",
+        "m",
+        "--note",
+        "n",
+        "--concurrency",
+        "2",
+    )
+
+    assert result.exit_code == 1
+    assert "Submitted 3 rows, 1 failed" in result.stderr
+    records = sorted(
+        (json.loads(line) for line in result.stdout.splitlines()),
+        key=lambda record: record["index"],
+    )
+    assert [record["ok"] for record in records] == [True, True, False]
+    assert records[1]["reference_id"] == "7c3f2bd4-9a3c-4bde-8a41-1f1bd3a0c001"
+    assert records[2]["error"] == "Missing column: amount"
+    transaction = emulator.transaction("requesttopay", records[0]["reference_id"])
+    assert transaction.payload["externalId"] == "order-1"
+    assert transaction.payload["payer"]["partyId"] == "46733123452"
+
+
+def test_invoice_bulk_reads_jsonl_from_stdin(gateway):
+    emulator, url = gateway
+    lines = "\n".join(
+        json.dumps(
+            {
+                "amount": 5 + index,
+                "currency": "EUR",
+                "validity": "3600",
+                "payer_id": "46733123452",
+                "payee_id": "46733123459",
+            }
+        )
+        for index in range(20)
+    )
+
+    result = _invoke(
+        url,
+        "invoice",
+        "bulk",
+        "--access-token",
+        "t",
+        "--payer-id-type",
+        "MSISDN",
+        "--payee-id-type",
+        "MSISDN",
+        input=lines,
+    )
+
+    assert result.exit_code == 0, result.stderr
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert len(records) == 20
+    assert all(record["status_code"] == 202 for record in records)
+    assert emulator.transaction("invoice", records[0]["reference_id"]) is not None
+
+
+def test_shell_runs_commands_over_one_client(gateway, monkeypatch):
+    emulator, url = gateway
+    from momo_psb.cli import Config
+
+    clients = []
+    build = Config.client
+
+    def client(self, **options):
+        clients.append(build(self, **options))
+        return clients[-1]
+
+    monkeypatch.setattr(Config, "client", client)
+    script = "\n".join(
+        [
+            "account balance --access-token t",
+            "# comments and blank lines are skipped",
+            "",
+            "account basic-info --access-token t --id-type msisdn --id 46733123452",
+            "payment status missing --access-token t",
+            "no-such-command",
+            "exit",
+            "account balance --access-token t",
+        ]
+    )
+
+    result = _invoke(url, "shell", input=script)
+
+    assert result.exit_code == 1
+    assert len(clients) == 1
+    assert emulator.request_count == 3
+    assert result.stdout.count('"availableBalance"') == 1
+    assert "404 Client Error" in result.stderr
+    assert "No such command 'no-such-command'" in result.stderr
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+import requests
+
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.codec import CODECS, JSONCodec, get_codec
+from momo_psb.models import TransactionStatus
+
+
+def _available_codecs():
+    names = []
+    for name in CODECS:
+        try:
+            get_codec(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+@pytest.mark.parametrize("name", _available_codecs())
+def test_codecs_round_trip_payloads_and_models(name):
+    codec = get_codec(name)
+    payload = {"amount": 100.0, "payer": {"partyId": "1"}, "note": "naïve"}
+    assert json.loads(codec.dumps(payload)) == payload
+    assert codec.loads(codec.dumps(payload)) == payload
+
+    status = TransactionStatus(b'{"status": "SUCCESSFUL"}')
+    assert json.loads(codec.dumps_pretty({"result": status})) == {
+        "result": {"status": "SUCCESSFUL"}
+    }
+    assert codec.dumps_pretty({"a": 1}) == '{\n  "a": 1\n}'
+
+
+@pytest.mark.parametrize("name", _available_codecs())
+def test_decode_errors_are_value_errors(name):
+    with pytest.raises(ValueError):
+        get_codec(name).loads(b"{not json")
+
+
+def test_default_codec_prefers_installed_fast_backend():
+    expected = next(iter(_available_codecs()))
+    assert get_codec().name == expected
+
+
+def test_client_encodes_bodies_with_its_codec(monkeypatch):
+    class RecordingCodec(JSONCodec):
+        encoded = []
+
+        def dumps(self, obj):
+            self.encoded.append(obj)
+            return super().dumps(obj)
+
+    api = MoMoPSBAPI("https://gateway.test", "key", json_codec=RecordingCodec())
+    sent = {}
+
+    def request(method, url, **kwargs):
+        sent.update(kwargs)
+        response = requests.Response()
+        response.status_code = 202
+        return response
+
+    monkeypatch.setattr(api.session, "request", request)
+    api.request_to_pay("ref", "token", 10, "EUR", "ext", {"partyId": "1"}, "m", "n")
+
+    assert RecordingCodec.encoded[0]["amount"] == 10.0
+    assert sent["headers"]["Content-Type"] == "application/json"
+    assert json.loads(sent["data"])["externalId"] == "ext"
+    assert "json" not in sent
@@ -0,0 +1,170 @@
+import json
+import os
+import stat
+import subprocess
+import sys
+import uuid
+
+import pytest
+from click.testing import CliRunner
+
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.cli import cli
+from momo_psb.credentials import CredentialStore, StoredTokenManager
+from momo_psb.emulator import EmulatorServer, GatewayEmulator
+
+BASE_URL = "https://gateway.test"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_store_is_private_and_never_holds_the_subscription_key(tmp_path):
+    path = tmp_path / "momo" / "credentials.json"
+    store = CredentialStore(str(path))
+    store.save_credentials(BASE_URL, "secret-key", "user", "api-key")
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(path.parent).st_mode) == 0o700
+    assert "secret-key" not in path.read_text()
+    assert store.credentials(BASE_URL + "/", "secret-key") == ("user", "api-key")
+    assert store.credentials(BASE_URL, "other-key") == (None, None)
+
+    store.clear(BASE_URL, "secret-key")
+    assert store.credentials(BASE_URL, "secret-key") == (None, None)
+
+
+def test_store_leaves_an_existing_directory_alone(tmp_path):
+    os.chmod(tmp_path, 0o755)
+    path = tmp_path / "credentials.json"
+    CredentialStore(str(path)).save_credentials(BASE_URL, "secret-key", "u", "k")
+    assert stat.S_IMODE(os.stat(tmp_path).st_mode) == 0o755
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+_SAVE_TOKENS = """
+import sys
+from momo_psb.credentials import CredentialStore
+from momo_psb.tokens import OAuthToken
+
+store = CredentialStore(sys.argv[1])
+for index in range(20):
+    token = OAuthToken("token", "Bearer", expires_at=2e9, refresh_at=2e9)
+    store.save_token("{base_url}", "key", (sys.argv[2], str(index), "sandbox"), token)
+"""
+
+
+def test_concurrent_processes_keep_each_others_updates(tmp_path):
+    path = str(tmp_path / "credentials.json")
+    script = _SAVE_TOKENS.format(base_url=BASE_URL)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    processes = [
+        subprocess.Popen([sys.executable, "-c", script, path, f"user-{n}"], env=env)
+        for n in range(4)
+    ]
+    assert [process.wait(timeout=60) for process in processes] == [0] * 4
+    assert len(CredentialStore(path).tokens(BASE_URL, "key")) == 80
+
+
+def test_tokens_are_reused_across_processes_until_refresh(tmp_path):
+    store = CredentialStore(str(tmp_path / "credentials.json"))
+    clock = FakeClock()
+    fetches = []
+
+    def fetch():
+        fetches.append(clock.now)
+        return {"access_token": f"token-{len(fetches)}", "expires_in": 3600}
+
+    key = ("user", "collection", "sandbox")
+    first = StoredTokenManager(store, BASE_URL, "key", clock=clock)
+    assert first.get_token(key, fetch) == "token-1"
+
+    second = StoredTokenManager(store, BASE_URL, "key", clock=clock)
+    assert second.get_token(key, fetch) == "token-1"
+    assert len(fetches) == 1
+
+    clock.now += 3600
+    third = StoredTokenManager(store, BASE_URL, "key", clock=clock)
+    assert third.get_token(key, fetch) == "token-2"
+
+    third.invalidate(key)
+    assert store.tokens(BASE_URL, "key") == {}
+
+
+def test_corrupt_file_is_treated_as_empty(tmp_path):
+    path = tmp_path / "credentials.json"
+    path.write_text("{not json")
+    store = CredentialStore(str(path))
+    assert store.credentials(BASE_URL, "key") == (None, None)
+    store.save_credentials(BASE_URL, "key", "user", "api-key")
+    assert json.loads(path.read_text())["profiles"]
+
+
+def test_cli_login_lets_later_commands_skip_the_token_endpoint(tmp_path):
+    emulator = GatewayEmulator()
+    credentials = str(tmp_path / "credentials.json")
+    with EmulatorServer(emulator) as server:
+
+        def invoke(*args):
+            return CliRunner().invoke(
+                cli,
+                ["--base-url", server.url, "--subscription-key", "key"]
+                + ["--credentials-file", credentials, *args],
+            )
+
+        result = invoke("user", "create", "--callback-host", "cb.test")
+        api_user = result.output.splitlines()[0].rsplit(" ", 1)[1]
+        result = invoke("user", "create-key", api_user)
+        assert result.exit_code == 0, result.output
+        store = CredentialStore(credentials)
+        assert store.credentials(server.url, "key")[0] == api_user
+
+        assert invoke("account", "balance").exit_code == 0
+        before = emulator.request_count
+        result = invoke("account", "balance")
+        assert emulator.request_count == before + 1
+        assert json.loads(result.output)["availableBalance"] == "1000"
+
+        assert invoke("user", "login", api_user, "wrong").exit_code == 1
+        assert invoke("user", "logout").exit_code == 0
+        assert store.credentials(server.url, "key") == (None, None)
+
+
+def test_login_inside_the_shell_applies_to_later_commands(tmp_path):
+    emulator = GatewayEmulator()
+    with EmulatorServer(emulator) as server:
+        api = MoMoPSBAPI(server.url, "key")
+        api_user = str(uuid.uuid4())
+        api.create_api_user(api_user, "cb.test").raise_for_status()
+        api_key = api.create_api_key(api_user).json()["apiKey"]
+        script = "\n".join(
+            ["account balance", f"user login {api_user} {api_key}", "account balance"]
+        )
+
+        result = CliRunner().invoke(
+            cli,
+            ["--base-url", server.url, "--subscription-key", "key"]
+            + ["--credentials-file", str(tmp_path / "credentials.json"), "shell"],
+            input=script,
+        )
+
+    assert "access_token is required" in result.stderr
+    assert f"Logged in as {api_user}" in result.stdout
+    assert json.loads(result.stdout.split("\n", 1)[1])["availableBalance"] == "1000"
+
+
+@pytest.mark.parametrize("args", [["--no-credential-cache"], []])
+def test_commands_without_credentials_need_an_access_token(tmp_path, args):
+    result = CliRunner().invoke(
+        cli,
+        ["--base-url", BASE_URL, "--subscription-key", "key"]
+        + ["--credentials-file", str(tmp_path / "credentials.json"), *args]
+        + ["account", "validate-holder", "--id-type", "msisdn", "--id", "1"],
+    )
+    assert result.exit_code == 1
+    assert "access_token is required" in str(result.exception)
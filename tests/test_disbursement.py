@@ -0,0 +1,161 @@
+import asyncio
+import json
+import uuid
+
+import httpx
+import pytest
+import requests
+from click.testing import CliRunner
+
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.async_api import AsyncMoMoPSBAPI
+from momo_psb.cli import cli
+from momo_psb.emulator import (
+    EmulatorAdapter,
+    EmulatorServer,
+    GatewayEmulator,
+    httpx_transport,
+)
+from momo_psb.polling import Backoff, StatusPoller
+
+BASE_URL = "http://momo.local"
+PAYEE = {"partyIdType": "MSISDN", "partyId": "46733123452"}
+
+
+def _client(emulator, **kwargs):
+    api = MoMoPSBAPI(BASE_URL, "col-key", api_user="user", api_key="secret", **kwargs)
+    api.session.mount(BASE_URL, EmulatorAdapter(emulator))
+    return api
+
+
+def test_products_use_their_own_keys_and_tokens():
+    emulator = GatewayEmulator(
+        subscription_keys={"dis-key", "rem-key"}, strict_auth=False
+    )
+    api = _client(
+        emulator,
+        product_keys={"disbursement": "dis-key", "remittance": "rem-key"},
+        product_credentials={"remittance": ("remit-user", "remit-secret")},
+    )
+
+    assert api.get_disbursement_balance()["availableBalance"] == "1000"
+    assert api.get_remittance_balance()["currency"] == "EUR"
+    with pytest.raises(requests.HTTPError):
+        api.get_account_balance()
+
+    cached = api.token_manager.get_cached
+    assert cached(("user", "disbursement", "sandbox")) is not None
+    assert cached(("remit-user", "remittance", "sandbox")) is not None
+    assert cached(("user", "remittance", "sandbox")) is None
+
+
+def test_transfer_deposit_refund_and_remittance_settle():
+    emulator = GatewayEmulator(strict_auth=False)
+    api = _client(emulator)
+    transfer, deposit, refund, remittance = (str(uuid.uuid4()) for _ in range(4))
+
+    assert api.transfer(transfer, None, 50, "EUR", "pay-1", PAYEE, "m", "n").ok
+    api.deposit(deposit, None, 10, "EUR", "dep-1", PAYEE, "m", "n")
+    api.refund(refund, None, 5, "EUR", "ref-1", transfer, "m", "n")
+    api.remittance_transfer(remittance, None, 7, "EUR", "rem-1", PAYEE, "m", "n")
+
+    status = api.get_transfer_status(transfer)
+    assert (status["status"], status["amount"], status["payee"]) == (
+        "SUCCESSFUL",
+        "50",
+        PAYEE,
+    )
+    assert status["financialTransactionId"]
+    assert api.get_deposit_status(deposit)["externalId"] == "dep-1"
+    assert api.get_refund_status(refund)["status"] == "SUCCESSFUL"
+    assert api.get_remittance_transfer_status(remittance)["amount"] == "7"
+    transaction = emulator.transaction("disbursement/v1_0/refund", refund)
+    assert transaction.payload["referenceIdToRefund"] == transfer
+    with pytest.raises(requests.HTTPError):
+        api.get_remittance_transfer_status(transfer)
+
+
+def test_transfer_many_pays_out_in_bulk_and_polls_the_results():
+    emulator = GatewayEmulator(strict_auth=False)
+    api = _client(emulator, pool_maxsize=4)
+    payees = ["46733123452"] * 9 + ["46733123450"]
+    transfers = (
+        {
+            "amount": 10 + index,
+            "currency": "EUR",
+            "external_id": f"payout-{index}",
+            "payee": {"partyIdType": "MSISDN", "partyId": payee},
+            "payer_message": "salary",
+            "payee_note": "salary",
+        }
+        for index, payee in enumerate(payees)
+    )
+
+    results = list(api.transfer_many(transfers, concurrency=4))
+
+    assert len(results) == 10 and all(result.ok for result in results)
+    poller = StatusPoller(api, backoff=Backoff(initial_delay=0.001, jitter=0.0))
+    for result in results:
+        poller.track("transfer", result.reference_id)
+    statuses = [result.status for result in poller.run().values()]
+    assert sorted(statuses) == ["FAILED"] + ["SUCCESSFUL"] * 9
+
+
+def test_async_client_covers_payouts():
+    emulator = GatewayEmulator(strict_auth=False)
+
+    async def main():
+        async with AsyncMoMoPSBAPI(
+            BASE_URL,
+            "key",
+            api_user="user",
+            api_key="secret",
+            client=httpx.AsyncClient(transport=httpx_transport(emulator)),
+        ) as api:
+            transfers = [
+                {
+                    "amount": 1,
+                    "currency": "EUR",
+                    "external_id": str(index),
+                    "payee": PAYEE,
+                    "payer_message": "m",
+                    "payee_note": "n",
+                }
+                for index in range(5)
+            ]
+            results = [result async for result in api.transfer_many(transfers)]
+            statuses = await asyncio.gather(
+                *(api.get_transfer_status(result.reference_id) for result in results)
+            )
+            return results, statuses, await api.get_disbursement_balance()
+
+    results, statuses, balance = asyncio.run(main())
+    assert all(result.ok for result in results)
+    assert {status["status"] for status in statuses} == {"SUCCESSFUL"}
+    assert balance["availableBalance"] == "1000"
+
+
+def test_disbursement_bulk_command(tmp_path):
+    emulator = GatewayEmulator(strict_auth=False)
+    rows = tmp_path / "payouts.csv"
+    rows.write_text(
+        "amount,payee_id,external_id\n"
+        "10,46733123452,payout-1\n"
+        "20,46733123453,payout-2\n"
+    )
+    with EmulatorServer(emulator) as server:
+        result = CliRunner().invoke(
+            cli,
+            ["--base-url", server.url, "--subscription-key", "key"]
+            + ["--no-credential-cache", "disbursement", "bulk", str(rows)]
+            + ["--access-token", "t", "--currency", "EUR", "--payee-id-type"]
+            + ["MSISDN", "--message", "m", "--note", "n"],
+        )
+
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert all(record["ok"] for record in records)
+    transaction = emulator.transaction(
+        "disbursement/v1_0/transfer", records[0]["reference_id"]
+    )
+    assert transaction.payload["payee"]["partyIdType"] == "MSISDN"
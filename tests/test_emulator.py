@@ -0,0 +1,161 @@
+import asyncio
+import uuid
+
+import pytest
+import requests
+
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.callbacks import CallbackReceiver
+from momo_psb.emulator import EmulatorAdapter, EmulatorServer, GatewayEmulator
+from momo_psb.retry import RetryPolicy
+from tests.conftest import AMOUNT, CURRENCY, PAYEE_NOTE, PAYER, PAYER_MESSAGE
+
+BASE_URL = "http://momo.local"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _client(emulator, **kwargs):
+    api = MoMoPSBAPI(BASE_URL, "key", **kwargs)
+    api.session.mount(BASE_URL, EmulatorAdapter(emulator))
+    return api
+
+
+def _pay(api, reference_id, payer=PAYER, access_token=None, **kwargs):
+    return api.request_to_pay(
+        reference_id,
+        access_token,
+        AMOUNT,
+        CURRENCY,
+        "ext",
+        payer,
+        PAYER_MESSAGE,
+        PAYEE_NOTE,
+        **kwargs,
+    )
+
+
+def test_transactions_settle_after_delay_into_sandbox_outcomes():
+    clock = FakeClock()
+    emulator = GatewayEmulator(settle_after=5, clock=clock, strict_auth=False)
+    api = _client(emulator, api_user="u", api_key="k")
+    api.token_manager.store(("u", "collection", "sandbox"), {"access_token": "t"})
+    paid, failed = str(uuid.uuid4()), str(uuid.uuid4())
+
+    assert _pay(api, paid).status_code == 202
+    _pay(api, failed, {"partyIdType": "MSISDN", "partyId": "46733123450"})
+    assert api.get_request_to_pay_status(paid)["status"] == "PENDING"
+
+    clock.now += 5
+    status = api.get_request_to_pay_status(paid)
+    assert status["status"] == "SUCCESSFUL"
+    assert status["amount"] == "100"
+    assert "financialTransactionId" in status
+    assert (
+        api.get_request_to_pay_status(failed)["reason"] == "INTERNAL_PROCESSING_ERROR"
+    )
+    assert _pay(api, paid).status_code == 409
+
+
+def test_strict_auth_requires_provisioned_credentials():
+    emulator = GatewayEmulator()
+    api = _client(emulator)
+    with pytest.raises(requests.HTTPError) as excinfo:
+        api.get_account_balance("not-issued")
+    assert excinfo.value.response.status_code == 401
+
+    api_user = str(uuid.uuid4())
+    assert api.create_api_user(api_user, "https://cb.test").status_code == 201
+    api_key = api.create_api_key(api_user).json()["apiKey"]
+    assert api.get_oauth_token(api_user, "wrong").status_code == 401
+    token = api.get_oauth_token(api_user, api_key).json()["access_token"]
+    assert api.get_account_balance(token)["availableBalance"] == "1000"
+
+
+def test_injected_throttling_is_retried(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    emulator = GatewayEmulator(strict_auth=False)
+    emulator.inject(429, count=2)
+    api = _client(emulator, retry_policy=RetryPolicy(max_attempts=3))
+    assert api.get_account_balance("t")["currency"] == "EUR"
+    assert emulator.request_count == 3
+
+
+def test_failure_after_processing_is_not_submitted_twice(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    emulator = GatewayEmulator(strict_auth=False)
+    emulator.inject(
+        504, path_prefix="/collection/v1_0/requesttopay", after_processing=True
+    )
+    api = _client(emulator, retry_policy=RetryPolicy(max_attempts=3))
+    reference_id = str(uuid.uuid4())
+
+    response = _pay(api, reference_id, access_token="t")
+    assert response.status_code == 200
+    assert response.json()["status"] == "SUCCESSFUL"
+    assert emulator.transaction("requesttopay", reference_id) is not None
+
+
+def test_random_failures_are_reproducible_with_a_seed():
+    def statuses(seed):
+        emulator = GatewayEmulator(error_rate=0.3, throttle_rate=0.2, seed=seed)
+        return [
+            emulator.handle(
+                "GET", "/v1_0/apiuser/x", {"Ocp-Apim-Subscription-Key": "k"}
+            ).status
+            for _ in range(50)
+        ]
+
+    first = statuses(7)
+    assert first == statuses(7)
+    assert {404, 429, 500} <= set(first)
+
+
+def test_callbacks_are_delivered_over_loopback():
+    receiver = CallbackReceiver(host="127.0.0.1")
+    receiver.start_background()
+    emulator = GatewayEmulator(settle_after=0.05, strict_auth=False)
+    reference_id = str(uuid.uuid4())
+    try:
+        with EmulatorServer(emulator) as server:
+            api = MoMoPSBAPI(server.url, "key", callback_url=receiver.url)
+            _pay(api, reference_id, access_token="t")
+            event = receiver.wait(reference_id, timeout=5)
+            api.close()
+    finally:
+        receiver.stop_background()
+    assert event.status == "SUCCESSFUL"
+    assert emulator.deliveries[0].response_status == 200
+
+
+def test_async_client_over_httpx_transport():
+    httpx = pytest.importorskip("httpx")
+    from momo_psb.async_api import AsyncMoMoPSBAPI
+    from momo_psb.emulator import httpx_transport
+
+    emulator = GatewayEmulator(strict_auth=False)
+
+    async def main():
+        client = httpx.AsyncClient(transport=httpx_transport(emulator))
+        async with AsyncMoMoPSBAPI(BASE_URL, "key", client=client) as api:
+            references = [str(uuid.uuid4()) for _ in range(20)]
+            await asyncio.gather(
+                *(
+                    api.request_to_pay(
+                        ref, "t", 1, "EUR", "ext", PAYER, PAYER_MESSAGE, PAYEE_NOTE
+                    )
+                    for ref in references
+                )
+            )
+            return await asyncio.gather(
+                *(api.get_request_to_pay_status(ref, "t") for ref in references)
+            )
+
+    statuses = asyncio.run(main())
+    assert [status["status"] for status in statuses] == ["SUCCESSFUL"] * 20
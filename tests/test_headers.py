@@ -0,0 +1,52 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.headers import HeaderTemplates
+
+
+def test_templates_are_precomputed_and_read_only():
+    templates = HeaderTemplates("key", product_keys={"disbursement": "payout-key"})
+    sandbox = templates.template("collection", "sandbox")
+    assert sandbox is templates.template("collection", "sandbox")
+    assert sandbox == {
+        "Ocp-Apim-Subscription-Key": "key",
+        "X-Target-Environment": "sandbox",
+    }
+    payout = templates.template("disbursement", "sandbox")
+    assert payout["Ocp-Apim-Subscription-Key"] == "payout-key"
+    with pytest.raises(TypeError):
+        sandbox["X-Reference-Id"] = "leak"
+
+
+def test_build_returns_a_private_copy():
+    templates = HeaderTemplates("key")
+    headers = templates.build("collection", "sandbox", "token", "ref", "https://cb")
+    assert headers["Authorization"] == "Bearer token"
+    assert headers["X-Reference-Id"] == "ref"
+    assert headers["X-Callback-Url"] == "https://cb"
+    assert "X-Reference-Id" not in templates.template("collection", "sandbox")
+
+
+def test_shared_client_does_not_leak_reference_ids_between_threads(monkeypatch):
+    api = MoMoPSBAPI("https://gateway.test", "key")
+    sent = []
+
+    def request(method, url, **kwargs):
+        body = json.loads(kwargs["data"])
+        sent.append((body["providerCallbackHost"], kwargs["headers"]))
+        response = requests.Response()
+        response.status_code = 201
+        return response
+
+    monkeypatch.setattr(api.session, "request", request)
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda i: api.create_api_user(str(i), str(i)), range(200)))
+
+    assert len(sent) == 200
+    for host, headers in sent:
+        assert headers["X-Reference-Id"] == host
+    assert "X-Reference-Id" not in api.headers
@@ -0,0 +1,197 @@
+import asyncio
+import json
+import shutil
+import socket
+import ssl
+import subprocess
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+pytest.importorskip("h2")
+httpx = pytest.importorskip("httpx")
+
+from momo_psb.api import MoMoPSBAPI  # noqa: E402
+from momo_psb.async_api import AsyncMoMoPSBAPI  # noqa: E402
+from momo_psb.emulator import EmulatorH2Server, GatewayEmulator  # noqa: E402
+from momo_psb.http2 import HTTP2Adapter  # noqa: E402
+
+from tests.conftest import PAYEE_NOTE, PAYER, PAYER_MESSAGE  # noqa: E402
+
+
+def _h2c_client(url):
+    session = requests.Session()
+    session.mount("http://", HTTP2Adapter(max_connections=1, http1=False))
+    return MoMoPSBAPI(url, "key", session=session), session
+
+
+def test_concurrent_calls_share_one_connection():
+    emulator = GatewayEmulator(strict_auth=False, latency=0.05)
+    with EmulatorH2Server(emulator) as server:
+        api, session = _h2c_client(server.url)
+        references = [str(uuid.uuid4()) for _ in range(20)]
+
+        def pay_and_poll(reference_id):
+            api.request_to_pay(
+                reference_id, "t", 100, "EUR", "ext", PAYER, PAYER_MESSAGE, PAYEE_NOTE
+            ).raise_for_status()
+            return api.get_request_to_pay_status(reference_id, "t")["status"]
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            statuses = list(executor.map(pay_and_poll, references))
+        session.close()
+
+        assert statuses == ["SUCCESSFUL"] * 20
+        assert server.connections == 1
+
+
+def test_adapter_maps_responses_and_errors():
+    with EmulatorH2Server(GatewayEmulator(strict_auth=False)) as server:
+        _, session = _h2c_client(server.url)
+        response = session.get(
+            f"{server.url}/collection/v1_0/requesttopay/{uuid.uuid4()}",
+            headers={
+                "Authorization": "Bearer t",
+                "Ocp-Apim-Subscription-Key": "key",
+                "X-Target-Environment": "sandbox",
+            },
+        )
+        assert response.status_code == 404
+        assert response.headers["content-type"].startswith("application/json")
+        assert json.loads(response.text)["code"] == "RESOURCE_NOT_FOUND"
+        session.close()
+
+    with socket.socket() as free:
+        free.bind(("127.0.0.1", 0))
+        port = free.getsockname()[1]
+    adapter = HTTP2Adapter()
+    session = requests.Session()
+    session.mount("http://", adapter)
+    with pytest.raises(requests.ConnectionError):
+        session.get(f"http://127.0.0.1:{port}/", timeout=2)
+    adapter.close()
+
+
+@pytest.fixture
+def self_signed_server(tmp_path):
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl is not installed")
+    cert, key = str(tmp_path / "cert.pem"), str(tmp_path / "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1"]
+        + ["-subj", "/CN=localhost", "-addext", "subjectAltName=IP:127.0.0.1"]
+        + ["-keyout", key, "-out", cert],
+        check=True,
+        capture_output=True,
+    )
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"https://127.0.0.1:{server.server_address[1]}", cert
+    server.shutdown()
+    server.server_close()
+
+
+def test_adapter_honours_per_request_verify(self_signed_server):
+    url, cert = self_signed_server
+    adapter = HTTP2Adapter()
+    session = requests.Session()
+    session.mount("https://", adapter)
+
+    with pytest.raises(requests.ConnectionError):
+        session.get(url, timeout=5)
+    assert session.get(url, timeout=5, verify=False).text == "ok"
+    assert session.get(url, timeout=5, verify=cert).text == "ok"
+    adapter.close()
+
+
+def test_adapter_sends_through_the_configured_proxy():
+    seen = []
+
+    class Proxy(BaseHTTPRequestHandler):
+        def do_GET(self):
+            seen.append(self.path)
+            self.send_response(200)
+            self.send_header("Content-Length", "7")
+            self.end_headers()
+            self.wfile.write(b"proxied")
+
+        def log_message(self, *args):
+            pass
+
+    proxy = ThreadingHTTPServer(("127.0.0.1", 0), Proxy)
+    threading.Thread(target=proxy.serve_forever, daemon=True).start()
+    adapter = HTTP2Adapter()
+    session = requests.Session()
+    session.mount("http://", adapter)
+    try:
+        response = session.get(
+            "http://gateway.invalid/collection/v1_0/account/balance",
+            proxies={"http": f"http://127.0.0.1:{proxy.server_address[1]}"},
+            timeout=5,
+        )
+    finally:
+        adapter.close()
+        proxy.shutdown()
+        proxy.server_close()
+
+    assert response.text == "proxied"
+    assert seen == ["http://gateway.invalid/collection/v1_0/account/balance"]
+
+
+def test_client_option_mounts_the_adapter():
+    with MoMoPSBAPI("https://gateway.test", "key", http2=True) as api:
+        assert isinstance(api.session.get_adapter("https://gateway.test"), HTTP2Adapter)
+
+
+def test_async_client_multiplexes_over_one_connection():
+    emulator = GatewayEmulator(strict_auth=False, latency=0.05)
+    with EmulatorH2Server(emulator) as server:
+
+        async def main():
+            client = httpx.AsyncClient(http1=False, http2=True)
+            async with AsyncMoMoPSBAPI(server.url, "key", client=client) as api:
+                references = [str(uuid.uuid4()) for _ in range(20)]
+                await asyncio.gather(
+                    *(
+                        api.request_to_pay(
+                            reference_id,
+                            "t",
+                            100,
+                            "EUR",
+                            "ext",
+                            PAYER,
+                            PAYER_MESSAGE,
+                            PAYEE_NOTE,
+                        )
+                        for reference_id in references
+                    )
+                )
+                results = await asyncio.gather(
+                    *(
+                        api.get_request_to_pay_status(reference_id, "t")
+                        for reference_id in references
+                    )
+                )
+            await client.aclose()
+            return [result["status"] for result in results]
+
+        assert asyncio.run(main()) == ["SUCCESSFUL"] * 20
+        assert server.connections == 1
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import momo_psb
+
+HEAVY_MODULES = ("requests", "urllib3", "httpx", "asyncio", "momo_psb.api")
+
+
+def _loaded_after(code):
+    script = (
+        f"import sys\n{code}\n"
+        "print('loaded:' + ','.join(m for m in "
+        f"{HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    loaded = result.stdout.strip().splitlines()[-1].removeprefix("loaded:")
+    return [name for name in loaded.split(",") if name]
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import momo_psb",
+        "import momo_psb.cli",
+        "from momo_psb.cli import cli\n"
+        "cli(['--base-url', 'x', '--subscription-key', 'k', 'payment', '--help'],"
+        " standalone_mode=False)",
+    ],
+)
+def test_startup_does_not_import_the_http_stack(code):
+    assert _loaded_after(code) == []
+
+
+def test_client_is_exported_lazily():
+    from momo_psb.api import MoMoPSBAPI
+
+    assert momo_psb.MoMoPSBAPI is MoMoPSBAPI
+    assert "MoMoPSBAPI" in dir(momo_psb)
+    with pytest.raises(AttributeError):
+        momo_psb.NotAClient
+
+
+def test_startup_benchmark_reports_budget(tmp_path):
+    from benchmarks.startup import main
+
+    output = tmp_path / "startup.json"
+    args = ["--runs", "1", "--scenarios", "import_package,import_client"]
+    assert main(args + ["--budget-ms", "10000", "--output", str(output)]) == 0
+    assert main(args + ["--budget-ms", "-10000"]) == 1
@@ -0,0 +1,206 @@
+import asyncio
+
+import pytest
+import requests
+
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.circuit import CircuitBreakerRegistry
+from momo_psb.emulator import EmulatorAdapter, GatewayEmulator
+from momo_psb.instrumentation import (
+    CompositeInstrumentation,
+    Instrumentation,
+    MetricsCollector,
+)
+from momo_psb.retry import RetryPolicy
+
+BASE_URL = "http://momo.local"
+
+
+class RecordingInstrumentation(Instrumentation):
+    def __init__(self):
+        self.events = []
+
+    def on_request(self, event):
+        self.events.append(("request", event.method, event.endpoint))
+        return len(self.events)
+
+    def on_response(self, event, context):
+        self.events.append(("response", event.status_code, context))
+
+    def on_retry(self, event):
+        self.events.append(("retry", event.attempt, event.status_code))
+
+    def on_throttle(self, event):
+        self.events.append(("throttle", event.endpoint, event.retry_after))
+
+
+def _client(emulator, **kwargs):
+    api = MoMoPSBAPI(BASE_URL, "key", **kwargs)
+    api.session.mount(BASE_URL, EmulatorAdapter(emulator))
+    return api
+
+
+def test_hooks_see_requests_retries_and_throttling(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    emulator = GatewayEmulator(strict_auth=False, retry_after=2)
+    emulator.inject(429)
+    recorder = RecordingInstrumentation()
+    api = _client(
+        emulator, retry_policy=RetryPolicy(max_attempts=2), instrumentation=recorder
+    )
+
+    api.get_account_balance("t")
+
+    assert recorder.events == [
+        ("request", "GET", "account"),
+        ("response", 429, 1),
+        ("throttle", "account", 2.0),
+        ("retry", 1, 429),
+        ("request", "GET", "account"),
+        ("response", 200, 5),
+    ]
+
+
+def test_metrics_collector_exports_prometheus_text(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    emulator = GatewayEmulator(strict_auth=False)
+    emulator.inject(503, count=2)
+    metrics = MetricsCollector(buckets=(0.1, 1.0))
+    api = _client(
+        emulator, retry_policy=RetryPolicy(max_attempts=3), instrumentation=metrics
+    )
+
+    api.get_account_balance("t")
+    with pytest.raises(requests.HTTPError):
+        api.get_request_to_pay_status("missing", "t")
+
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == {
+        ("GET", "account", "503"): 2,
+        ("GET", "account", "200"): 1,
+        ("GET", "requesttopay", "404"): 1,
+    }
+    assert snapshot["retries"] == {("GET", "account"): 2}
+    assert snapshot["latency"][("GET", "account")]["count"] == 3
+
+    text = metrics.render_prometheus()
+    assert "# TYPE momo_psb_request_duration_seconds histogram" in text
+    assert (
+        'momo_psb_requests_total{method="GET",endpoint="account",status="503"} 2'
+        in text
+    )
+    assert (
+        'momo_psb_request_duration_seconds_bucket{method="GET",endpoint="account",'
+        'le="+Inf"} 3' in text
+    )
+    assert 'momo_psb_retries_total{method="GET",endpoint="account"} 2' in text
+
+    metrics.reset()
+    assert metrics.snapshot()["requests"] == {}
+
+
+def test_errors_are_reported_with_the_exception_name(monkeypatch):
+    metrics = MetricsCollector()
+    recorder = RecordingInstrumentation()
+    api = MoMoPSBAPI(
+        BASE_URL,
+        "key",
+        instrumentation=CompositeInstrumentation(metrics, recorder),
+    )
+
+    def request(method, url, **kwargs):
+        raise requests.ConnectionError("refused")
+
+    monkeypatch.setattr(api.session, "request", request)
+    with pytest.raises(requests.ConnectionError):
+        api.get_account_balance("t")
+
+    assert metrics.snapshot()["requests"] == {("GET", "account", "ConnectionError"): 1}
+    assert recorder.events[-1] == ("response", None, 1)
+
+
+def test_circuit_transitions_are_counted():
+    metrics = MetricsCollector()
+    breakers = CircuitBreakerRegistry(
+        on_state_change=metrics.on_circuit_state, minimum_calls=1
+    )
+    breakers.for_group("token").record(False)
+
+    assert metrics.snapshot()["circuit_transitions"] == {("token", "open"): 1}
+    assert (
+        'momo_psb_circuit_transitions_total{endpoint="token",state="open"} 1'
+        in metrics.render_prometheus()
+    )
+
+
+def test_uninstrumented_client_skips_the_hooks(monkeypatch):
+    def fail(*args):
+        raise AssertionError("instrumentation ran without hooks")
+
+    monkeypatch.setattr("momo_psb.api.request_event", fail)
+    api = _client(GatewayEmulator(strict_auth=False))
+    assert api.get_account_balance("t")["currency"] == "EUR"
+
+
+def test_label_values_are_escaped():
+    metrics = MetricsCollector()
+    metrics.on_circuit_state('a"b\\c', "closed", "open")
+    assert 'endpoint="a\\"b\\\\c"' in metrics.render_prometheus()
+
+
+def test_async_client_reports_to_hooks():
+    httpx = pytest.importorskip("httpx")
+    from momo_psb.async_api import AsyncMoMoPSBAPI
+    from momo_psb.emulator import httpx_transport
+
+    metrics = MetricsCollector()
+    emulator = GatewayEmulator(strict_auth=False)
+
+    async def main():
+        client = httpx.AsyncClient(transport=httpx_transport(emulator))
+        async with AsyncMoMoPSBAPI(
+            BASE_URL, "key", client=client, instrumentation=metrics
+        ) as api:
+            await asyncio.gather(*(api.get_account_balance("t") for _ in range(5)))
+
+    asyncio.run(main())
+    assert metrics.snapshot()["requests"] == {("GET", "account", "200"): 5}
+
+
+def test_route_templates_hide_path_parameters():
+    from momo_psb._endpoints import route_template
+
+    assert (
+        route_template("/collection/v1_0/accountholder/msisdn/46733123452/active")
+        == "/collection/v1_0/accountholder/{id}/{id}/active"
+    )
+    assert (
+        route_template("/v1_0/apiuser/abc-123/apikey?x=1")
+        == "/v1_0/apiuser/{id}/apikey"
+    )
+    assert route_template("/collection/token/") == "/collection/token/"
+
+
+def test_opentelemetry_spans():
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    from momo_psb.instrumentation import OpenTelemetryInstrumentation
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracing = OpenTelemetryInstrumentation(provider.get_tracer("test"))
+    api = _client(GatewayEmulator(strict_auth=False), instrumentation=tracing)
+
+    api.get_account_balance("t")
+
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "GET account"
+    assert span.attributes["url.template"] == "/collection/v1_0/account/balance"
+    assert "url.full" not in span.attributes
+    assert span.attributes["http.response.status_code"] == 200
@@ -0,0 +1,209 @@
+import asyncio
+import sqlite3
+import uuid
+
+import httpx
+import pytest
+import requests
+
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.async_api import AsyncMoMoPSBAPI
+from momo_psb.emulator import EmulatorAdapter, GatewayEmulator
+from momo_psb.journal import TransactionJournal
+from momo_psb.polling import Backoff, StatusPoller
+from tests.conftest import PAYEE_NOTE, PAYER, PAYER_MESSAGE
+
+BASE_URL = "http://momo.local"
+
+
+def _client(emulator, journal):
+    api = MoMoPSBAPI(BASE_URL, "key", journal=journal)
+    api.session.mount(BASE_URL, EmulatorAdapter(emulator))
+    return api
+
+
+def _pay(api, reference_id, external_id="order-1"):
+    return api.request_to_pay(
+        reference_id, "t", 100, "EUR", external_id, PAYER, PAYER_MESSAGE, PAYEE_NOTE
+    )
+
+
+def test_write_calls_are_journaled_with_their_outcome(tmp_path):
+    emulator = GatewayEmulator(strict_auth=False)
+    journal = TransactionJournal(str(tmp_path / "journal.db"))
+    api = _client(emulator, journal)
+    paid, payment, declined, unknown = (str(uuid.uuid4()) for _ in range(4))
+
+    _pay(api, paid)
+    api.create_payment(payment, "t", "pay-1", 25, "GHS", "cust", "provider")
+    emulator.inject(400, path_prefix="/collection/v2_0/invoice")
+    api.create_invoice(declined, "t", "inv-1", 50, "EUR", "3600", PAYER, PAYER)
+    emulator.inject(503)
+    _pay(api, unknown)
+
+    entry = journal.get(paid)
+    assert (entry.kind, entry.external_id, entry.amount, entry.currency) == (
+        "request_to_pay",
+        "order-1",
+        "100.0",
+        "EUR",
+    )
+    assert (entry.state, entry.status_code) == ("SUBMITTED", 202)
+    entry = journal.get(payment)
+    assert (entry.kind, entry.external_id, entry.amount, entry.currency) == (
+        "payment",
+        "pay-1",
+        "25.0",
+        "GHS",
+    )
+    assert journal.get(declined).state == "DECLINED"
+    assert (journal.get(unknown).state, journal.get(unknown).status_code) == (
+        "UNKNOWN",
+        503,
+    )
+    assert journal.get(str(uuid.uuid4())) is None
+    assert {entry.reference_id for entry in journal.pending()} == {
+        paid,
+        payment,
+        unknown,
+    }
+    assert [entry.reference_id for entry in journal.pending(kind="payment")] == [
+        payment
+    ]
+
+
+def test_network_errors_leave_the_transaction_unknown(tmp_path):
+    journal = TransactionJournal(str(tmp_path / "journal.db"))
+    api = MoMoPSBAPI("http://127.0.0.1:9", "key", journal=journal)
+    reference_id = str(uuid.uuid4())
+
+    with pytest.raises(requests.ConnectionError):
+        _pay(api, reference_id)
+
+    entry = journal.get(reference_id)
+    assert entry.state == "UNKNOWN"
+    assert entry.error.startswith("ConnectionError")
+
+
+def test_writes_are_committed_in_batches_and_survive_a_restart(tmp_path):
+    path = str(tmp_path / "journal.db")
+    emulator = GatewayEmulator(strict_auth=False)
+    journal = TransactionJournal(path, batch_size=5, flush_interval=60)
+    api = _client(emulator, journal)
+    references = [str(uuid.uuid4()) for _ in range(3)]
+
+    def committed():
+        with sqlite3.connect(path) as reader:
+            rows = reader.execute("SELECT state FROM transactions ORDER BY rowid")
+            return [state for (state,) in rows]
+
+    _pay(api, references[0])
+    _pay(api, references[1])
+    assert committed() == []
+    # The fifth write fills the batch: the third begin is committed, its result is not.
+    _pay(api, references[2])
+    assert committed() == ["SUBMITTED", "SUBMITTED", "SUBMITTING"]
+    journal.flush()
+    assert committed() == ["SUBMITTED"] * 3
+
+    recovered = TransactionJournal(path)
+    assert [entry.reference_id for entry in recovered.pending()] == references
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_buffered_writes_are_committed_after_the_flush_interval(tmp_path):
+    path = str(tmp_path / "journal.db")
+    journal = TransactionJournal(path, flush_interval=0.01)
+    journal.begin("payment", "ref", {"externalTransactionId": "x"})
+    journal._timer.join()
+    with sqlite3.connect(path) as reader:
+        assert reader.execute("SELECT state FROM transactions").fetchall() == [
+            ("SUBMITTING",)
+        ]
+
+
+def test_writes_after_close_are_rejected(tmp_path):
+    journal = TransactionJournal(str(tmp_path / "journal.db"), flush_interval=0.01)
+    journal.begin("payment", "ref", {})
+    journal.close()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        journal.finish("ref", 202)
+    assert journal._timer is None
+    journal.flush()
+
+
+def test_resubmitting_a_finished_transaction_keeps_its_state(tmp_path):
+    journal = TransactionJournal(str(tmp_path / "journal.db"), batch_size=1)
+    journal.begin("payment", "ref", {})
+    journal.finish("ref", 202)
+    journal.record_status("ref", "SUCCESSFUL")
+
+    journal.begin("payment", "ref", {})
+    journal.finish("ref", 409)
+
+    assert journal.get("ref").state == "SUCCESSFUL"
+    assert journal.pending() == []
+    journal.begin("payment", "open", {})
+    journal.finish("open", None, ConnectionError("reset"))
+    journal.begin("payment", "open", {})
+    assert journal.get("open").state == "UNKNOWN"
+    journal.finish("open", 409)
+    assert journal.get("open").state == "SUBMITTED"
+
+
+def test_resubmitting_an_accepted_reference_id_keeps_it_pending(tmp_path):
+    emulator = GatewayEmulator(strict_auth=False)
+    journal = TransactionJournal(str(tmp_path / "journal.db"), batch_size=1)
+    api = _client(emulator, journal)
+    reference_id = str(uuid.uuid4())
+
+    assert _pay(api, reference_id).status_code == 202
+    assert _pay(api, reference_id).status_code == 409
+
+    entry = journal.get(reference_id)
+    assert (entry.state, entry.status_code) == ("SUBMITTED", 202)
+    assert [entry.reference_id for entry in journal.pending()] == [reference_id]
+
+
+def test_poller_results_settle_pending_transactions(tmp_path):
+    emulator = GatewayEmulator(strict_auth=False)
+    with TransactionJournal(str(tmp_path / "journal.db")) as journal:
+        api = _client(emulator, journal)
+        references = [str(uuid.uuid4()) for _ in range(3)]
+        for reference_id in references:
+            _pay(api, reference_id)
+        emulator.settle_all()
+
+        poller = StatusPoller(
+            api,
+            backoff=Backoff(initial_delay=0.001, max_delay=0.002, jitter=0.0),
+            access_token="t",
+            on_result=journal.record_result,
+        )
+        for entry in journal.pending():
+            poller.track(entry.kind, entry.reference_id, entry.target_environment)
+        poller.run()
+
+        assert journal.pending() == []
+        assert {journal.get(reference_id).state for reference_id in references} == {
+            "SUCCESSFUL"
+        }
+
+
+def test_async_client_journals_write_calls(tmp_path):
+    journal = TransactionJournal(str(tmp_path / "journal.db"))
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(202))
+    )
+    api = AsyncMoMoPSBAPI(BASE_URL, "key", client=client, journal=journal)
+    reference_id = str(uuid.uuid4())
+
+    asyncio.run(api.create_pre_approval(reference_id, "t", PAYER, "EUR", "msg", 3600))
+
+    entry = journal.get(reference_id)
+    assert (entry.kind, entry.currency, entry.state) == (
+        "pre_approval",
+        "EUR",
+        "SUBMITTED",
+    )
@@ -0,0 +1,57 @@
+import pickle
+
+import pytest
+import requests
+
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.models import Balance, PreApproval, TransactionStatus, parse_list
+
+BODY = b'{"status": "SUCCESSFUL", "amount": "100", "payer": {"partyId": "1"}}'
+
+
+def test_model_parses_lazily_and_releases_raw_body():
+    status = TransactionStatus(BODY)
+    assert not status.parsed
+    assert status.status == "SUCCESSFUL"
+    assert status.parsed
+    assert status._raw is None
+    assert status.reason is None
+
+
+def test_model_is_a_read_only_mapping():
+    status = TransactionStatus(BODY)
+    assert status["amount"] == "100"
+    assert status.get("missing") is None
+    assert status == {
+        "status": "SUCCESSFUL",
+        "amount": "100",
+        "payer": {"partyId": "1"},
+    }
+    assert not hasattr(status, "__dict__")
+    with pytest.raises(AttributeError):
+        status.status = "FAILED"
+
+
+def test_model_round_trips_through_pickle():
+    balance = pickle.loads(pickle.dumps(Balance(b'{"availableBalance": "5"}')))
+    assert balance.available_balance == "5"
+
+
+def test_parse_list():
+    items = parse_list(PreApproval, b'[{"preApprovalId": "a"}, {"preApprovalId": "b"}]')
+    assert [item.pre_approval_id for item in items] == ["a", "b"]
+
+
+def test_client_returns_models_when_enabled(monkeypatch):
+    api = MoMoPSBAPI("https://gateway.test", "key", response_models=True)
+
+    def request(method, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = BODY
+        return response
+
+    monkeypatch.setattr(api.session, "request", request)
+    status = api.get_request_to_pay_status("ref", "token")
+    assert isinstance(status, TransactionStatus)
+    assert status.status == "SUCCESSFUL"
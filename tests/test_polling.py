@@ -0,0 +1,144 @@
+import asyncio
+import uuid
+
+import pytest
+
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.emulator import EmulatorAdapter, GatewayEmulator
+from momo_psb.polling import AsyncStatusPoller, Backoff, StatusPoller
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeStatusAPI:
+    """Reports PENDING for a configured number of checks, then a final status."""
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.calls = []
+
+    def get_request_to_pay_status(self, reference_id, access_token, environment):
+        self.calls.append(reference_id)
+        pending, final = self.plan[reference_id]
+        if self.calls.count(reference_id) <= pending:
+            return {"status": "PENDING"}
+        if isinstance(final, Exception):
+            raise final
+        return {"status": final}
+
+    get_payment_status = get_request_to_pay_status
+
+
+NO_JITTER = Backoff(initial_delay=1.0, multiplier=2.0, max_delay=8.0, jitter=0.0)
+
+
+def _poller(api, clock, **kwargs):
+    return StatusPoller(
+        api, backoff=NO_JITTER, clock=clock, sleep=clock.sleep, concurrency=4, **kwargs
+    )
+
+
+def test_backoff_grows_exponentially_and_is_capped():
+    assert [NO_JITTER.delay(i) for i in range(5)] == [1.0, 2.0, 4.0, 8.0, 8.0]
+    jittered = Backoff(initial_delay=10.0, jitter=0.5)
+    assert jittered.delay(0, rng=lambda: 0.0) == 5.0
+    assert jittered.delay(0, rng=lambda: 0.999) == pytest.approx(15.0, rel=1e-2)
+
+
+def test_poller_stops_on_terminal_statuses():
+    clock = FakeClock()
+    api = FakeStatusAPI({"a": (0, "SUCCESSFUL"), "b": (3, "FAILED")})
+    seen = []
+    poller = _poller(api, clock, on_result=seen.append)
+    poller.track("request_to_pay", "a")
+    poller.track("request_to_pay", "b")
+    poller.track("request_to_pay", "b")
+
+    results = poller.run()
+
+    assert results[("request_to_pay", "a")].status == "SUCCESSFUL"
+    assert results[("request_to_pay", "b")].status == "FAILED"
+    assert results[("request_to_pay", "b")].attempts == 4
+    assert api.calls.count("a") == 1
+    assert [r.reference_id for r in seen] == ["a", "b"]
+    assert clock.now == 1 + 2 + 4 + 8
+    assert len(poller) == 0
+
+
+def test_poller_times_out_pending_transactions():
+    clock = FakeClock()
+    api = FakeStatusAPI({"slow": (100, "SUCCESSFUL")})
+    poller = _poller(api, clock, timeout=10)
+    poller.track("payment", "slow")
+
+    (result,) = poller.results()
+
+    assert result.timed_out
+    assert result.status == "PENDING"
+    assert clock.now == 10
+
+
+def test_poller_retries_after_errors():
+    clock = FakeClock()
+    api = FakeStatusAPI({"err": (0, RuntimeError("gateway down"))})
+    poller = _poller(api, clock, timeout=5)
+    poller.track("request_to_pay", "err")
+
+    (result,) = poller.results()
+
+    assert isinstance(result.error, RuntimeError)
+    assert result.attempts > 1
+
+
+def test_poller_gives_up_on_unknown_references_without_a_timeout():
+    clock = FakeClock()
+    api = MoMoPSBAPI("http://momo.local", "key")
+    api.session.mount(
+        "http://momo.local", EmulatorAdapter(GatewayEmulator(strict_auth=False))
+    )
+    poller = _poller(api, clock, access_token="t")
+    poller.track("request_to_pay", str(uuid.uuid4()))
+
+    (result,) = poller.results()
+
+    assert result.error.response.status_code == 404
+    assert result.attempts == 1
+    assert not result.timed_out
+
+
+def test_poller_rejects_unknown_kinds():
+    poller = StatusPoller(FakeStatusAPI({}))
+    with pytest.raises(ValueError):
+        poller.track("cash_transfer", "x")
+
+
+def test_async_poller_resolves_transactions():
+    class AsyncAPI:
+        def __init__(self):
+            self.sync = FakeStatusAPI({"a": (1, "SUCCESSFUL"), "b": (0, "REJECTED")})
+
+        async def get_request_to_pay_status(self, *args):
+            return self.sync.get_request_to_pay_status(*args)
+
+    api = AsyncAPI()
+    fast = Backoff(initial_delay=0.001, max_delay=0.002, jitter=0.0)
+    poller = AsyncStatusPoller(api, backoff=fast)
+    poller.track("request_to_pay", "a")
+    poller.track("request_to_pay", "b")
+
+    results = asyncio.run(poller.run())
+
+    assert results[("request_to_pay", "a")].status == "SUCCESSFUL"
+    assert results[("request_to_pay", "b")].status == "REJECTED"
+    assert len(api.sync.calls) == 3
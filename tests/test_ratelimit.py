@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import requests
+
+from momo_psb._endpoints import endpoint_family
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.ratelimit import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.parametrize(
+    "path, family",
+    [
+        ("/collection/v1_0/requesttopay", "collection/v1_0"),
+        ("/collection/v2_0/invoice/abc", "collection/v2_0"),
+        ("/collection/token/", "collection/token"),
+        ("/v1_0/apiuser/abc/apikey", "v1_0"),
+    ],
+)
+def test_endpoint_family(path, family):
+    assert endpoint_family(path) == family
+
+
+def test_bucket_allows_burst_then_schedules_callers_in_order():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=2, clock=clock)
+    assert [bucket.reserve() for _ in range(4)] == pytest.approx([0, 0, 0.1, 0.2])
+    clock.now += 1
+    assert bucket.try_acquire()
+
+
+def test_pause_holds_back_callers():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=5, capacity=5, clock=clock)
+    bucket.pause(2)
+    assert not bucket.try_acquire()
+    assert bucket.reserve() == pytest.approx(2.2)
+
+
+def test_limiter_shares_buckets_per_subscription_key():
+    limiter = RateLimiter(rate=10)
+    a = limiter.bucket("key-a", "/collection/v1_0/requesttopay")
+    assert a is limiter.bucket("key-a", "/collection/v2_0/invoice")
+    assert a is not limiter.bucket("key-b", "/collection/v1_0/requesttopay")
+
+
+def test_limiter_can_split_buckets_per_family():
+    limiter = RateLimiter(
+        rate=10, per_family=True, family_limits={"collection/token": (1, 1)}
+    )
+    v1 = limiter.bucket("key", "/collection/v1_0/requesttopay")
+    v2 = limiter.bucket("key", "/collection/v2_0/invoice")
+    token = limiter.bucket("key", "/collection/token/")
+    assert v1 is not v2
+    assert token.rate == 1
+
+
+def test_bucket_throughput_across_threads():
+    bucket = TokenBucket(rate=200, capacity=1)
+    start = time.monotonic()
+    threads = [
+        threading.Thread(target=lambda: [bucket.acquire() for _ in range(10)])
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+    assert elapsed >= 39 / 200 * 0.9
+
+
+def test_bucket_is_awaitable():
+    bucket = TokenBucket(rate=500, capacity=1)
+
+    async def main():
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.aacquire() for _ in range(20)))
+        return time.monotonic() - start
+
+    assert asyncio.run(main()) >= 19 / 500 * 0.9
+
+
+def test_client_pauses_bucket_when_gateway_throttles(monkeypatch):
+    limiter = RateLimiter(rate=100)
+    api = MoMoPSBAPI("https://gateway.test", "key", rate_limiter=limiter)
+    throttled = requests.Response()
+    throttled.status_code = 429
+    throttled.headers["Retry-After"] = "3"
+    monkeypatch.setattr(api.session, "request", lambda *a, **k: throttled)
+
+    api._send("GET", "https://gateway.test/collection/v1_0/account/balance")
+
+    bucket = limiter.bucket("key", "/collection/v1_0/account/balance")
+    assert bucket.reserve() > 2.9
@@ -0,0 +1,113 @@
+import json
+import os
+import uuid
+
+import pytest
+from click.testing import CliRunner
+
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.cli import cli
+from momo_psb.emulator import EmulatorAdapter, EmulatorServer, GatewayEmulator
+from momo_psb.reconcile import Reconciler
+from tests.conftest import PAYEE_NOTE, PAYER, PAYER_MESSAGE
+
+BASE_URL = "http://momo.local"
+
+
+def _gateway_with_payments(count, amount=100):
+    emulator = GatewayEmulator(strict_auth=False)
+    api = MoMoPSBAPI(BASE_URL, "key")
+    api.session.mount(BASE_URL, EmulatorAdapter(emulator))
+    references = []
+    for _ in range(count):
+        reference_id = str(uuid.uuid4())
+        api.request_to_pay(
+            reference_id, "t", amount, "EUR", "ext", PAYER, PAYER_MESSAGE, PAYEE_NOTE
+        )
+        references.append(reference_id)
+    return emulator, api, references
+
+
+def _report(path):
+    with open(path) as file:
+        return [json.loads(line) for line in file]
+
+
+def test_rows_are_compared_against_the_gateway(tmp_path):
+    _, api, references = _gateway_with_payments(3)
+    rows = [
+        {"reference_id": references[0], "amount": "100.0", "status": "SUCCESSFUL"},
+        {"reference_id": references[1], "amount": "99", "currency": "EUR"},
+        {"reference_id": references[2], "status": "PENDING"},
+        {"reference_id": str(uuid.uuid4())},
+    ]
+    output = str(tmp_path / "report.jsonl")
+
+    summary = Reconciler(api, output, access_token="t").run(rows)
+
+    assert (summary.total, summary.matched, summary.mismatched, summary.failed) == (
+        4,
+        1,
+        2,
+        1,
+    )
+    report = {record["index"]: record for record in _report(output)}
+    assert report[0]["matched"] and report[0]["financial_transaction_id"]
+    assert report[1]["mismatches"] == ["amount"]
+    assert report[2]["mismatches"] == ["status"]
+    assert report[3]["status"] == "NOT_FOUND"
+    assert not os.path.exists(output + ".checkpoint")
+
+
+def test_interrupted_run_resumes_from_its_checkpoint(tmp_path):
+    emulator, api, references = _gateway_with_payments(10)
+    rows = [{"reference_id": reference_id} for reference_id in references]
+    output = str(tmp_path / "report.jsonl")
+
+    def crashing(rows, after):
+        for index, row in enumerate(rows):
+            if index == after:
+                raise RuntimeError("worker killed")
+            yield row
+
+    reconciler = Reconciler(
+        api, output, access_token="t", concurrency=1, checkpoint_every=3
+    )
+    with pytest.raises(RuntimeError):
+        reconciler.run(crashing(rows, 7), source="ledger.csv")
+    assert os.path.exists(output + ".checkpoint")
+    with pytest.raises(ValueError):
+        reconciler.run(rows, source="other.csv")
+
+    before = emulator.request_count
+    summary = reconciler.run(rows, source="ledger.csv")
+
+    assert summary.resumed_at == 7
+    assert summary.total == summary.matched == 10
+    assert emulator.request_count - before == 3
+    assert sorted(record["index"] for record in _report(output)) == list(range(10))
+    assert not os.path.exists(output + ".checkpoint")
+
+
+def test_reconcile_command(tmp_path):
+    emulator = GatewayEmulator(strict_auth=False)
+    with EmulatorServer(emulator) as server:
+        api = MoMoPSBAPI(server.url, "key")
+        reference_id = str(uuid.uuid4())
+        api.create_invoice(reference_id, "t", "inv-1", 50, "EUR", "3600", PAYER, PAYER)
+        ledger = tmp_path / "ledger.csv"
+        ledger.write_text(
+            f"reference_id,kind,external_id\n{reference_id},invoice,inv-1\n"
+        )
+        output = tmp_path / "report.jsonl"
+
+        result = CliRunner().invoke(
+            cli,
+            ["--base-url", server.url, "--subscription-key", "key"]
+            + ["--no-credential-cache", "reconcile", str(ledger)]
+            + ["--output", str(output), "--access-token", "t"],
+        )
+
+    assert result.exit_code == 0, result.output
+    assert "1 matched" in result.stderr
+    assert _report(output)[0]["kind"] == "invoice"
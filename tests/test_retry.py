@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+import requests
+
+from momo_psb import api as api_module
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.retry import RetryPolicy
+
+from tests.conftest import AMOUNT, CURRENCY, PAYER, REFERENCE_ID
+
+NO_JITTER = RetryPolicy(max_attempts=3, backoff_factor=0.5, jitter=0.0)
+
+
+def _response(status_code, headers=None, body=b""):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = body
+    return response
+
+
+class ScriptedAPI(MoMoPSBAPI):
+    """Client whose transport replays scripted outcomes and records requests."""
+
+    def __init__(self, script, **kwargs):
+        super().__init__(
+            "https://gateway.test", "key", retry_policy=NO_JITTER, **kwargs
+        )
+        self.script = list(script)
+        self.sent = []
+
+    def _send(self, method, url, **kwargs):
+        self.sent.append((method, url, dict(kwargs.get("headers", {}))))
+        outcome = self.script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(api_module.time, "sleep", recorded.append)
+    return recorded
+
+
+def _request_to_pay(api):
+    return api.request_to_pay(
+        reference_id=REFERENCE_ID,
+        access_token="token",
+        amount=AMOUNT,
+        currency=CURRENCY,
+        external_id="external",
+        payer=PAYER,
+        payer_message="message",
+        payee_note="note",
+    )
+
+
+def test_retry_after_header_is_respected():
+    policy = RetryPolicy(jitter=0.0)
+    assert policy.delay(1, _response(429, {"Retry-After": "7"})) == 7.0
+    assert policy.delay(1, _response(429, {"Retry-After": "junk"})) == 0.5
+    assert policy.delay(3) == 2.0
+    assert RetryPolicy(max_retry_after=5).retry_after({"Retry-After": "600"}) == 5
+
+
+def test_status_calls_are_retried_on_transient_errors(sleeps):
+    api = ScriptedAPI(
+        [
+            _response(503, {"Retry-After": "2"}),
+            _response(502),
+            _response(200, body=b'{"status": "PENDING"}'),
+        ]
+    )
+    assert api.get_request_to_pay_status(REFERENCE_ID, "token") == {"status": "PENDING"}
+    assert sleeps == [2.0, 1.0]
+
+
+def test_throttled_write_is_resent_with_same_reference_id(sleeps):
+    api = ScriptedAPI([_response(429), _response(202)])
+    assert _request_to_pay(api).status_code == 202
+    assert [method for method, _, _ in api.sent] == ["POST", "POST"]
+    assert {headers["X-Reference-Id"] for _, _, headers in api.sent} == {REFERENCE_ID}
+
+
+def test_ambiguous_write_checks_status_before_reposting(sleeps):
+    api = ScriptedAPI(
+        [
+            requests.ReadTimeout(),
+            _response(404),
+            _response(500),
+            _response(200, body=b'{"status": "PENDING"}'),
+        ]
+    )
+    response = _request_to_pay(api)
+    assert response.status_code == 200
+    assert [method for method, _, _ in api.sent] == ["POST", "GET", "POST", "GET"]
+    status_url = api.sent[1][1]
+    assert status_url.endswith(f"/collection/v1_0/requesttopay/{REFERENCE_ID}")
+    assert "X-Reference-Id" not in api.sent[1][2]
+
+
+def test_duplicate_on_retry_resolves_to_existing_transaction(sleeps):
+    api = ScriptedAPI(
+        [
+            requests.ConnectionError(),
+            _response(404),
+            _response(409),
+            _response(200, body=b'{"status": "SUCCESSFUL"}'),
+        ]
+    )
+    assert _request_to_pay(api).json() == {"status": "SUCCESSFUL"}
+
+
+def test_non_idempotent_calls_are_not_retried(sleeps):
+    api = ScriptedAPI([_response(500)])
+    assert api.create_api_key("user").status_code == 500
+    assert len(api.sent) == 1
+
+
+def test_retries_stop_after_max_attempts(sleeps):
+    api = ScriptedAPI([requests.ConnectTimeout()] * 3)
+    with pytest.raises(requests.ConnectTimeout):
+        api.get_account_balance("token")
+    assert len(api.sent) == 3
+
+
+def test_async_client_reuses_reference_id_on_retry(monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    from momo_psb.async_api import AsyncMoMoPSBAPI
+
+    async def no_sleep(delay):
+        pass
+
+    monkeypatch.setattr("momo_psb.async_api.asyncio.sleep", no_sleep)
+    seen = []
+    script = [httpx.Response(504), httpx.Response(404), httpx.Response(202)]
+
+    def handler(request):
+        seen.append((request.method, request.headers.get("X-Reference-Id")))
+        return script.pop(0)
+
+    async def main():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncMoMoPSBAPI(
+            "https://gateway.test", "key", client=client, retry_policy=NO_JITTER
+        ) as api:
+            return await _request_to_pay(api)
+
+    assert asyncio.run(main()).status_code == 202
+    assert seen == [("POST", REFERENCE_ID), ("GET", None), ("POST", REFERENCE_ID)]
@@ -0,0 +1,69 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from momo_psb.api import MoMoPSBAPI, PooledHTTPAdapter
+
+
+class _PeerRecordingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.peers.append(self.client_address)
+        body = b'{"status": "SUCCESSFUL"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def loopback_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PeerRecordingHandler)
+    server.peers = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_session_is_shared_and_pooled():
+    api = MoMoPSBAPI(
+        "https://example.test/", "key", pool_connections=4, pool_maxsize=32
+    )
+    adapter = api.session.get_adapter("https://example.test")
+    assert isinstance(adapter, PooledHTTPAdapter)
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 32
+    assert adapter.ssl_context is not None
+    api.close()
+
+
+def test_keep_alive_disabled_sends_connection_close():
+    api = MoMoPSBAPI("https://example.test", "key", keep_alive=False)
+    assert api.session.headers["Connection"] == "close"
+    api.close()
+
+
+def test_context_manager_does_not_close_external_session():
+    session = requests.Session()
+    with MoMoPSBAPI("https://example.test", "key", session=session) as api:
+        assert api.session is session
+    assert session.adapters
+
+
+def test_requests_reuse_warm_connection(loopback_server):
+    host, port = loopback_server.server_address
+    with MoMoPSBAPI(f"http://{host}:{port}", "key") as api:
+        for _ in range(5):
+            result = api.get_request_to_pay_status("ref", "token")
+            assert result == {"status": "SUCCESSFUL"}
+    assert len(loopback_server.peers) == 5
+    assert len(set(loopback_server.peers)) == 1
@@ -0,0 +1,134 @@
+import asyncio
+
+import httpx
+import pytest
+
+from momo_psb.emulator import EmulatorAdapter, GatewayEmulator
+from momo_psb.instrumentation import Instrumentation
+from momo_psb.ratelimit import RateLimiter
+from momo_psb.tenants import AsyncClientRegistry, ClientRegistry, Tenant
+
+BASE_URL = "http://momo.local"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TokenRequests(Instrumentation):
+    def __init__(self):
+        self.count = 0
+
+    def on_request(self, event):
+        if event.url.endswith("/token/"):
+            self.count += 1
+
+
+def test_tenants_share_one_session_but_keep_their_own_credentials():
+    emulator = GatewayEmulator(subscription_keys={"key-a", "key-b"}, strict_auth=False)
+    tokens = TokenRequests()
+    registry = ClientRegistry(
+        BASE_URL, instrumentation=tokens, rate_limiter=RateLimiter(rate=100)
+    )
+    registry.session.mount(BASE_URL, EmulatorAdapter(emulator))
+    registry.register("a", "key-a", "user-a", "secret-a")
+    registry.register("b", "key-b", "user-b", "secret-b", callback_url="https://b")
+
+    first, second = registry.get("a"), registry.get("b")
+    assert first is registry.get("a")
+    assert first.session is second.session is registry.session
+    assert (first.subscription_key, second.callback_url) == ("key-a", "https://b")
+    assert first.token_manager is not second.token_manager
+    assert first.rate_limiter is second.rate_limiter
+
+    for _ in range(3):
+        assert first.get_account_balance()["availableBalance"] == "1000"
+        assert second.get_account_balance()["availableBalance"] == "1000"
+    assert tokens.count == 2
+
+    registry.close()
+    assert len(registry) == 0
+
+
+def test_least_recently_used_and_idle_tenants_are_evicted():
+    clock = FakeClock()
+    registry = ClientRegistry(BASE_URL, max_tenants=2, idle_timeout=10, clock=clock)
+    for tenant_id in "abc":
+        registry.register(tenant_id, f"key-{tenant_id}")
+
+    first = registry.get("a")
+    registry.get("b")
+    clock.now = 5
+    registry.get("a")
+    clock.now = 8
+    registry.get("c")
+    assert "b" not in registry and len(registry) == 2
+
+    clock.now = 15
+    assert registry.evict_idle() == ["a"]
+    assert registry.get("a") is not first
+
+    registry.unregister("a")
+    with pytest.raises(KeyError):
+        registry.get("a")
+
+
+def test_registration_during_a_build_wins_over_the_stale_client():
+    class RacingRegistry(ClientRegistry):
+        def _build(self, tenant):
+            client = super()._build(tenant)
+            if tenant.subscription_key == "old-key":
+                # Another thread re-registers the tenant mid-build.
+                self.register("a", "new-key")
+            return client
+
+    registry = RacingRegistry(BASE_URL)
+    registry.register("a", "old-key")
+
+    assert registry.get("a").subscription_key == "new-key"
+    assert registry.get("a") is registry.get("a")
+
+
+def test_loader_supplies_unregistered_tenants():
+    loaded = []
+
+    def loader(tenant_id):
+        loaded.append(tenant_id)
+        if tenant_id.startswith("merchant-"):
+            return Tenant(f"key-{tenant_id}", options={"timeout": 3.0})
+        return None
+
+    registry = ClientRegistry(BASE_URL, loader=loader, timeout=10.0)
+
+    client = registry.get("merchant-1")
+    assert registry.get("merchant-1") is client
+    assert (client.subscription_key, client.timeout) == ("key-merchant-1", 3.0)
+    with pytest.raises(KeyError):
+        registry.get("other")
+    assert loaded == ["merchant-1", "other"]
+
+
+def test_async_registry_shares_one_http_client():
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers["Ocp-Apim-Subscription-Key"])
+        return httpx.Response(200, json={"availableBalance": "5", "currency": "EUR"})
+
+    async def main():
+        async with AsyncClientRegistry(
+            BASE_URL, client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        ) as registry:
+            registry.register("a", "key-a")
+            registry.register("b", "key-b")
+            first, second = registry.get("a"), registry.get("b")
+            assert first.client is second.client is registry.client
+            await first.get_account_balance("t")
+            await second.get_account_balance("t")
+
+    asyncio.run(main())
+    assert seen == ["key-a", "key-b"]
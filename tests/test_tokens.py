@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from momo_psb.api import MoMoPSBAPI
+from momo_psb.tokens import TokenManager
+
+KEY = ("api-user", "collection", "sandbox")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_tokens_refresh_ahead_of_expiry():
+    clock = FakeClock()
+    manager = TokenManager(refresh_margin=60, clock=clock)
+    issued = iter(["first", "second"])
+
+    def fetch():
+        return {"access_token": next(issued), "expires_in": 3600}
+
+    assert manager.get_token(KEY, fetch) == "first"
+    clock.now += 3500
+    assert manager.get_token(KEY, fetch) == "first"
+    clock.now += 41
+    assert manager.get_token(KEY, fetch) == "second"
+
+
+def test_concurrent_threads_share_one_refresh():
+    manager = TokenManager()
+    calls = []
+    barrier = threading.Barrier(16)
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"access_token": "token", "expires_in": 3600}
+
+    def worker():
+        barrier.wait()
+        return manager.get_token(KEY, fetch)
+
+    with ThreadPoolExecutor(16) as pool:
+        results = list(pool.map(lambda _: worker(), range(16)))
+
+    assert results == ["token"] * 16
+    assert len(calls) == 1
+
+
+def test_concurrent_tasks_share_one_refresh():
+    manager = TokenManager()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"access_token": "token", "expires_in": 3600}
+
+    async def main():
+        return await asyncio.gather(
+            *(manager.aget_token(KEY, fetch) for _ in range(20))
+        )
+
+    assert asyncio.run(main()) == ["token"] * 20
+    assert len(calls) == 1
+
+
+def test_client_uses_managed_token_when_access_token_omitted(monkeypatch):
+    api = MoMoPSBAPI("https://gateway.test", "key", api_user="user", api_key="secret")
+    fetched = []
+
+    def get_oauth_token(
+        api_user, api_key, target_environment="sandbox", product="collection"
+    ):
+        fetched.append((api_user, api_key, target_environment, product))
+        response = type("Response", (), {})()
+        response.status_code = 200
+        response.content = b'{"access_token": "managed", "expires_in": 3600}'
+        return response
+
+    monkeypatch.setattr(api, "get_oauth_token", get_oauth_token)
+
+    assert api._resolve_token(None, "sandbox") == "managed"
+    assert api._resolve_token(None, "sandbox") == "managed"
+    assert api._resolve_token("explicit", "sandbox") == "explicit"
+    assert fetched == [("user", "secret", "sandbox", "collection")]
+
+
+def test_client_without_credentials_requires_access_token():
+    api = MoMoPSBAPI("https://gateway.test", "key")
+    with pytest.raises(ValueError):
+        api.get_access_token()